@@ -0,0 +1,103 @@
+"""
+Benchmark: latencia de /ocr/plates con el cruce por petición (lista completa
+filtrada contra el conjunto de Cloudinary) frente a la vista precalculada
+
+Uso (desde backend/):
+    python benchmarks/bench_available_plates.py [num_lineas ...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+REQUESTS = 20
+LEGACY_REQUESTS = 3
+LIMIT = 100
+
+
+class StaticCatalog:
+    """Catálogo de imágenes fijo (sin llamadas a Cloudinary)"""
+
+    def __init__(self, images):
+        self.images = images
+        self.version = 1
+
+    async def get_available_images(self):
+        return self.images
+
+
+def legacy_list(service, cloudinary_images, limit):
+    """Lógica original del handler: cruce completo en cada petición"""
+    all_plates = service.get_all_plates()
+    available_plates = [p for p in all_plates if p.image_name in cloudinary_images]
+    available_plates = available_plates[:limit]
+    return [
+        {"image_name": p.image_name, "plate_number": p.plate_number, "num_characters": p.num_characters}
+        for p in available_plates
+    ]
+
+
+async def timed(call, requests: int = REQUESTS) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (time.perf_counter() - start) / requests * 1000
+
+
+async def run(num_lines: int, workdir: Path) -> None:
+    path = write_plates_dat(workdir / f"plates_{num_lines}.dat", num_lines)
+    # El módulo de rutas abre plates.dat al importarse
+    os.environ.setdefault("PLATES_DAT_PATH", str(path))
+
+    from application.services.ocr_service import OCRService
+    from infrastructure.adapters.inbound.api.routes import ocr
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+    repository = PlatesDatRepository(str(path), load_mode="eager")
+    repository.warm_up()
+    service = OCRService(repository)
+
+    # La mitad de las imágenes está disponible en Cloudinary
+    images = {name for i, name in enumerate(repository.iter_image_names()) if i % 2 == 0}
+    ocr.ocr_service = service
+    ocr.cloudinary_catalog = StaticCatalog(images)
+
+    async def legacy():
+        legacy_list(service, images, LIMIT)
+
+    async def first_page():
+        await ocr.list_all_plates(limit=LIMIT, after=None, page_size=None, stream=False)
+
+    middle = service.get_available_view(images, 1).image_names[len(images) // 2]
+
+    async def cursor_page():
+        await ocr.list_all_plates(limit=None, after=middle, page_size=LIMIT, stream=False)
+
+    legacy_ms = await timed(legacy, LEGACY_REQUESTS)
+
+    start = time.perf_counter()
+    ocr.cloudinary_catalog.version += 1
+    await first_page()
+    rebuild_ms = (time.perf_counter() - start) * 1000
+
+    first_ms = await timed(first_page)
+    cursor_ms = await timed(cursor_page)
+
+    print(f"{num_lines:>9} líneas | cruce por petición {legacy_ms:9.2f} ms | "
+          f"vista: recálculo {rebuild_ms:8.2f} ms, primera página {first_ms:6.2f} ms, "
+          f"página a mitad {cursor_ms:6.2f} ms")
+    repository.close()
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_lines in sizes:
+            asyncio.run(run(num_lines, Path(tmp)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: consultas por carril y rango de captura con CaptureIndex frente
+a un recorrido de todas las matrículas parseando cada nombre de imagen
+
+Uso (desde backend/):
+    python benchmarks/bench_captures.py [num_lineas]
+"""
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+QUERIES = 50
+SCAN_QUERIES = 3
+LIMIT = 100
+
+
+def main() -> None:
+    from infrastructure.adapters.outbound.file.capture_index import parse_capture, timestamp_key
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(11)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        repository = PlatesDatRepository(str(path), load_mode="lazy")
+        repository.get_plate_by_image_name("")
+
+        start = time.perf_counter()
+        repository._get_derived_index("captures")
+        build_s = time.perf_counter() - start
+
+        windows = []
+        for _ in range(QUERIES):
+            begin = datetime(2022, rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 22))
+            windows.append((rng.randint(1, 4), begin, begin + timedelta(hours=1)))
+
+        def indexed(lane, begin, end):
+            return repository.find_captures(lane, begin, end, limit=LIMIT)
+
+        def scan(lane, begin, end):
+            low, high = timestamp_key(begin), timestamp_key(end)
+            matches = []
+            for plate in repository.get_all_plates():
+                capture = parse_capture(plate.image_name)
+                if capture and capture[0] == lane and low <= capture[1] < high:
+                    matches.append((capture[1], plate))
+            matches.sort(key=lambda match: match[0])
+            return [plate for _, plate in matches[:LIMIT]]
+
+        for lane, begin, end in windows[:SCAN_QUERIES]:
+            assert [p.image_name for p in indexed(lane, begin, end)] == \
+                [p.image_name for p in scan(lane, begin, end)]
+
+        start = time.perf_counter()
+        found = sum(len(indexed(*window)) for window in windows)
+        indexed_ms = (time.perf_counter() - start) / len(windows) * 1000
+
+        start = time.perf_counter()
+        for window in windows[:SCAN_QUERIES]:
+            scan(*window)
+        scan_ms = (time.perf_counter() - start) / SCAN_QUERIES * 1000
+
+        repository.close()
+
+    print(f"{num_lines} matrículas | construcción de índices {build_s:.2f} s")
+    print(f"carril + 1 hora | índice {indexed_ms:8.3f} ms/consulta ({found / len(windows):.0f} resultados de media) | "
+          f"recorrido {scan_ms:9.1f} ms/consulta ({scan_ms / indexed_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
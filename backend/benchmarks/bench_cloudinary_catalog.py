@@ -0,0 +1,68 @@
+"""
+Benchmark: latencia de la consulta del conjunto de imágenes de Cloudinary
+con y sin CloudinaryImageCatalog, contra un sustituto local de la Admin API
+La corrección (paginación, TTL, refresco en segundo plano, invalidación)
+se comprueba en tests/test_cloudinary_catalog.py
+
+Uso (desde backend/):
+    python benchmarks/bench_cloudinary_catalog.py [num_imagenes]
+"""
+import asyncio
+import sys
+import time
+
+import synthetic  # noqa: F401  (añade src/ al path)
+from fake_cloudinary import FakeCloudinaryResources
+
+FOLDER = "innova-plates/innova-plates"
+REQUESTS = 50
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def main() -> None:
+    from infrastructure.adapters.outbound.cloudinary.cloudinary_image_catalog import (
+        CloudinaryImageCatalog, list_folder_images
+    )
+
+    num_images = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    fake = FakeCloudinaryResources([f"{FOLDER}/{i:08d}" for i in range(num_images)], latency=0.02)
+    fetch = lambda: list_folder_images(fake, FOLDER)  # noqa: E731
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        fetch()
+    uncached_ms = (time.perf_counter() - start) / REQUESTS * 1000
+    pages = fake.calls // REQUESTS
+    print(f"sin caché | {uncached_ms:8.2f} ms/petición | {pages} páginas de Admin API por petición")
+
+    clock = ManualClock()
+    catalog = CloudinaryImageCatalog(fetch, ttl_seconds=60, clock=clock)
+    fake.calls = 0
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        images = await catalog.get_available_images()
+    cached_ms = (time.perf_counter() - start) / REQUESTS * 1000
+    print(f"con caché | {cached_ms:8.2f} ms/petición | {fake.calls} páginas en {REQUESTS} peticiones "
+          f"({len(images)} imágenes)")
+
+    # Stale-while-revalidate: pasado el TTL se responde con el valor anterior al instante
+    fake.add(f"{FOLDER}/nueva", "2024-01-02T00:00:00Z")
+    clock.now += 61
+    start = time.perf_counter()
+    stale = await catalog.get_available_images()
+    stale_ms = (time.perf_counter() - start) * 1000
+    await catalog._refresh_task
+    fresh = await catalog.get_available_images()
+    print(f"TTL vencido | respuesta en {stale_ms:.2f} ms con {len(stale)} imágenes; "
+          f"tras el refresco en segundo plano: {len(fresh)} (refrescos: {catalog.refresh_count})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
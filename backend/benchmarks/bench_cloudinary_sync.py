@@ -0,0 +1,51 @@
+"""
+Benchmark: llamadas a la Admin API y duración de la sincronización completa
+frente a la incremental, contra un sustituto local de Cloudinary
+La corrección se comprueba en tests/test_cloudinary_sync.py
+
+Uso (desde backend/):
+    python benchmarks/bench_cloudinary_sync.py [num_imagenes]
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import synthetic  # noqa: F401  (añade src/ al path)
+from fake_cloudinary import FakeCloudinaryResources
+
+FOLDER = "innova-plates/innova-plates"
+
+
+def report(label: str, sync, images) -> None:
+    m = sync.metrics()
+    print(f"{label:<38} | {m['last_sync_mode']:<11} | {m['last_sync_api_calls']:>3} llamadas | "
+          f"{m['last_sync_duration_seconds'] * 1000:8.1f} ms | {len(images)} imágenes")
+
+
+def main() -> None:
+    from infrastructure.adapters.outbound.cloudinary.cloudinary_sync import CloudinarySync
+
+    num_images = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    fake = FakeCloudinaryResources([f"{FOLDER}/{i:08d}" for i in range(num_images)], latency=0.02)
+    fake.add("otra-carpeta/ajena", "2024-01-01T00:00:00Z")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = str(Path(tmp) / "snapshot.sqlite3")
+
+        sync = CloudinarySync(fake, FOLDER, snapshot)
+        report("primer arranque", sync, sync.sync())
+
+        for i in range(3):
+            fake.add(f"{FOLDER}/nueva-{i}", f"2024-02-0{i + 1}T00:00:00Z")
+        report("3 subidas nuevas", sync, sync.sync())
+
+        restarted = CloudinarySync(fake, FOLDER, snapshot)
+        report("reinicio con instantánea", restarted, restarted.sync())
+
+        fake.remove(f"{FOLDER}/00000000")
+        restarted.full_sync_interval = 0
+        report("listado completo periódico (borrado)", restarted, restarted.sync())
+
+
+if __name__ == "__main__":
+    main()
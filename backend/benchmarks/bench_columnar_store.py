@@ -0,0 +1,69 @@
+"""
+Benchmark: almacén columnar vs diccionario de dataclasses
+
+Uso (desde backend/):
+    python benchmarks/bench_columnar_store.py [num_lineas]
+
+Cada variante se carga en un subproceso propio para medir el RSS máximo
+sin interferencias entre ellas.
+"""
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+LOOKUPS = 100_000
+
+
+def run_variant(variant: str, path: str) -> None:
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    repo = PlatesDatRepository(path)
+
+    start = time.perf_counter()
+    if variant == "dict":
+        # Comportamiento anterior: un grafo de dataclasses por línea
+        cache = {}
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                plate = repo._parse_line(line.strip())
+                cache[plate.image_name] = plate
+        lookup = cache.get
+        names = list(cache)
+    else:
+        store = repo._load_plates_cache()
+        lookup = repo.get_plate_by_image_name
+        names = list(store.image_names)
+    load_time = time.perf_counter() - start
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024
+
+    keys = random.Random(1).choices(names, k=LOOKUPS)
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    lookup_us = (time.perf_counter() - start) / LOOKUPS * 1e6
+
+    print(f"{variant:>9} | carga {load_time:7.2f} s | RSS +{rss_mb:8.1f} MB | lookup {lookup_us:6.2f} us")
+
+
+def main() -> None:
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        print(f"plates.dat sintético: {num_lines} líneas, {path.stat().st_size / 2**20:.0f} MB")
+        for variant in ("dict", "columnar"):
+            subprocess.run([sys.executable, __file__, "--variant", variant, str(path)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--variant":
+        run_variant(sys.argv[2], sys.argv[3])
+    else:
+        main()
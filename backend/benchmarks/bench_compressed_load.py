@@ -0,0 +1,62 @@
+"""
+Benchmark: tiempo de carga y RSS máximo de plates.dat comprimido frente
+al fichero sin comprimir
+
+Uso (desde backend/):
+    python benchmarks/bench_compressed_load.py [num_lineas]
+"""
+import bz2
+import gzip
+import lzma
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+COMPRESSORS = {
+    "gz": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+
+def run_variant(path: str) -> None:
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    repo = PlatesDatRepository(path, parse_workers=1)
+    start = time.perf_counter()
+    store = repo._load_plates_cache()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    size_mb = Path(path).stat().st_size / 2**20
+
+    print(f"{Path(path).name:>14} | {size_mb:7.1f} MB en disco | carga {elapsed:6.2f} s | "
+          f"RSS máx {peak_mb:7.1f} MB | {len(store)} matrículas")
+
+
+def main() -> None:
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        paths = [plain]
+        for suffix, opener in COMPRESSORS.items():
+            target = Path(tmp) / f"plates.dat.{suffix}"
+            with open(plain, 'rb') as src, opener(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            paths.append(target)
+
+        for path in paths:
+            subprocess.run([sys.executable, __file__, "--variant", str(path)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--variant":
+        run_variant(sys.argv[2])
+    else:
+        main()
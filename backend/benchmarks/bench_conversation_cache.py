@@ -0,0 +1,198 @@
+"""
+Benchmark: caché de lectura de conversaciones y mensajes frente a ir
+siempre a Supabase, reproduciendo una carga de chat contra los sustitutos
+locales de Supabase (con latencia de red simulada) y de Redis
+
+La traza mezcla usuarios que envían un turno de chat (POST /messages/batch
+y, como hace el frontend, recarga de la lista de conversaciones y del
+historial), cambian de conversación o vuelven a la pestaña (recarga de
+ambas listas). Se reproduce igual sin caché, con la LRU en memoria y con el
+almacén Redis, y se mide p50/p99 de cada tipo de petición y los aciertos.
+
+Durante la reproducción comprueba que, tras cada escritura, el historial
+termina en los mensajes guardados y la conversación sube al principio de
+la lista; al final, que todas las listas cacheadas coinciden con Supabase
+y que crear una conversación invalida la lista del usuario.
+
+Uso (desde backend/):
+    python benchmarks/bench_conversation_cache.py [latencia_ms] [num_pasos]
+"""
+import asyncio
+import copy
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+import synthetic  # noqa: F401  (añade src/ al path)
+from fake_redis import FakeRedis
+from fake_supabase import FakeSupabase
+
+SERVICE_KEY = "service-role-key"
+USERS = 40
+CONVERSATIONS_PER_USER = 6
+MESSAGES_PER_CONVERSATION = 30
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def seed_tables():
+    conversations, messages = [], []
+    for u in range(USERS):
+        for c in range(CONVERSATIONS_PER_USER):
+            cid = f"c{u:03d}-{c}"
+            stamp = f"2024-01-{c + 1:02d}T00:00:00"
+            conversations.append({"id": cid, "user_id": f"u{u:03d}", "title": f"Conversación {c}",
+                                  "created_at": stamp, "updated_at": stamp})
+            for m in range(MESSAGES_PER_CONVERSATION):
+                messages.append({"id": f"{cid}-m{m:03d}", "conversation_id": cid,
+                                 "role": "user" if m % 2 == 0 else "assistant",
+                                 "content": f"mensaje {m} " + "texto " * 20,
+                                 "created_at": f"2024-01-{c + 1:02d}T00:{m // 60:02d}:{m % 60:02d}"})
+    return {"conversations": conversations, "messages": messages}
+
+
+def build_trace(steps: int):
+    """Acciones de usuarios activos: (usuario, acción, conversación)"""
+    rng = random.Random(7)
+    current = {}
+    trace = []
+    active = [f"u{u:03d}" for u in range(USERS)]
+    for _ in range(steps):
+        user = rng.choice(active[:10]) if rng.random() < 0.8 else rng.choice(active)
+        conversations = [f"c{user[1:]}-{c}" for c in range(CONVERSATIONS_PER_USER)]
+        current.setdefault(user, conversations[-1])
+        roll = rng.random()
+        if roll < 0.4:
+            trace.append((user, "turn", current[user]))
+        elif roll < 0.7:
+            current[user] = rng.choice(conversations)
+            trace.append((user, "switch", current[user]))
+        else:
+            trace.append((user, "reload", current[user]))
+    return trace
+
+
+async def replay(client, trace, samples) -> None:
+    async def timed(kind, request):
+        start = time.perf_counter()
+        response = await request
+        samples[kind].append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        return response.json()
+
+    for step, (user, action, cid) in enumerate(trace):
+        list_conversations = lambda: timed("GET /conversations", client.get("/conversations", params={"user_id": user}))
+        list_messages = lambda: timed("GET .../messages", client.get(f"/conversations/{cid}/messages"))
+        if action == "turn":
+            saved = await timed("POST .../messages/batch", client.post(f"/conversations/{cid}/messages/batch", json={"messages": [
+                {"role": "user", "content": f"pregunta {step}"}, {"role": "assistant", "content": f"respuesta {step}"}
+            ]}))
+            conversations = await list_conversations()
+            history = await list_messages()
+            # Lo recién escrito se ve en la siguiente lectura, aunque la anterior estuviera cacheada
+            assert conversations[0]["id"] == cid, (step, conversations[0]["id"], cid)
+            assert [m["id"] for m in history[-2:]] == [m["id"] for m in saved], step
+        elif action == "switch":
+            await list_messages()
+        else:
+            await list_conversations()
+            await list_messages()
+
+
+async def check_consistency(client, uncached, trace) -> None:
+    """Todas las listas servidas coinciden con Supabase y crear una conversación invalida la lista"""
+    for user in sorted({user for user, _, _ in trace}):
+        served = (await client.get("/conversations", params={"user_id": user})).json()
+        assert served == await uncached.get_conversations(user), user
+        for row in served:
+            history = (await client.get(f"/conversations/{row['id']}/messages")).json()
+            assert history == await uncached.get_messages(row["id"]), row["id"]
+
+    user = trace[0][0]
+    before = (await client.get("/conversations", params={"user_id": user})).json()
+    created = (await client.post("/conversations", json={"user_id": user, "title": "nueva"})).json()
+    after = (await client.get("/conversations", params={"user_id": user})).json()
+    assert len(after) == len(before) + 1 and created["id"] in {row["id"] for row in after}
+
+
+async def main() -> None:
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    fake = FakeSupabase(latency=latency_ms / 1000)
+    url = fake.start()
+    fake.install_save_messages()
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = SERVICE_KEY
+    redis = FakeRedis()
+    redis_url = redis.start()
+
+    from fastapi import FastAPI
+    from application.services.conversation_cache import ConversationCache
+    from application.services.conversation_service import ConversationService
+    from infrastructure.adapters.inbound.api.routes import conversation
+    from infrastructure.adapters.outbound.cache.memory_cache_store import MemoryCacheStore
+    from infrastructure.adapters.outbound.cache.redis_cache_store import RedisCacheStore
+    from infrastructure.adapters.outbound.database.supabase_client import (
+        close_supabase_clients, get_supabase_data_client
+    )
+
+    seed = seed_tables()
+    trace = build_trace(steps)
+    app = FastAPI()
+    app.include_router(conversation.router)
+
+    variants = (
+        ("sin caché", lambda: None),
+        ("memoria (LRU + TTL)", lambda: ConversationCache(MemoryCacheStore(10000), 30)),
+        ("Redis (sustituto local)", lambda: ConversationCache(RedisCacheStore(redis_url), 30, backend="redis")),
+    )
+    print(f"latencia simulada {latency_ms:.0f} ms por llamada a Supabase; {len(trace)} pasos de "
+          f"{len({user for user, _, _ in trace})} usuarios "
+          f"({sum(1 for _, action, _ in trace if action == 'turn')} turnos de chat)")
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, make_cache in variants:
+            fake.tables = copy.deepcopy(seed)
+            cache = make_cache()
+            app.dependency_overrides = {
+                conversation.get_conversation_service: lambda: ConversationService(get_supabase_data_client(), cache)
+            }
+            fake.reset_counters()
+            samples = defaultdict(list)
+            start = time.perf_counter()
+            await replay(client, trace, samples)
+            elapsed = time.perf_counter() - start
+            calls = fake.requests
+
+            uncached = ConversationService(get_supabase_data_client())
+            await check_consistency(client, uncached, trace)
+            results[name] = (samples, elapsed, calls, cache.stats() if cache is not None else None)
+            if cache is not None:
+                await cache.close()
+
+    for name, (samples, elapsed, calls, stats) in results.items():
+        print(f"\n{name}: {elapsed:.1f} s en total, {calls} llamadas a Supabase")
+        for kind, values in samples.items():
+            print(f"  {kind:<24} | {len(values):4d} | media {statistics.mean(values):6.2f} ms | "
+                  f"p50 {percentile(values, 0.5):6.2f} ms | p99 {percentile(values, 0.99):6.2f} ms")
+        if stats is not None:
+            print(f"  aciertos {stats['hits']}, fallos {stats['misses']} (ratio {stats['hit_ratio']}), "
+                  f"invalidaciones {stats['invalidations']}")
+    print("\ncorrecto: lecturas frescas tras cada escritura y listas cacheadas iguales a Supabase")
+
+    await close_supabase_clients()
+    redis.stop()
+    fake.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+"""
+Benchmark: historial completo frente a paginación por clave en
+GET /conversations y GET /conversations/{id}/messages, contra el sustituto
+local de Supabase con una conversación de 20000 mensajes
+
+Mide latencia y tamaño de respuesta de abrir la conversación (lista
+completa frente a la última página), de una página profunda y de la
+exportación en streaming. Antes comprueba que recorrer las páginas en
+ambos sentidos, y el streaming, devuelve exactamente la lista completa,
+incluidos mensajes con el mismo created_at.
+
+El sustituto filtra y ordena toda la tabla en Python en cada consulta
+(sin índices), así que su parte del coste es parecida en todas las
+variantes; la diferencia medida viene de las filas transferidas,
+parseadas y validadas.
+
+Uso (desde backend/):
+    python benchmarks/bench_conversation_pages.py [num_mensajes]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+import synthetic  # noqa: F401  (añade src/ al path)
+from fake_supabase import FakeSupabase
+
+SERVICE_KEY = "service-role-key"
+REPEATS = 10
+PAGE_SIZE = 50
+
+
+def timestamp(base: datetime, step: int) -> str:
+    return (base + timedelta(milliseconds=step)).isoformat(timespec="microseconds")
+
+
+def populate(fake: FakeSupabase, num_messages: int) -> None:
+    base = datetime(2024, 1, 1)
+    # Cada 3 filas comparten timestamp: el id desempata
+    fake.tables["messages"] = [
+        {"id": f"m{i:07d}", "conversation_id": "c-long", "role": "user" if i % 2 == 0 else "assistant",
+         "content": f"mensaje {i} " + "x" * 200, "created_at": timestamp(base, i // 3), "extra": "no proyectada"}
+        for i in range(num_messages)
+    ]
+    fake.tables["messages"] += [
+        {"id": f"o{i:07d}", "conversation_id": f"c{i % 100:03d}", "role": "user", "content": "otro",
+         "created_at": timestamp(base, i)}
+        for i in range(5000)
+    ]
+    fake.tables["conversations"] = [
+        {"id": f"c{i:05d}", "user_id": "u1", "title": f"Conversación {i}",
+         "created_at": timestamp(base, i), "updated_at": timestamp(base, i // 2)}
+        for i in range(2000)
+    ]
+
+
+async def walk(client, path: str, cursor_name: str, key: str, params: dict):
+    rows, cursor = [], None
+    while True:
+        query = dict(params, **({cursor_name.replace("next_", ""): cursor} if cursor else {}))
+        page = (await client.get(path, params=query)).json()
+        rows = page[key] + rows if cursor_name == "next_before" else rows + page[key]
+        cursor = page[cursor_name]
+        if cursor is None:
+            return rows
+
+
+async def check_correctness(client) -> None:
+    full = (await client.get("/conversations/c-long/messages")).json()
+    assert "extra" not in full[0]
+
+    backwards = await walk(client, "/conversations/c-long/messages", "next_before", "messages", {"page_size": 997})
+    assert backwards == full
+    first_page = (await client.get("/conversations/c-long/messages", params={"page_size": 1000})).json()
+    assert first_page["messages"] == full[-1000:] and first_page["next_after"] is None
+
+    middle = (await client.get("/conversations/c-long/messages", params={"before": first_page["next_before"]})).json()
+    newer = (await client.get("/conversations/c-long/messages", params={"after": middle["next_after"], "page_size": 10})).json()
+    assert newer["messages"] == full[-1000:-990]
+
+    lines = (await client.get("/conversations/c-long/messages", params={"stream": "true"})).text.splitlines()
+    assert [json.loads(line) for line in lines] == full
+
+    conversations = (await client.get("/conversations", params={"user_id": "u1"})).json()
+    forward = await walk(client, "/conversations", "next_after", "conversations", {"user_id": "u1", "page_size": 333})
+    assert forward == conversations
+    first = (await client.get("/conversations", params={"user_id": "u1", "page_size": 1})).json()
+    rest = (await client.get("/conversations", params={"user_id": "u1", "after": first["next_after"]})).json()
+    assert rest["conversations"][0] == conversations[1] and rest["next_before"] is not None
+
+    assert (await client.get("/conversations", params={"user_id": "u1", "after": "no-es-un-cursor"})).status_code == 400
+    print(f"correcto: {len(full)} mensajes y {len(conversations)} conversaciones recorridos en ambos sentidos y en streaming")
+
+
+async def measure(client, params: dict, path: str = "/conversations/c-long/messages"):
+    samples, size = [], 0
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        size = len(response.content)
+    return statistics.median(samples), size
+
+
+async def main() -> None:
+    num_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    fake = FakeSupabase()
+    url = fake.start()
+    populate(fake, num_messages)
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = SERVICE_KEY
+    # Se mide el acceso a Supabase, no la caché de lecturas de conversaciones
+    os.environ["CONVERSATION_CACHE_TTL"] = "0"
+
+    from fastapi import FastAPI
+    from application.services.conversation_service import encode_cursor
+    from infrastructure.adapters.inbound.api.routes import conversation
+    from infrastructure.adapters.outbound.database.supabase_client import close_supabase_clients
+
+    app = FastAPI()
+    app.include_router(conversation.router)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+        await check_correctness(client)
+
+        middle = fake.tables["messages"][num_messages // 2]
+        deep_cursor = encode_cursor(middle["created_at"], middle["id"])
+        cases = (
+            ("historial completo (sin cursor)", {}),
+            (f"última página ({PAGE_SIZE})", {"page_size": PAGE_SIZE}),
+            (f"página profunda ({PAGE_SIZE}, a mitad)", {"page_size": PAGE_SIZE, "before": deep_cursor}),
+            ("exportación en streaming", {"stream": "true"}),
+        )
+        print(f"conversación de {num_messages} mensajes, mediana de {REPEATS} peticiones")
+        for label, params in cases:
+            latency, size = await measure(client, params)
+            print(f"{label:<32} | {latency:8.1f} ms | {size / 1024:8.1f} KiB")
+
+        for label, params in (("conversaciones: lista completa", {"user_id": "u1"}),
+                              (f"conversaciones: página de {PAGE_SIZE}", {"user_id": "u1", "page_size": PAGE_SIZE})):
+            latency, size = await measure(client, params, "/conversations")
+            print(f"{label:<32} | {latency:8.1f} ms | {size / 1024:8.1f} KiB")
+
+    await close_supabase_clients()
+    fake.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""
+Benchmark: latencia de /ocr/stats según el tamaño del conjunto, frente a
+calcular los agregados por petición con get_all_plates() y un bucle Python
+
+Antes de medir comprueba, contra ese cálculo directo, los agregados de los
+tres modos de repositorio y la actualización incremental tras un append
+(con imágenes nuevas, reemplazadas y multi-matrícula).
+
+Uso (desde backend/):
+    python benchmarks/bench_dataset_stats.py [tamaño1,tamaño2,...]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from synthetic import synthetic_line, write_plates_dat
+
+REQUESTS = 200
+
+
+def naive_statistics(plates) -> dict:
+    """Lo que haría cada petición sin agregados precalculados"""
+    from infrastructure.adapters.outbound.file.capture_index import parse_capture
+
+    chars, lengths, lanes, days = Counter(), Counter(), Counter(), Counter()
+    num_plates = invalid = 0
+    for image in plates:
+        capture = parse_capture(image.image_name)
+        if capture:
+            lanes[str(capture[0])] += 1
+            day = str(capture[1])[:8]
+            days[f"{day[:4]}-{day[4:6]}-{day[6:]}"] += 1
+        for plate in image.all_plates:
+            num_plates += 1
+            invalid += not plate.is_valid()
+            lengths[str(plate.num_characters)] += 1
+            chars.update(c.char for c in plate.characters)
+    return {
+        "images": len(plates),
+        "plates": num_plates,
+        "invalid_plates": invalid,
+        "invalid_rate": invalid / num_plates if num_plates else 0.0,
+        "char_frequency": dict(sorted(chars.items())),
+        "length_histogram": dict(sorted(lengths.items(), key=lambda item: int(item[0]))),
+        "images_per_lane": dict(sorted(lanes.items(), key=lambda item: int(item[0]))),
+        "images_per_day": dict(sorted(days.items())),
+    }
+
+
+def check_correctness(tmp: Path) -> None:
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+    from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+    path = write_plates_dat(tmp / "check.dat", 3_000, multi_plate_ratio=0.2)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    # Carácter inválido y una imagen repetida en el propio fichero
+    invalid = lines[5].split()
+    lines[5] = ' '.join(invalid[:11] + ['a'] + invalid[12:])
+    first = lines[0].split()
+    lines.append(' '.join(first[:11] + ['a'] + first[12:]))
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    repositories = {
+        "eager": PlatesDatRepository(str(path), load_mode="eager"),
+        "streaming": PlatesDatRepository(str(path), load_mode="streaming"),
+        "index": PlatesIndexRepository(str(path), str(tmp / "check.idx")),
+    }
+    expected = naive_statistics(repositories["eager"].get_all_plates())
+    assert expected["invalid_plates"] > 0
+    for label, repository in repositories.items():
+        assert repository.get_statistics() == expected, label
+
+    # Append: imágenes nuevas, una reemplazada (multi-matrícula -> una) y una repetida dentro del append
+    eager = repositories["eager"]
+    rng = random.Random(3)
+    multi_name = next(line.split()[0] for line in lines if line.split()[1] != '1')
+    appended = [synthetic_line(10_000 + i, rng, 1 + (i % 4 == 0)) for i in range(50)]
+    replacement = synthetic_line(20_000, rng).split()
+    appended.append(' '.join([multi_name] + replacement[1:]))
+    appended.append(appended[0])
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('\n'.join(appended) + '\n')
+
+    assert eager.reload_if_changed()
+    updated = eager._derived["statistics"]
+    assert updated[0] is eager._load_plates_cache(), "las estadísticas deben venir del append"
+    assert eager.get_statistics() == naive_statistics(eager.get_all_plates())
+
+    for repository in repositories.values():
+        repository.close()
+    print(f"correcto: 3 modos y append incremental ({len(appended)} líneas añadidas)")
+
+
+async def endpoint_latency_ms(app) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get("/ocr/stats")).raise_for_status()
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            (await client.get("/ocr/stats")).raise_for_status()
+        return (time.perf_counter() - start) / REQUESTS * 1000
+
+
+def main() -> None:
+    from fastapi import FastAPI
+    from application.services.ocr_service import OCRService
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+    from infrastructure.adapters.outbound.file.plate_statistics import PlateStatistics
+
+    sizes = [int(s) for s in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10_000, 100_000, 500_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_correctness(Path(tmp))
+        # El módulo de rutas abre plates.dat al importarse
+        os.environ.setdefault("PLATES_DAT_PATH", str(Path(tmp) / "check.dat"))
+        from infrastructure.adapters.inbound.api.routes import ocr
+
+        print("imágenes  | /ocr/stats    | cálculo por petición | construcción en la carga | append de 1000 líneas")
+        for size in sizes:
+            path = write_plates_dat(Path(tmp) / f"plates_{size}.dat", size, multi_plate_ratio=0.05)
+            repository = PlatesDatRepository(str(path), load_mode="lazy")
+            store = repository._load_plates_cache()
+
+            start = time.perf_counter()
+            statistics = PlateStatistics.from_store(store)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            ocr.ocr_service = OCRService(repository)
+            app = FastAPI()
+            app.include_router(ocr.router)
+            served_ms = asyncio.run(endpoint_latency_ms(app))
+
+            start = time.perf_counter()
+            naive_statistics(repository.get_all_plates())
+            naive_ms = (time.perf_counter() - start) * 1000
+
+            rng = random.Random(size)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write(''.join(synthetic_line(size + i, rng) + '\n' for i in range(1000)))
+            tail, _ = repository._parse_appended_tail(path.stat().st_size)
+            extended = store.copy()
+            extended.extend(tail)
+            start = time.perf_counter()
+            statistics.after_append(store, extended, len(store.image_names))
+            append_ms = (time.perf_counter() - start) * 1000
+            repository.close()
+
+            print(f"{size:9d} | {served_ms:8.3f} ms   | {naive_ms:12.1f} ms      | {build_ms:12.1f} ms          | "
+                  f"{append_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
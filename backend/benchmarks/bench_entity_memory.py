@@ -0,0 +1,106 @@
+"""
+Benchmark: bytes por matrícula materializada con las entidades con
+__slots__ frente a las dataclasses originales (con __dict__ por instancia)
+
+Uso (desde backend/):
+    python benchmarks/bench_entity_memory.py [num_lineas]
+"""
+import gc
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from synthetic import write_plates_dat
+
+
+# Entidades tal como estaban antes de usar __slots__
+@dataclass
+class DictCharacter:
+    char: str
+    left: float
+    top: float
+    width: float
+    height: float
+
+
+@dataclass
+class DictPlateCoordinates:
+    top_left: tuple
+    top_right: tuple
+    bottom_right: tuple
+    bottom_left: tuple
+
+
+@dataclass
+class DictPlate:
+    image_name: str
+    plate_number: str
+    characters: List[DictCharacter]
+    coordinates: DictPlateCoordinates
+    num_plates_in_image: int
+
+
+def to_dict_entities(plate) -> DictPlate:
+    return DictPlate(
+        image_name=plate.image_name,
+        plate_number=plate.plate_number,
+        characters=[DictCharacter(c.char, c.left, c.top, c.width, c.height) for c in plate.characters],
+        coordinates=DictPlateCoordinates(
+            plate.coordinates.top_left, plate.coordinates.top_right,
+            plate.coordinates.bottom_right, plate.coordinates.bottom_left
+        ),
+        num_plates_in_image=plate.num_plates_in_image
+    )
+
+
+def measure(build) -> int:
+    """Bytes asignados para construir y retener el resultado de build()"""
+    gc.collect()
+    tracemalloc.start()
+    retained = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return current
+
+
+def main() -> None:
+    from infrastructure.adapters.outbound.file.plates_columnar_store import PlatesColumnarStore
+    from infrastructure.adapters.outbound.file.plates_dat_repository import _append_line
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        store = PlatesColumnarStore()
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                _append_line(store, line)
+
+    rows = list(store.rows())
+    # Los valores (cadenas, floats, tuplas) se comparten en ambas variantes:
+    # solo se compara el coste de las propias entidades
+    slotted = [store.materialize(row) for row in rows]
+
+    slots_bytes = measure(lambda: [
+        type(p)(
+            p.image_name, p.plate_number, [type(c)(c.char, c.left, c.top, c.width, c.height) for c in p.characters],
+            type(p.coordinates)(p.coordinates.top_left, p.coordinates.top_right,
+                                p.coordinates.bottom_right, p.coordinates.bottom_left),
+            p.num_plates_in_image, p.invalid_chars, p.sorted_chars
+        )
+        for p in slotted
+    ])
+    dict_bytes = measure(lambda: [to_dict_entities(p) for p in slotted])
+
+    print(f"{len(rows)} matrículas materializadas")
+    print(f"dataclasses con __dict__ | {dict_bytes / len(rows):7.0f} bytes/matrícula")
+    print(f"entidades con __slots__  | {slots_bytes / len(rows):7.0f} bytes/matrícula "
+          f"({1 - slots_bytes / dict_bytes:.0%} menos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: comprobaciones de existencia con el filtro de Bloom de nombres
+
+Mide la tasa real de falsos positivos, la memoria por clave y el
+rendimiento (comprobaciones/s) con cargas mayoritariamente de aciertos y
+mayoritariamente de fallos (el caso de la pasarela de cámaras), para:
+  - el filtro solo, frente a las búsquedas exactas en memoria y en el
+    índice binario (que no llevan filtro delante: ya son una sonda hash)
+  - el modo streaming sin y con filtro, nombre a nombre y por lotes
+  - GET /ocr/exists/{imagen} nombre a nombre frente a POST /ocr/exists por lotes
+
+Uso (desde backend/):
+    python benchmarks/bench_exists_filter.py [num_lineas]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from synthetic import write_plates_dat
+
+CHECKS = 50_000
+FPR_PROBES = 200_000
+STREAMING_BATCH = 200
+STREAMING_SINGLE = 20
+HTTP_NAMES = 2_000
+
+
+def workload(names, hit_ratio: float, size: int, rng: random.Random):
+    """Nombres a comprobar: una fracción hit_ratio existe, el resto no"""
+    return [
+        rng.choice(names) if rng.random() < hit_ratio else f"FRAME{rng.randrange(10 ** 9)}_lane9_0_20230101_000000.jpg"
+        for _ in range(size)
+    ]
+
+
+def rate(call, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        call(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+async def http_rates(app, probes):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        single = [(await client.get(f"/ocr/exists/{name}")).json()["exists"] for name in probes]
+        single_rate = len(probes) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = await client.post("/ocr/exists", json={"image_names": probes})
+        batched_rate = len(probes) / (time.perf_counter() - start)
+        batched = response.json()["exists"]
+
+    assert single == [batched[name] for name in probes]
+    return single_rate, batched_rate
+
+
+def main() -> None:
+    from fastapi import FastAPI
+    from application.services.ocr_service import OCRService
+    from infrastructure.adapters.outbound.file.image_name_filter import open_name_filter
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+    from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(9)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        # El módulo de rutas abre plates.dat al importarse
+        os.environ.setdefault("PLATES_DAT_PATH", str(path))
+        from infrastructure.adapters.inbound.api.routes import ocr
+
+        start = time.perf_counter()
+        bloom = open_name_filter(str(path))
+        build_s = time.perf_counter() - start
+
+        memory = PlatesDatRepository(str(path), load_mode="lazy")
+        names = list(memory.iter_image_names())
+        index = PlatesIndexRepository(str(path))
+        streaming = PlatesDatRepository(str(path), load_mode="streaming")
+
+        # Sin falsos negativos, y la tasa real de falsos positivos
+        assert all(name in bloom for name in names)
+        absent = [f"absent_{i}.jpg" for i in range(FPR_PROBES)]
+        false_positives = sum(name in bloom for name in absent)
+
+        print(f"{num_lines} imágenes | filtro {bloom.size_bytes / 1024:.0f} KiB, "
+              f"{bloom.size_bytes * 8 / bloom.num_keys:.2f} bits/clave, {bloom.num_hashes} hashes, "
+              f"construcción {build_s:.2f} s")
+        print(f"falsos positivos: medidos {false_positives / FPR_PROBES:.4%} | "
+              f"teóricos {bloom.expected_false_positive_rate():.4%}")
+
+        for label, hit_ratio in (("mayoría aciertos (90%)", 0.9), ("mayoría fallos (5% aciertos)", 0.05)):
+            probes = workload(names, hit_ratio, CHECKS, rng)
+            expected = [memory.plate_exists(name) for name in probes]
+            assert [index.plate_exists(name) for name in probes] == expected
+
+            print(f"\n{label}")
+            print(f"  filtro solo                | {rate(lambda n: n in bloom, probes):10.0f} comprobaciones/s")
+            print(f"  memoria (dict)             | {rate(memory.plate_exists, probes):10.0f} comprobaciones/s")
+            print(f"  índice binario             | {rate(index.plate_exists, probes):10.0f} comprobaciones/s")
+
+            single = probes[:STREAMING_SINGLE]
+            start = time.perf_counter()
+            unfiltered = [streaming._scan(name) is not None for name in single]
+            scan_rate = len(single) / (time.perf_counter() - start)
+            start = time.perf_counter()
+            assert [streaming.plate_exists(name) for name in single] == unfiltered
+            filter_rate = len(single) / (time.perf_counter() - start)
+            print(f"  streaming, nombre a nombre | sin filtro {scan_rate:8.1f}/s | con filtro {filter_rate:8.1f}/s")
+
+            batch = probes[:STREAMING_BATCH]
+            start = time.perf_counter()
+            unfiltered = streaming._scan_many(batch)
+            scan_s = time.perf_counter() - start
+            start = time.perf_counter()
+            filtered = streaming.plates_exist(batch)
+            filter_s = time.perf_counter() - start
+            assert filtered == {name: plate is not None for name, plate in unfiltered.items()}
+            print(f"  streaming, lote de {STREAMING_BATCH}     | sin filtro {scan_s * 1000:8.1f} ms | "
+                  f"con filtro {filter_s * 1000:8.1f} ms")
+
+            app = FastAPI()
+            app.include_router(ocr.router)
+            ocr.ocr_service = OCRService(index)
+            single_rate, batched_rate = asyncio.run(http_rates(app, probes[:HTTP_NAMES]))
+            print(f"  HTTP (índice)              | GET por nombre {single_rate:8.0f}/s | "
+                  f"POST /ocr/exists por lotes {batched_rate:8.0f}/s")
+
+        index.close()
+        bloom.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark del soporte de varias matrículas por imagen
+
+Mide el rendimiento de parseo (líneas/s) del parser anterior, de una sola
+matrícula, frente al actual, y la carga y las consultas del repositorio.
+La corrección se comprueba en tests/test_multi_plate.py
+
+Uso (desde backend/):
+    python benchmarks/bench_multi_plate.py [num_lineas]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+
+def single_plate_parse(line: str):
+    """Parser anterior (parse_plate_fields): solo el primer bloque de la línea"""
+    parts = line.split()
+
+    if len(parts) < 11:
+        raise ValueError(f"Línea con formato inválido: {line[:50]}...")
+
+    image_name = parts[0]
+    num_plates = int(parts[1])
+    coords = [int(parts[i]) for i in range(2, 10)]
+
+    num_chars = int(parts[10])
+    if num_chars <= 0:
+        raise ValueError("Debe haber al menos un carácter")
+
+    chars = []
+    boxes = []
+    idx = 11
+
+    for _ in range(num_chars):
+        if idx + 4 >= len(parts):
+            raise ValueError(f"Faltan datos de caracteres en: {image_name}")
+
+        chars.append(parts[idx])
+        boxes.append(float(parts[idx + 1]))
+        boxes.append(float(parts[idx + 2]))
+        boxes.append(float(parts[idx + 3]))
+        boxes.append(float(parts[idx + 4]))
+        idx += 5
+
+    order = sorted(range(num_chars), key=lambda i: boxes[i * 4])
+    plate_number = ''.join(chars[i] for i in order)
+
+    return image_name, num_plates, coords, chars, boxes, plate_number
+
+
+def parse_throughput(path: Path, parse) -> float:
+    lines = path.read_text(encoding='utf-8').splitlines()
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository, parse_plate_line
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = write_plates_dat(Path(tmp) / "single.dat", num_lines)
+        multi = write_plates_dat(Path(tmp) / "multi.dat", num_lines, multi_plate_ratio=0.1)
+
+        print(f"parser anterior (1 matrícula) | {parse_throughput(single, single_plate_parse):9.0f} líneas/s")
+        print(f"parser actual, 1 matrícula    | {parse_throughput(single, parse_plate_line):9.0f} líneas/s")
+        print(f"parser actual, 10% multi      | {parse_throughput(multi, parse_plate_line):9.0f} líneas/s")
+
+        for label, source in (("1 matrícula", single), ("10% multi", multi)):
+            repository = PlatesDatRepository(str(source), load_mode="lazy", parse_workers=1)
+            start = time.perf_counter()
+            repository.get_plate_by_image_name("")
+            load_s = time.perf_counter() - start
+            names = list(repository.iter_image_names())[:50_000]
+            start = time.perf_counter()
+            for name in names:
+                repository.get_plate_by_image_name(name)
+            lookup_us = (time.perf_counter() - start) / len(names) * 1e6
+            print(f"carga, {label:<23}| {num_lines / load_s:9.0f} líneas/s | consulta {lookup_us:5.2f} µs")
+            repository.close()
+
+
+if __name__ == "__main__":
+    main()
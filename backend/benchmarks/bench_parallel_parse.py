@@ -0,0 +1,38 @@
+"""
+Benchmark: throughput de carga de plates.dat (líneas/segundo) según el
+número de procesos del parser
+
+Uso (desde backend/):
+    python benchmarks/bench_parallel_parse.py [num_lineas] [workers...]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+
+def main() -> None:
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cpus = os.cpu_count() or 1
+    workers = [int(w) for w in sys.argv[2:]] or sorted({1, 2, 4, 8, cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        print(f"{num_lines} líneas, {path.stat().st_size / 2**20:.0f} MB, {cpus} CPUs")
+
+        for count in workers:
+            repo = PlatesDatRepository(str(path), parse_workers=count)
+            repo.PARALLEL_MIN_BYTES = 0
+            start = time.perf_counter()
+            store = repo._build_store()
+            elapsed = time.perf_counter() - start
+            print(f"workers={count:>2} | {elapsed:7.2f} s | {len(store) / elapsed:10,.0f} líneas/s")
+
+
+if __name__ == "__main__":
+    main()
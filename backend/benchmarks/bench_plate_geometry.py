@@ -0,0 +1,167 @@
+"""
+Benchmark: geometría de matrículas calculada en bloque con NumPy
+(PlateGeometryTable) frente a un bucle Python objeto a objeto
+(PlateGeometry.compute sobre cada matrícula materializada)
+
+Antes de medir comprueba que ambas implementaciones coinciden y que las
+consultas por geometría devuelven lo mismo en todos los modos de carga.
+
+Uso (desde backend/):
+    python benchmarks/bench_plate_geometry.py [num_lineas]
+"""
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+QUERY_REPEATS = 20
+
+
+def assert_same_geometry(expected, actual, context) -> None:
+    for name in ('area', 'skew_angle', 'aspect_ratio', 'char_spacing_mean', 'char_spacing_std'):
+        assert math.isclose(getattr(expected, name), getattr(actual, name), rel_tol=1e-9, abs_tol=1e-9), (context, name)
+    assert expected.bounding_box == actual.bounding_box, context
+    assert expected.overlapping_chars == actual.overlapping_chars, context
+
+
+def check_correctness(path: Path) -> None:
+    import numpy as np
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from application.services.ocr_service import OCRService
+
+    # El módulo de rutas abre plates.dat al importarse
+    os.environ.setdefault("PLATES_DAT_PATH", str(path))
+    from infrastructure.adapters.inbound.api.routes import ocr
+    from infrastructure.adapters.inbound.api.response_cache import ResponseCache
+    from domain.entities.plate import Character, GeometryFilter, PlateCoordinates, PlateGeometry
+    from infrastructure.adapters.outbound.file.plate_geometry import PlateGeometryTable
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+    from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+    # Caso conocido: rectángulo girado 45°, dos caracteres solapados
+    square = PlateCoordinates.from_list([0, 0, 10, 10, 0, 20, -10, 10])
+    chars = [Character('A', 0.1, 0.1, 0.3, 0.5), Character('B', 0.3, 0.2, 0.3, 0.5), Character('C', 0.7, 0.1, 0.1, 0.5)]
+    known = PlateGeometry.compute(square, chars)
+    assert math.isclose(known.area, 200.0) and math.isclose(known.skew_angle, 45.0)
+    assert known.bounding_box == (-10, 0, 10, 20) and known.overlapping_chars == 1
+    # Caracteres desordenados en las columnas: la versión vectorizada los ordena por left
+    shuffled = [chars[2], chars[0], chars[1]]
+    table = PlateGeometryTable.compute(
+        np.array([0, 0, 10, 10, 0, 20, -10, 10]),
+        np.array([v for c in shuffled for v in (c.left, c.top, c.width, c.height)]),
+        np.array([0, 3]),
+        np.array([0]),
+    )
+    assert_same_geometry(known, table.get(0), "caso conocido")
+
+    repositories = {
+        "eager": PlatesDatRepository(str(path), load_mode="eager"),
+        "streaming": PlatesDatRepository(str(path), load_mode="streaming"),
+        "index": PlatesIndexRepository(str(path), str(path) + '.idx'),
+    }
+    eager = repositories["eager"]
+    eager.get_plate_by_image_name("")
+    eager._get_derived_index("geometry")
+
+    plates = eager.get_all_plates()
+    for image in plates:
+        for plate in image.all_plates:
+            assert plate.geometry is None
+    for image in plates:
+        attached = eager.get_plate_by_image_name(image.image_name)
+        for plate in attached.all_plates:
+            assert plate.geometry is not None
+            assert_same_geometry(PlateGeometry.compute(plate.coordinates, plate.characters), plate.geometry, plate.image_name)
+
+    criteria = [
+        GeometryFilter(min_skew=10),
+        GeometryFilter(max_skew=2, min_aspect=3.5),
+        GeometryFilter(min_area=3500, overlapping=False),
+    ]
+    for criterion in criteria:
+        expected = [
+            image.image_name for image in plates
+            if any(criterion.matches(PlateGeometry.compute(p.coordinates, p.characters)) for p in image.all_plates)
+        ]
+        assert expected, criterion
+        for label, repository in repositories.items():
+            found = [p.image_name for p in repository.find_by_geometry(criterion, limit=len(plates))]
+            assert found == expected, (label, criterion)
+            page = repository.find_by_geometry(criterion, after=expected[0], limit=5)
+            assert [p.image_name for p in page] == expected[1:6], (label, criterion)
+        if criterion == criteria[0]:
+            expected_skewed = expected
+
+    app = FastAPI()
+    app.include_router(ocr.router)
+    ocr.ocr_service = OCRService(eager)
+    ocr.response_cache = ResponseCache(0)
+    with TestClient(app) as client:
+        name = plates[0].image_name
+        body = client.post("/ocr/recognize/detailed", json={"image_name": name}).json()
+        assert math.isclose(body["geometry"]["area"], eager.get_plate_by_image_name(name).geometry.area)
+        listing = client.get("/ocr/geometry", params={"min_skew": 10, "limit": 3}).json()
+        assert [p["image_name"] for p in listing["plates"]] == expected_skewed[:3]
+        assert listing["next_after"] == expected_skewed[2]
+        assert client.get("/ocr/geometry", params={"min_area": 10, "max_area": 5}).status_code == 400
+
+    for repository in repositories.values():
+        repository.close()
+    print(f"correcto: {len(plates)} imágenes, {len(criteria)} filtros en los 3 modos")
+
+
+def main() -> None:
+    from domain.entities.plate import GeometryFilter, PlateGeometry
+    from infrastructure.adapters.outbound.file.plate_geometry import PlateGeometryTable
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_correctness(write_plates_dat(Path(tmp) / "check.dat", 3_000, multi_plate_ratio=0.2))
+
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines, multi_plate_ratio=0.05)
+        repository = PlatesDatRepository(str(path), load_mode="lazy")
+        store = repository._load_plates_cache()
+        num_rows = len(store.image_names)
+
+        start = time.perf_counter()
+        table = PlateGeometryTable.from_store(store)
+        bulk_s = time.perf_counter() - start
+
+        # Solo se mide el cálculo: las entidades se materializan antes
+        plates = [store._materialize_row(row) for row in range(num_rows)]
+        start = time.perf_counter()
+        geometries = [PlateGeometry.compute(plate.coordinates, plate.characters) for plate in plates]
+        loop_s = time.perf_counter() - start
+
+        for row in range(0, num_rows, max(1, num_rows // 1000)):
+            assert_same_geometry(geometries[row], table.get(row), row)
+
+        criterion = GeometryFilter(min_skew=10)
+        start = time.perf_counter()
+        for _ in range(QUERY_REPEATS):
+            matched = table.select(criterion, limit=num_rows)
+        select_ms = (time.perf_counter() - start) / QUERY_REPEATS * 1000
+
+        start = time.perf_counter()
+        python_matches = sum(1 for geometry in geometries if criterion.matches(geometry))
+        filter_ms = (time.perf_counter() - start) * 1000
+
+        repository.close()
+
+    print(f"{num_lines} imágenes ({num_rows} matrículas)")
+    print(f"cálculo en bloque (NumPy)   | {bulk_s * 1000:9.1f} ms | {bulk_s / num_rows * 1e6:6.2f} µs/matrícula")
+    print(f"bucle Python por objeto     | {loop_s * 1000:9.1f} ms | {loop_s / num_rows * 1e6:6.2f} µs/matrícula "
+          f"({loop_s / bulk_s:.0f}x)")
+    print(f"consulta |skew| > 10° (todas) | máscara {select_ms:7.2f} ms ({len(matched)} imágenes) | "
+          f"filtro Python sobre geometrías ya calculadas {filter_ms:7.1f} ms ({python_matches} matrículas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: latencia de la búsqueda por matrícula con PlateSearchIndex
+frente a un recorrido lineal de todas las matrículas
+
+Uso (desde backend/):
+    python benchmarks/bench_plate_search.py [num_lineas]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+QUERIES = 20
+SCAN_QUERIES = 2
+ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ0123456789"
+
+
+def levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def linear_scan(plates, query: str, max_distance: int, canonical_plate):
+    """Búsqueda sin índice: distancia de edición contra cada matrícula"""
+    target = canonical_plate(query)
+    return [
+        (plate.plate_number, plate.image_name) for plate in plates
+        if abs(len(plate.plate_number) - len(target)) <= max_distance
+        and levenshtein(target, canonical_plate(plate.plate_number)) <= max_distance
+    ]
+
+
+def misread(plate: str, rng: random.Random) -> str:
+    """Simula una lectura con un carácter sustituido"""
+    i = rng.randrange(len(plate))
+    return plate[:i] + rng.choice(ALPHABET) + plate[i + 1:]
+
+
+def timed_ms(call, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        call(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main() -> None:
+    from infrastructure.adapters.outbound.file.plate_search_index import canonical_plate
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        repository = PlatesDatRepository(str(path), load_mode="lazy")
+        repository.get_plate_by_image_name("")
+
+        start = time.perf_counter()
+        index = repository._get_derived_index("search")
+        build_s = time.perf_counter() - start
+
+        plates = repository.get_all_plates()
+        queries = [misread(rng.choice(plates).plate_number, rng) for _ in range(QUERIES)]
+
+        print(f"{num_lines} matrículas | construcción del índice {build_s:.2f} s ({len(index)} matrículas distintas)")
+        print(f"exacta              | {timed_ms(lambda q: index.exact(q), queries):9.3f} ms/consulta")
+        print(f"prefijo (4 chars)   | {timed_ms(lambda q: index.prefix(q[:4]), queries):9.3f} ms/consulta")
+        for distance in (1, 2):
+            indexed = timed_ms(lambda q: index.fuzzy(q, distance), queries)
+            scan = timed_ms(lambda q: linear_scan(plates, q, distance, canonical_plate), queries[:SCAN_QUERIES])
+            print(f"aproximada (d<={distance})   | {indexed:9.3f} ms/consulta | recorrido lineal "
+                  f"{scan:9.1f} ms/consulta ({scan / indexed:.0f}x)")
+
+        repository.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: arranque en frío y consultas con el índice binario mmap
+frente a la carga de plates.dat en memoria
+
+Uso (desde backend/):
+    python benchmarks/bench_plates_index.py [num_lineas]
+"""
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+LOOKUPS = 100_000
+
+
+def run_variant(variant: str, path: str) -> None:
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+    from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if variant == "index":
+        repo = PlatesIndexRepository(path)
+        repo.plate_exists("warmup.jpg")
+    else:
+        repo = PlatesDatRepository(path)
+        repo.plate_exists("warmup.jpg")
+    open_time = time.perf_counter() - start
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024
+
+    with open(path, 'r', encoding='utf-8') as file:
+        names = [line.split(' ', 1)[0] for line in file]
+    keys = random.Random(1).choices(names, k=LOOKUPS)
+
+    start = time.perf_counter()
+    for key in keys:
+        repo.get_plate_by_image_name(key)
+    lookup_us = (time.perf_counter() - start) / LOOKUPS * 1e6
+
+    print(f"{variant:>6} | arranque {open_time:7.3f} s | RSS privado +{rss_mb:7.1f} MB | lookup {lookup_us:6.2f} us")
+
+
+def main() -> None:
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+        from infrastructure.adapters.outbound.file.plates_index_repository import build_plates_index
+
+        start = time.perf_counter()
+        build_plates_index(str(path), str(path) + '.idx')
+        print(f"{num_lines} líneas | build del índice {time.perf_counter() - start:.1f} s")
+
+        for variant in ("memory", "index"):
+            subprocess.run([sys.executable, __file__, "--variant", variant, str(path)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--variant":
+        run_variant(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: coste de OCRService.recognize_plate (validación) y de
+Plate.get_sorted_characters con y sin los valores precalculados al cargar
+
+Uso (desde backend/):
+    python benchmarks/bench_recognize_plate.py [num_lineas]
+"""
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from synthetic import write_plates_dat
+
+ROUNDS = 5
+
+
+def main() -> None:
+    from application.services.ocr_service import OCRService
+    from domain.repositories.plate_repository import PlateRepository
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    class DictRepository(PlateRepository):
+        """Repositorio en memoria: aísla el coste de la validación del de la carga"""
+
+        def __init__(self, plates):
+            self.plates = plates
+
+        def get_plate_by_image_name(self, image_name):
+            return self.plates.get(image_name)
+
+        def get_all_plates(self):
+            return list(self.plates.values())
+
+        def plate_exists(self, image_name):
+            return image_name in self.plates
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        repository = PlatesDatRepository(str(path), load_mode="eager")
+        repository.warm_up()
+        names = list(repository.iter_image_names())
+
+        precomputed = {name: repository.get_plate_by_image_name(name) for name in names}
+        # Mismas entidades sin valores derivados: se validan y ordenan en cada llamada
+        on_the_fly = {
+            name: replace(plate, invalid_chars=None, sorted_chars=None)
+            for name, plate in precomputed.items()
+        }
+
+        def measure(service: OCRService) -> float:
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                for name in names:
+                    service.recognize_plate(name).get_sorted_characters()
+            return (time.perf_counter() - start) / (ROUNDS * len(names)) * 1e6
+
+        before = measure(OCRService(DictRepository(on_the_fly)))
+        after = measure(OCRService(DictRepository(precomputed)))
+        end_to_end = measure(OCRService(repository))
+        repository.close()
+
+    print(f"{num_lines} matrículas")
+    print(f"validación y orden al vuelo         | {before:6.2f} µs/consulta")
+    print(f"valores precalculados               | {after:6.2f} µs/consulta ({before / after:.1f}x)")
+    print(f"extremo a extremo (almacén + Plate) | {end_to_end:6.2f} µs/consulta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: latencia de /ocr/recognize/detailed bajo carga concurrente con y
+sin la caché de respuestas serializadas
+
+Un generador de carga lanza peticiones concurrentes contra la aplicación
+ASGI (sin red) eligiendo imágenes con popularidad tipo Zipf.
+
+Uso (desde backend/):
+    python benchmarks/bench_response_cache.py [num_lineas] [num_peticiones]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from synthetic import write_plates_dat
+
+CONCURRENCY = 32
+CACHE_SIZE = 10000
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def load(app, names, num_requests: int, seed: int = 3):
+    """Lanza num_requests peticiones con CONCURRENCY en vuelo y retorna latencias en ms"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    picks = rng.choices(names, weights=weights, k=num_requests)
+    queue = iter(picks)
+    latencies = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for image_name in queue:
+                start = time.perf_counter()
+                response = await client.post("/ocr/recognize/detailed", json={"image_name": image_name})
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, elapsed
+
+
+async def main() -> None:
+    from fastapi import FastAPI
+    from application.services.ocr_service import OCRService
+    from infrastructure.adapters.inbound.api.response_cache import ResponseCache
+    from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    num_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_plates_dat(Path(tmp) / "plates.dat", num_lines)
+        # El módulo de rutas abre plates.dat al importarse
+        os.environ.setdefault("PLATES_DAT_PATH", str(path))
+        from infrastructure.adapters.inbound.api.routes import ocr
+
+        repository = PlatesDatRepository(str(path), load_mode="eager")
+        repository.warm_up()
+        ocr.ocr_service = OCRService(repository)
+        names = list(repository.iter_image_names())
+        random.Random(1).shuffle(names)
+
+        app = FastAPI()
+        app.include_router(ocr.router)
+
+        print(f"{num_lines} matrículas, {num_requests} peticiones, {CONCURRENCY} concurrentes")
+        for label, size in (("sin caché", 0), (f"caché {CACHE_SIZE}", CACHE_SIZE)):
+            ocr.response_cache = ResponseCache(size)
+            latencies, elapsed = await load(app, names, num_requests)
+            stats = ocr.response_cache.stats()
+            print(f"{label:>12} | {num_requests / elapsed:8.0f} req/s | "
+                  f"p50 {percentile(latencies, 0.5):6.2f} ms | p99 {percentile(latencies, 0.99):6.2f} ms | "
+                  f"aciertos {stats['hit_ratio']:.1%}")
+
+        repository.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
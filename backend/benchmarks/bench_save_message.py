@@ -0,0 +1,124 @@
+"""
+Benchmark: latencia de escritura de mensajes con una sola llamada RPC
+(función save_messages) frente a las dos llamadas anteriores (insert en
+messages y update de conversations.updated_at), contra el sustituto local
+de Supabase con latencia de red simulada
+
+Mide p50/p99 de POST /conversations/{id}/messages y de un turno de chat
+completo (mensaje del usuario + respuesta del bot): dos POST con el código
+anterior frente a un único POST /messages/batch. La corrección (orden,
+updated_at y vuelta a dos llamadas sin la función desplegada) se comprueba
+en tests/test_save_messages.py.
+
+Uso (desde backend/):
+    python benchmarks/bench_save_message.py [latencia_ms] [num_escrituras]
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+
+import synthetic  # noqa: F401  (añade src/ al path)
+from fake_supabase import FakeSupabase
+
+SERVICE_KEY = "service-role-key"
+
+
+class LegacyConversationService:
+    """save_message anterior: insert y update secuenciales"""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    async def save_message(self, conversation_id: str, role: str, content: str):
+        new_msg = {
+            "id": str(uuid.uuid4()),
+            "conversation_id": conversation_id,
+            "role": role,
+            "content": content,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        response = await self.supabase.table("messages").insert(new_msg).execute()
+        await self.supabase.table("conversations").update({"updated_at": datetime.utcnow().isoformat()}).eq("id", conversation_id).execute()
+        return response.data[0]
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def timed(count: int, call) -> list:
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        await call(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main() -> None:
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    fake = FakeSupabase(latency=latency_ms / 1000)
+    url = fake.start()
+    fake.install_save_messages()
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = SERVICE_KEY
+    # Se mide el acceso a Supabase, no la caché de lecturas de conversaciones
+    os.environ["CONVERSATION_CACHE_TTL"] = "0"
+
+    from fastapi import FastAPI
+    from infrastructure.adapters.inbound.api.routes import conversation
+    from infrastructure.adapters.outbound.database.supabase_client import (
+        close_supabase_clients, get_supabase_data_client
+    )
+
+    fake.tables["conversations"] = [
+        {"id": cid, "user_id": "u1", "title": cid, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+        for cid in ("c-bench",)
+    ]
+    app = FastAPI()
+    app.include_router(conversation.router)
+    legacy = {conversation.get_conversation_service: lambda: LegacyConversationService(get_supabase_data_client())}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def post(path, body):
+            (await client.post(path, json=body)).raise_for_status()
+
+        async def legacy_turn(i):
+            await post("/conversations/c-bench/messages", {"role": "user", "content": f"pregunta {i}"})
+            await post("/conversations/c-bench/messages", {"role": "assistant", "content": f"respuesta {i}"})
+
+        async def batched_turn(i):
+            await post("/conversations/c-bench/messages/batch", {"messages": [
+                {"role": "user", "content": f"pregunta {i}"}, {"role": "assistant", "content": f"respuesta {i}"}
+            ]})
+
+        async def single(i):
+            await post("/conversations/c-bench/messages", {"role": "user", "content": f"mensaje {i}"})
+
+        cases = (
+            ("save_message", [("insert + update", legacy, single), ("1 RPC", {}, single)]),
+            ("turno de chat", [("2 x (insert + update)", legacy, legacy_turn), ("1 RPC batch", {}, batched_turn)]),
+        )
+        print(f"latencia simulada {latency_ms:.0f} ms por llamada, {count} escrituras por variante")
+        for label, variants in cases:
+            for name, overrides, call in variants:
+                app.dependency_overrides = overrides
+                fake.reset_counters()
+                samples = await timed(count, call)
+                print(f"{label:<13} | {name:<21} | p50 {percentile(samples, 0.5):7.2f} ms | "
+                      f"p99 {percentile(samples, 0.99):7.2f} ms | {fake.requests / count:.0f} llamadas a Supabase")
+
+    await close_supabase_clients()
+    fake.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
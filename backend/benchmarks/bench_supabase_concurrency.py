@@ -0,0 +1,107 @@
+"""
+Benchmark: rendimiento de GET /conversations según el número de peticiones
+concurrentes, con el acceso a Supabase síncrono (execute() bloqueante dentro
+de métodos async, como antes) frente al cliente PostgREST asíncrono
+
+El sustituto local de Supabase añade una latencia fija a cada llamada, como
+la ida y vuelta de red a Supabase. Con el cliente síncrono cada llamada
+bloquea el event loop y las peticiones se atienden de una en una; con el
+asíncrono se solapan hasta el límite del pool (SUPABASE_MAX_CONNECTIONS).
+
+Uso (desde backend/):
+    python benchmarks/bench_supabase_concurrency.py [latencia_ms] [concurrencias]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+import synthetic  # noqa: F401  (añade src/ al path)
+from fake_supabase import FakeSupabase
+
+REQUESTS_PER_CLIENT = 10
+SERVICE_KEY = "service-role-key"
+
+
+class BlockingConversationService:
+    """ConversationService anterior: métodos async que llaman a execute() síncrono"""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+
+    async def get_conversations(self, user_id: str):
+        response = self.supabase.table("conversations").select("*").eq("user_id", user_id).order("updated_at", desc=True).execute()
+        return response.data
+
+
+async def throughput(client, path: str, concurrency: int) -> float:
+    async def worker():
+        for _ in range(REQUESTS_PER_CLIENT):
+            (await client.get(path)).raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return concurrency * REQUESTS_PER_CLIENT / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    levels = [int(c) for c in sys.argv[2].split(',')] if len(sys.argv) > 2 else [1, 5, 10, 20, 40]
+
+    fake = FakeSupabase(latency=latency_ms / 1000)
+    url = fake.start()
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = SERVICE_KEY
+    # Se mide el acceso a Supabase, no la caché de lecturas de conversaciones
+    os.environ["CONVERSATION_CACHE_TTL"] = "0"
+
+    from fastapi import FastAPI
+    from postgrest import SyncPostgrestClient
+    from infrastructure.adapters.inbound.api.routes import conversation
+    from infrastructure.adapters.outbound.database.supabase_client import (
+        close_supabase_clients, get_supabase_settings
+    )
+
+    fake.tables["conversations"] = [
+        {"id": f"c{i:03d}", "user_id": "u1", "title": f"Conversación {i}",
+         "created_at": f"2024-01-01T00:00:{i:02d}", "updated_at": f"2024-01-02T00:00:{i:02d}"}
+        for i in range(20)
+    ]
+    blocking_client = SyncPostgrestClient(
+        f"{url}/rest/v1", headers={"apiKey": SERVICE_KEY, "Authorization": f"Bearer {SERVICE_KEY}"}
+    )
+
+    app = FastAPI()
+    app.include_router(conversation.router)
+    variants = {
+        "síncrono (bloquea el loop)": {conversation.get_conversation_service: lambda: BlockingConversationService(blocking_client)},
+        "asíncrono": {},
+    }
+
+    path = "/conversations?user_id=u1"
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        bodies = []
+        for overrides in variants.values():
+            app.dependency_overrides = overrides
+            bodies.append((await client.get(path)).json())
+        assert bodies[0] == bodies[1] and len(bodies[0]) == 20
+
+        print(f"latencia simulada {latency_ms:.0f} ms por llamada, {REQUESTS_PER_CLIENT} peticiones por cliente, "
+              f"pool de {get_supabase_settings().supabase_max_connections} conexiones")
+        print("concurrencia | " + " | ".join(f"{label:>26}" for label in variants))
+        for concurrency in levels:
+            rates = []
+            for overrides in variants.values():
+                app.dependency_overrides = overrides
+                rates.append(await throughput(client, path, concurrency))
+            print(f"{concurrency:12d} | " + " | ".join(f"{rate:20.1f} pet/s" for rate in rates))
+
+    blocking_client.session.close()
+    await close_supabase_clients()
+    fake.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
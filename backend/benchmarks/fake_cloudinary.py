@@ -0,0 +1,47 @@
+"""
+Sustituto local de cloudinary.api.resources para los benchmarks
+Pagina con next_cursor igual que la Admin API y simula la latencia por llamada
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class FakeCloudinaryResources:
+    """Callable con la firma de cloudinary.api.resources(**params)"""
+
+    def __init__(self, public_ids: List[str], latency: float = 0.05):
+        self.resources = [
+            {"public_id": public_id, "created_at": f"2024-01-01T00:00:{i % 60:02d}Z"}
+            for i, public_id in enumerate(public_ids)
+        ]
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def add(self, public_id: str, created_at: str) -> None:
+        with self._lock:
+            self.resources.append({"public_id": public_id, "created_at": created_at})
+
+    def remove(self, public_id: str) -> None:
+        with self._lock:
+            self.resources = [r for r in self.resources if r["public_id"] != public_id]
+
+    def __call__(self, prefix: str = "", max_results: int = 10, next_cursor: Optional[str] = None,
+                 start_at: Optional[str] = None, direction: Optional[str] = None, **_) -> Dict:
+        with self._lock:
+            self.calls += 1
+            matching = [r for r in self.resources if r["public_id"].startswith(prefix)]
+
+        if start_at is not None:
+            matching = [r for r in matching if r["created_at"] >= start_at]
+        if direction is not None:
+            matching.sort(key=lambda r: r["created_at"], reverse=direction in ("desc", -1, "-1"))
+
+        time.sleep(self.latency)
+        offset = int(next_cursor or 0)
+        page = matching[offset:offset + max_results]
+        response = {"resources": page}
+        if offset + max_results < len(matching):
+            response["next_cursor"] = str(offset + max_results)
+        return response
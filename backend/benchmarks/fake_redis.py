@@ -0,0 +1,125 @@
+"""
+Sustituto local de Redis para los benchmarks
+Servidor RESP3 en un hilo con un diccionario en memoria. Implementa solo lo
+que usa RedisCacheStore: GET, SET (con PX/EX), DEL y PING, más los comandos
+que envía redis-py al conectar (HELLO 3, CLIENT, SELECT)
+"""
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeRedis:
+    """Estado del servidor: valores con caducidad y contadores"""
+
+    def __init__(self):
+        self.values: Dict[bytes, Tuple[Optional[float], bytes]] = {}
+        self.commands = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+    def start(self) -> str:
+        """Arranca el servidor en un puerto libre y devuelve su URL"""
+        fake = self
+
+        class Handler(_Handler):
+            state = fake
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"redis://127.0.0.1:{self._server.server_address[1]}/0"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def execute(self, command: List[bytes]):
+        name = command[0].upper()
+        with self.lock:
+            self.commands += 1
+            if name == b"GET":
+                return self._get(command[1])
+            if name == b"SET":
+                expires_at = None
+                options = [part.upper() for part in command[3:]]
+                if b"PX" in options:
+                    expires_at = time.monotonic() + int(command[3 + options.index(b"PX") + 1]) / 1000
+                elif b"EX" in options:
+                    expires_at = time.monotonic() + int(command[3 + options.index(b"EX") + 1])
+                self.values[command[1]] = (expires_at, command[2])
+                return "OK"
+            if name == b"DEL":
+                return sum(1 for key in command[1:] if self.values.pop(key, None) is not None)
+        if name == b"HELLO":
+            return {"server": "redis", "version": "7.2.0", "proto": 3, "id": 1,
+                    "mode": "standalone", "role": "master", "modules": []}
+        if name == b"PING":
+            return "PONG"
+        if name in (b"CLIENT", b"SELECT"):
+            return "OK"
+        return Exception(f"ERR unknown command '{name.decode()}'")
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+
+
+def _encode(reply) -> bytes:
+    if reply is None:
+        return b"_\r\n"
+    if isinstance(reply, Exception):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if isinstance(reply, str):
+        return b"+" + reply.encode() + b"\r\n"
+    if isinstance(reply, dict):
+        return b"%" + str(len(reply)).encode() + b"\r\n" + b"".join(
+            _encode(key.encode()) + _encode(value.encode() if isinstance(value, str) else value)
+            for key, value in reply.items()
+        )
+    if isinstance(reply, list):
+        return b"*" + str(len(reply)).encode() + b"\r\n" + b"".join(_encode(item) for item in reply)
+    if isinstance(reply, int):
+        return b":" + str(reply).encode() + b"\r\n"
+    return b"$" + str(len(reply)).encode() + b"\r\n" + reply + b"\r\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    state: FakeRedis
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.state.lock:
+            self.state.connections += 1
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        header = self.rfile.readline()
+        if not header:
+            return None
+        count = int(header[1:])
+        command = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:])
+            command.append(self.rfile.read(length + 2)[:-2])
+        return command
+
+    def handle(self):
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            self.wfile.write(_encode(self.state.execute(command)))
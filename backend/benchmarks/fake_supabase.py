@@ -0,0 +1,286 @@
+"""
+Sustituto local de Supabase (PostgREST + GoTrue) para los benchmarks
+Servidor HTTP/1.1 con keep-alive en un hilo, tablas en memoria y latencia
+simulada por petición. Implementa solo lo que usa el backend: select con
+filtros (eq, neq, gt, gte, lt, lte, or/and), order, limit, insert, update,
+rpc y los endpoints de GoTrue de login, usuario y logout.
+"""
+import json
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+_OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Separa por comas fuera de paréntesis y comillas"""
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _as_value(raw: str, sample):
+    raw = raw[1:-1] if raw.startswith('"') and raw.endswith('"') else raw
+    if isinstance(sample, bool):
+        return raw == "true"
+    if isinstance(sample, int):
+        return int(raw)
+    return raw
+
+
+def _condition(expression: str) -> Callable[[Dict], bool]:
+    """`col.op.valor`, `and(...)` u `or(...)` en la sintaxis de PostgREST"""
+    for group, combine in (("and(", all), ("or(", any)):
+        if expression.startswith(group):
+            inner = [_condition(part) for part in _split_top_level(expression[len(group):-1])]
+            return lambda row, inner=inner, combine=combine: combine(c(row) for c in inner)
+    column, operator, raw = expression.split('.', 2)
+    compare = _OPERATORS[operator]
+    return lambda row: compare(row.get(column), _as_value(raw, row.get(column)))
+
+
+class FakeSupabase:
+    """Estado del servidor: tablas, usuarios, funciones RPC y contadores"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict]] = {"conversations": [], "messages": []}
+        self.functions: Dict[str, Callable[[Dict], object]] = {}
+        self.users: Dict[str, Dict] = {}       # email -> usuario
+        self.tokens: Dict[str, Dict] = {}      # access_token -> usuario
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def add_user(self, email: str, password: str) -> Dict:
+        user = {
+            "id": str(uuid.uuid4()),
+            "aud": "authenticated",
+            "email": email,
+            "created_at": "2024-01-01T00:00:00Z",
+            "last_sign_in_at": None,
+            "app_metadata": {},
+            "user_metadata": {},
+            "password": password,
+        }
+        self.users[email] = user
+        return user
+
+    def issue_token(self, user: Dict) -> str:
+        token = uuid.uuid4().hex
+        self.tokens[token] = user
+        return token
+
+    def start(self) -> str:
+        """Arranca el servidor en un puerto libre y devuelve su URL"""
+        fake = self
+
+        class Handler(_Handler):
+            state = fake
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 256
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self.lock:
+            self.requests = 0
+            self.connections = 0
+
+    def install_save_messages(self) -> None:
+        """Equivalente de la función SQL save_messages (supabase/migrations)"""
+        def save_messages(params: Dict) -> List[Dict]:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            rows = [
+                {
+                    "id": message.get("id") or str(uuid.uuid4()),
+                    "conversation_id": params["p_conversation_id"],
+                    "role": message["role"],
+                    "content": message["content"],
+                    "created_at": (now + timedelta(microseconds=position)).isoformat(),
+                }
+                for position, message in enumerate(params["p_messages"])
+            ]
+            with self.lock:
+                self.tables["messages"].extend(dict(row) for row in rows)
+                for conversation in self.tables["conversations"]:
+                    if conversation["id"] == params["p_conversation_id"]:
+                        conversation["updated_at"] = rows[-1]["created_at"]
+            return rows
+
+        self.functions["save_messages"] = save_messages
+
+    # --- PostgREST ---
+
+    def select(self, table: str, params: List) -> List[Dict]:
+        with self.lock:
+            rows = list(self.tables[table])
+        columns, order, limit = "*", None, None
+        for key, value in params:
+            if key == "select":
+                columns = value
+            elif key == "order":
+                order = value
+            elif key == "limit":
+                limit = int(value)
+            elif key in ("or", "and"):
+                check = _condition(f"{key}{value}")
+                rows = [row for row in rows if check(row)]
+            else:
+                check = _condition(f"{key}.{value}")
+                rows = [row for row in rows if check(row)]
+        if order:
+            for term in reversed(order.split(',')):
+                column, _, direction = term.partition('.')
+                rows.sort(key=lambda row: row.get(column), reverse=direction.startswith("desc"))
+        if limit is not None:
+            rows = rows[:limit]
+        if columns != "*":
+            names = columns.split(',')
+            rows = [{name: row.get(name) for name in names} for row in rows]
+        return rows
+
+    def insert(self, table: str, body) -> List[Dict]:
+        rows = body if isinstance(body, list) else [body]
+        with self.lock:
+            self.tables[table].extend(dict(row) for row in rows)
+        return rows
+
+    def update(self, table: str, params: List, values: Dict) -> List[Dict]:
+        checks = [_condition(f"{key}.{value}") for key, value in params if key != "select"]
+        updated = []
+        with self.lock:
+            for row in self.tables[table]:
+                if all(check(row) for check in checks):
+                    row.update(values)
+                    updated.append(dict(row))
+        return updated
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: FakeSupabase
+
+    def setup(self):
+        super().setup()
+        # Cabeceras y cuerpo van en escrituras separadas: sin esto Nagle añade ~40 ms por respuesta
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.state.lock:
+            self.state.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload=None) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str) -> None:
+        state = self.state
+        with state.lock:
+            state.requests += 1
+        if state.latency:
+            time.sleep(state.latency)
+
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        if url.path.startswith("/auth/v1/"):
+            return self._auth(method, url.path[len("/auth/v1/"):], body)
+
+        if url.path.startswith("/rest/v1/rpc/"):
+            function = state.functions.get(url.path[len("/rest/v1/rpc/"):])
+            if function is None:
+                return self._reply(404, {"code": "PGRST202", "message": "Could not find the function in the schema cache"})
+            return self._reply(200, function(body or {}))
+
+        table = url.path[len("/rest/v1/"):]
+        if table not in state.tables:
+            return self._reply(404, {"message": f"relation {table} does not exist"})
+        if method == "GET":
+            return self._reply(200, state.select(table, params))
+        if method == "POST":
+            return self._reply(201, state.insert(table, body))
+        if method == "PATCH":
+            return self._reply(200, state.update(table, params, body))
+        self._reply(405, {"message": "method not allowed"})
+
+    def _auth(self, method: str, path: str, body) -> None:
+        state = self.state
+        token = self.headers.get("Authorization", "").replace("Bearer ", "")
+        if path.startswith("token"):
+            user = state.users.get(body.get("email"))
+            if user is None or user["password"] != body.get("password"):
+                return self._reply(400, {"error": "invalid_grant", "error_description": "Invalid login credentials"})
+            user["last_sign_in_at"] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+            return self._reply(200, {
+                "access_token": state.issue_token(user),
+                "token_type": "bearer",
+                "expires_in": 3600,
+                "expires_at": int(time.time()) + 3600,
+                "refresh_token": uuid.uuid4().hex,
+                "user": _public(user),
+            })
+        if path == "user" and method == "GET":
+            user = state.tokens.get(token)
+            if user is None:
+                return self._reply(401, {"code": 401, "msg": "invalid JWT"})
+            return self._reply(200, _public(user))
+        if path == "logout":
+            state.tokens.pop(token, None)
+            return self._reply(204)
+        self._reply(404, {"msg": "not found"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+
+def _public(user: Dict) -> Dict:
+    return {key: value for key, value in user.items() if key != "password"}
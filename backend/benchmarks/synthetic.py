@@ -0,0 +1,61 @@
+"""
+Generador de ficheros plates.dat sintéticos para los benchmarks
+"""
+import random
+import string
+import sys
+from pathlib import Path
+from typing import List
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+PLATE_ALPHABET = string.ascii_uppercase + string.digits
+
+
+def _plate_block(plate: str, rng: random.Random) -> List[str]:
+    """Coordenadas, número de caracteres y caracteres de una matrícula"""
+    x, y = rng.randint(0, 1800), rng.randint(0, 1000)
+    tilt = x % 61 - 30  # inclinación entre -14° y 14°, sin consumir valores aleatorios
+    coords = [x, y, x + 120, y + tilt, x + 121, y + 30 + tilt, x + 1, y + 28]
+    parts = [*map(str, coords), str(len(plate))]
+    for pos, char in enumerate(plate):
+        parts += [char, f"{0.05 + pos * 0.13:.6f}", f"{rng.uniform(0.1, 0.2):.6f}", "0.110000", "0.700000"]
+    return parts
+
+
+def synthetic_line(i: int, rng: random.Random, num_plates: int = 1) -> str:
+    """Genera una línea con el mismo formato que assets/plates.dat (un bloque por matrícula)"""
+    plates = [''.join(rng.choice(PLATE_ALPHABET) for _ in range(7)) for _ in range(num_plates)]
+    plate = plates[0]
+    lane = rng.randint(1, 4)
+    image_name = (
+        f"{plate[:6]}_lane{lane}_{i % 100}_2022{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+        f"_{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}_{i}.jpg"
+    )
+    parts = [image_name, str(num_plates)]
+    for plate in plates:
+        parts += _plate_block(plate, rng)
+    return ' '.join(parts)
+
+
+def write_plates_dat(path: Path, num_lines: int, seed: int = 7, multi_plate_ratio: float = 0.0) -> Path:
+    """
+    Escribe un plates.dat sintético de num_lines líneas; una fracción
+    multi_plate_ratio de ellas lleva entre 2 y 3 matrículas
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as file:
+        for i in range(num_lines):
+            num_plates = rng.randint(2, 3) if multi_plate_ratio and rng.random() < multi_plate_ratio else 1
+            file.write(synthetic_line(i, rng, num_plates))
+            file.write('\n')
+    return path
+
+
+if __name__ == "__main__":
+    target = Path(sys.argv[1])
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    write_plates_dat(target, lines)
+    print(f"{lines} líneas escritas en {target}")
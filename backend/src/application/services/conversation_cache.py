@@ -0,0 +1,105 @@
+"""
+Conversation Cache
+Caché de lectura para los listados completos de conversaciones y mensajes
+"""
+import json
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from domain.repositories.cache_store import CacheStore
+
+
+class ConversationCache:
+    """
+    Guarda durante `ttl` segundos la lista de conversaciones de cada
+    usuario y el historial de cada conversación, tal y como los devuelve
+    Supabase (JSON). Las escrituras de ConversationService borran las
+    claves afectadas después de escribir en la base de datos.
+
+    Para invalidar la lista del usuario al guardar un mensaje hace falta
+    saber de quién es la conversación: se apunta el dueño de cada
+    conversación al cachear su lista o al crearla. Si esa entrada ya no
+    está (caducada o expulsada), la lista puede quedar desactualizada como
+    mucho `ttl` segundos. Lo mismo ocurre entre workers con el almacén en
+    memoria; con Redis la invalidación es compartida.
+    """
+
+    def __init__(self, store: CacheStore, ttl: float, backend: str = "memory"):
+        self.store = store
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def conversations_key(user_id: str) -> str:
+        return f"conversations:{user_id}"
+
+    @staticmethod
+    def messages_key(conversation_id: str) -> str:
+        return f"messages:{conversation_id}"
+
+    @staticmethod
+    def owner_key(conversation_id: str) -> str:
+        return f"owner:{conversation_id}"
+
+    async def _read_through(
+        self, key: str, load: Callable[[], Awaitable[List[Dict]]], extra: Optional[Callable[[List[Dict]], Dict[str, bytes]]] = None
+    ) -> List[Dict]:
+        cached = await self.store.get(key)
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        epoch = self.invalidations
+        rows = await load()
+        # Si este worker escribió mientras se leía, la lectura puede ser anterior a la escritura
+        if epoch == self.invalidations:
+            items = {key: json.dumps(rows).encode()}
+            if extra is not None:
+                items.update(extra(rows))
+            await self.store.set_many(items, self.ttl)
+        return rows
+
+    async def get_conversations(self, user_id: str, load: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+        """Lista de conversaciones del usuario desde la caché o, si no está, desde `load`"""
+        owner = user_id.encode()
+        return await self._read_through(
+            self.conversations_key(user_id), load,
+            lambda rows: {self.owner_key(row["id"]): owner for row in rows}
+        )
+
+    async def get_messages(self, conversation_id: str, load: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+        """Historial de la conversación desde la caché o, si no está, desde `load`"""
+        return await self._read_through(self.messages_key(conversation_id), load)
+
+    async def conversation_created(self, user_id: str, conversation_id: str) -> None:
+        """Invalida la lista del usuario y apunta el dueño de la nueva conversación"""
+        self.invalidations += 1
+        await self.store.delete(self.conversations_key(user_id))
+        await self.store.set(self.owner_key(conversation_id), user_id.encode(), self.ttl)
+
+    async def messages_saved(self, conversation_id: str) -> None:
+        """Invalida el historial de la conversación y la lista de su dueño (cambia updated_at)"""
+        self.invalidations += 1
+        keys = [self.messages_key(conversation_id)]
+        owner = await self.store.get(self.owner_key(conversation_id))
+        if owner is not None:
+            keys.append(self.conversations_key(owner.decode()))
+        await self.store.delete(*keys)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            **self.store.stats(),
+        }
+
+    async def close(self) -> None:
+        await self.store.close()
@@ -2,20 +2,86 @@
 Conversation Service
 Servicio para gestionar conversaciones y mensajes con Supabase
 """
-from infrastructure.adapters.outbound.database.supabase_client import get_supabase_client
-from datetime import datetime
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
+from application.services.conversation_cache import ConversationCache
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import base64
+import binascii
 import uuid
 
+# Código de PostgREST cuando la función RPC no existe en el esquema
+FUNCTION_NOT_FOUND = "PGRST202"
+
+# Solo las columnas que devuelven los DTOs
+CONVERSATION_COLUMNS = "id,user_id,title,created_at,updated_at"
+MESSAGE_COLUMNS = "id,conversation_id,role,content,created_at"
+
+# Filas por consulta al exportar en streaming
+EXPORT_BATCH_SIZE = 1000
+
+
+def encode_cursor(timestamp: str, row_id: str) -> str:
+    """Cursor opaco con la clave (timestamp, id) de una fila"""
+    return base64.urlsafe_b64encode(f"{timestamp}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|", 1)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return timestamp, row_id
+
+
+@dataclass
+class KeysetPage:
+    """Página de un listado; los cursores son None si no hay más filas en esa dirección"""
+    rows: List[Dict]
+    next_before: Optional[str]
+    next_after: Optional[str]
+
 
 class ConversationService:
-    def __init__(self):
-        self.supabase = get_supabase_client()
+    def __init__(self, supabase: AsyncPostgrestClient, cache: Optional[ConversationCache] = None):
+        # Cliente PostgREST compartido por el proceso (ver supabase_client)
+        self.supabase = supabase
+        # Caché de los listados completos; las páginas y exportaciones van siempre a Supabase
+        self.cache = cache
 
     async def get_conversations(self, user_id: str):
         """Obtiene todas las conversaciones de un usuario"""
-        response = self.supabase.table("conversations").select("*").eq("user_id", user_id).order("updated_at", desc=True).execute()
+        if self.cache is not None:
+            return await self.cache.get_conversations(user_id, lambda: self._fetch_conversations(user_id))
+        return await self._fetch_conversations(user_id)
+
+    async def _fetch_conversations(self, user_id: str):
+        response = await self.supabase.table("conversations").select(CONVERSATION_COLUMNS).eq("user_id", user_id).order("updated_at", desc=True).order("id", desc=True).execute()
         return response.data
 
+    async def get_conversations_page(
+        self, user_id: str, page_size: int, after: Optional[str] = None, before: Optional[str] = None
+    ) -> KeysetPage:
+        """Página de conversaciones, de la más reciente a la más antigua (clave updated_at, id)"""
+        return await self._keyset_page(
+            "conversations", CONVERSATION_COLUMNS, ("user_id", user_id), "updated_at",
+            descending=True, page_size=page_size, after=after, before=before
+        )
+
+    async def iter_conversations(self, user_id: str) -> AsyncIterator[List[Dict]]:
+        """Todas las conversaciones en lotes de EXPORT_BATCH_SIZE (exportación en streaming)"""
+        after = None
+        while True:
+            page = await self.get_conversations_page(user_id, EXPORT_BATCH_SIZE, after=after)
+            if page.rows:
+                yield page.rows
+            if page.next_after is None:
+                break
+            after = page.next_after
+
     async def create_conversation(self, user_id: str, title: str):
         """Crea una nueva conversación"""
         new_conv = {
@@ -25,26 +91,127 @@ class ConversationService:
             "created_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat(),
         }
-        response = self.supabase.table("conversations").insert(new_conv).execute()
+        response = await self.supabase.table("conversations").insert(new_conv).execute()
+        if self.cache is not None:
+            await self.cache.conversation_created(user_id, new_conv["id"])
         return response.data[0]
 
     async def get_messages(self, conversation_id: str):
         """Obtiene todos los mensajes de una conversación"""
-        response = self.supabase.table("messages").select("*").eq("conversation_id", conversation_id).order("created_at", desc=False).execute()
+        if self.cache is not None:
+            return await self.cache.get_messages(conversation_id, lambda: self._fetch_messages(conversation_id))
+        return await self._fetch_messages(conversation_id)
+
+    async def _fetch_messages(self, conversation_id: str):
+        response = await self.supabase.table("messages").select(MESSAGE_COLUMNS).eq("conversation_id", conversation_id).order("created_at", desc=False).order("id", desc=False).execute()
         return response.data
 
+    async def get_messages_page(
+        self, conversation_id: str, page_size: int, after: Optional[str] = None, before: Optional[str] = None
+    ) -> KeysetPage:
+        """
+        Página de mensajes en orden cronológico (clave created_at, id). Sin
+        cursor devuelve los más recientes, que es lo que muestra el chat al
+        abrir una conversación; `before` pide los anteriores y `after` los
+        posteriores
+        """
+        return await self._keyset_page(
+            "messages", MESSAGE_COLUMNS, ("conversation_id", conversation_id), "created_at",
+            descending=False, page_size=page_size, after=after, before=before, from_end=True
+        )
+
+    async def iter_messages(self, conversation_id: str) -> AsyncIterator[List[Dict]]:
+        """Todos los mensajes en orden, en lotes de EXPORT_BATCH_SIZE (exportación en streaming)"""
+        after = None
+        while True:
+            page = await self._keyset_page(
+                "messages", MESSAGE_COLUMNS, ("conversation_id", conversation_id), "created_at",
+                descending=False, page_size=EXPORT_BATCH_SIZE, after=after, before=None
+            )
+            if page.rows:
+                yield page.rows
+            if page.next_after is None:
+                break
+            after = page.next_after
+
+    async def _keyset_page(
+        self, table: str, columns: str, owner: Tuple[str, str], sort_column: str, descending: bool,
+        page_size: int, after: Optional[str], before: Optional[str], from_end: bool = False
+    ) -> KeysetPage:
+        """
+        Paginación por clave (sort_column, id): cada página es una consulta
+        con filtro sobre la clave y limit, sin OFFSET, así que su coste no
+        depende de la posición en el listado. Se pide una fila de más para
+        saber si hay otra página en esa dirección.
+        """
+        if after is not None and before is not None:
+            raise ValueError("Use only one of 'after' and 'before'")
+
+        backwards = before is not None or (after is None and from_end)
+        cursor = before if before is not None else after
+        # Hacia atrás se consulta en orden inverso al del listado y se da la vuelta al resultado
+        query_desc = descending != backwards
+
+        query = self.supabase.table(table).select(columns).eq(*owner)
+        if cursor is not None:
+            timestamp, row_id = decode_cursor(cursor)
+            op = "lt" if query_desc else "gt"
+            query = query.or_(
+                f'{sort_column}.{op}."{timestamp}",and({sort_column}.eq."{timestamp}",id.{op}."{row_id}")'
+            )
+        response = await query.order(sort_column, desc=query_desc).order("id", desc=query_desc).limit(page_size + 1).execute()
+
+        rows = response.data[:page_size]
+        more = len(response.data) > page_size
+        if backwards:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows, None, None)
+
+        first = encode_cursor(rows[0][sort_column], rows[0]["id"])
+        last = encode_cursor(rows[-1][sort_column], rows[-1]["id"])
+        # En la dirección contraria a la consultada, el propio cursor demuestra que hay filas
+        if backwards:
+            return KeysetPage(rows, first if more else None, last if cursor is not None else None)
+        return KeysetPage(rows, first if cursor is not None else None, last if more else None)
+
     async def save_message(self, conversation_id: str, role: str, content: str):
         """Guarda un mensaje en una conversación"""
-        new_msg = {
-            "id": str(uuid.uuid4()),
-            "conversation_id": conversation_id,
-            "role": role,
-            "content": content,
-            "created_at": datetime.utcnow().isoformat(),
-        }
-        response = self.supabase.table("messages").insert(new_msg).execute()
-        
-        # Actualizar updated_at de la conversación
-        self.supabase.table("conversations").update({"updated_at": datetime.utcnow().isoformat()}).eq("id", conversation_id).execute()
-        
-        return response.data[0]
+        saved = await self.save_messages(conversation_id, [{"role": role, "content": content}])
+        return saved[0]
+
+    async def save_messages(self, conversation_id: str, messages: List[Dict[str, str]]):
+        """
+        Guarda varios mensajes en orden (p. ej. el del usuario y la respuesta
+        del bot) y actualiza updated_at de la conversación en una sola
+        llamada a la función save_messages de la base de datos
+        (supabase/migrations), que lo hace todo en una transacción
+        """
+        saved = await self._insert_messages(conversation_id, messages)
+        if self.cache is not None:
+            await self.cache.messages_saved(conversation_id)
+        return saved
+
+    async def _insert_messages(self, conversation_id: str, messages: List[Dict[str, str]]):
+        new_msgs = [
+            {"id": str(uuid.uuid4()), "role": message["role"], "content": message["content"]}
+            for message in messages
+        ]
+        try:
+            response = await self.supabase.rpc(
+                "save_messages", {"p_conversation_id": conversation_id, "p_messages": new_msgs}
+            ).execute()
+            return response.data
+        except APIError as e:
+            if e.code != FUNCTION_NOT_FOUND:
+                raise
+            print(f"save_messages function not deployed, using two requests: {e.message}")
+
+        # Sin la migración aplicada: insert y update por separado
+        now = datetime.utcnow()
+        for position, message in enumerate(new_msgs):
+            message["conversation_id"] = conversation_id
+            message["created_at"] = (now + timedelta(microseconds=position)).isoformat()
+        response = await self.supabase.table("messages").insert(new_msgs).execute()
+        await self.supabase.table("conversations").update({"updated_at": new_msgs[-1]["created_at"]}).eq("id", conversation_id).execute()
+        return response.data
@@ -2,16 +2,60 @@
 Servicio de OCR de matrículas
 Lógica de negocio para reconocimiento de matrículas
 """
-from typing import Optional
-from domain.entities.plate import Plate
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from domain.entities.plate import GeometryFilter, Plate, PlateMatch
 from domain.repositories.plate_repository import PlateRepository
 
 
+class AvailablePlatesView:
+    """
+    Imágenes con matrícula que además están disponibles en Cloudinary,
+    en orden estable (el del repositorio). Permite paginar con slices O(página).
+    """
+
+    def __init__(self, image_names: List[str]):
+        self.image_names = image_names
+        self._positions: Dict[str, int] = {name: i for i, name in enumerate(image_names)}
+
+    def __len__(self) -> int:
+        return len(self.image_names)
+
+    def __contains__(self, image_name: str) -> bool:
+        return image_name in self._positions
+
+    def page(self, after: Optional[str] = None, size: Optional[int] = None) -> List[str]:
+        """Nombres de la página que empieza tras el cursor `after`"""
+        start = 0 if after is None else self._positions[after] + 1
+        end = None if size is None else start + size
+        return self.image_names[start:end]
+
+
 class OCRService:
     """Servicio de aplicación para OCR de matrículas"""
 
     def __init__(self, plate_repository: PlateRepository):
         self.plate_repository = plate_repository
+        self._available_view: Optional[AvailablePlatesView] = None
+        self._available_view_key: Optional[Tuple[int, int]] = None
+        self._view_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Inicia la carga de datos al arrancar según la política del repositorio"""
+        self.plate_repository.warm_up()
+
+    def close(self) -> None:
+        """Libera los recursos del repositorio"""
+        self.plate_repository.close()
+
+    def is_ready(self) -> bool:
+        """Indica si los datos OCR están disponibles"""
+        return self.plate_repository.is_ready()
+
+    async def wait_until_ready(self) -> None:
+        """Espera a que los datos OCR estén cargados"""
+        await self.plate_repository.wait_until_ready()
 
     def recognize_plate(self, image_name: str) -> Optional[Plate]:
         """Reconoce la matrícula en una imagen"""
@@ -20,14 +64,39 @@ class OCRService:
         if plate is None:
             return None
         
+        self._validate(plate)
+        return plate
+
+    def recognize_plates(self, image_names: List[str]) -> List[Tuple[str, Optional[Plate], Optional[str]]]:
+        """
+        Reconoce varias imágenes con una sola consulta al repositorio.
+        Los errores se devuelven por elemento en lugar de abortar el lote.
+
+        Returns:
+            Lista (imagen, Plate o None, mensaje de error o None) en el orden recibido
+        """
+        plates = self.plate_repository.get_plates_by_image_names(image_names)
+        results = []
+
+        for image_name in image_names:
+            plate = plates.get(image_name)
+            try:
+                if plate is not None:
+                    self._validate(plate)
+                results.append((image_name, plate, None))
+            except ValueError as e:
+                results.append((image_name, None, str(e)))
+
+        return results
+
+    def _validate(self, plate: Plate) -> None:
+        """Lanza ValueError si la matrícula tiene caracteres inválidos"""
         if not plate.is_valid():
-            invalid_chars = [c.char for c in plate.characters if not c.is_valid()]
+            invalid_chars = plate.get_invalid_characters()
             raise ValueError(
                 f"Matrícula con caracteres inválidos: {invalid_chars}. "
                 f"Solo se permiten alfanuméricos mayúsculas."
             )
-        
-        return plate
 
     def get_plate_number_only(self, image_name: str) -> Optional[str]:
         """Retorna solo el número de matrícula"""
@@ -38,6 +107,97 @@ class OCRService:
         """Verifica si existe información OCR para una imagen"""
         return self.plate_repository.plate_exists(image_name)
 
+    def images_exist(self, image_names: List[str]) -> Dict[str, bool]:
+        """Verifica en bloque si existe información OCR para varias imágenes"""
+        return self.plate_repository.plates_exist(image_names)
+
+    def search_plates(
+        self, query: str, mode: str = "fuzzy", max_distance: int = 1, limit: int = 50
+    ) -> List[PlateMatch]:
+        """
+        Busca imágenes por número de matrícula tolerando errores de lectura
+
+        Raises:
+            ValueError: si la consulta está vacía o los parámetros no son válidos
+        """
+        query = query.strip()
+        if not query:
+            raise ValueError("La consulta no puede estar vacía")
+        return self.plate_repository.search_plates(query, mode, max_distance, limit)
+
+    def find_captures(
+        self,
+        lane: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Plate]:
+        """
+        Lecturas de un carril en un intervalo [start, end), en orden de captura
+
+        Raises:
+            ValueError: si el intervalo está invertido o el cursor es desconocido
+        """
+        if start is not None and end is not None and start >= end:
+            raise ValueError("El inicio del intervalo debe ser anterior al final")
+        return self.plate_repository.find_captures(lane, start, end, after, limit)
+
+    def find_by_geometry(
+        self, criteria: GeometryFilter, after: Optional[str] = None, limit: int = 100
+    ) -> List[Plate]:
+        """
+        Imágenes con alguna matrícula que cumple el filtro geométrico
+
+        Raises:
+            ValueError: si algún rango está invertido o el cursor es desconocido
+        """
+        for name, low, high in criteria.ranges():
+            if low is not None and high is not None and low > high:
+                raise ValueError(f"Rango inválido para {name}: el mínimo supera al máximo")
+        return self.plate_repository.find_by_geometry(criteria, after, limit)
+
+    def get_statistics(self) -> Dict:
+        """Estadísticas del conjunto de matrículas para el panel de operaciones"""
+        return self.plate_repository.get_statistics()
+
     def get_all_plates(self):
         """Retorna todas las matrículas disponibles"""
         return self.plate_repository.get_all_plates()
+
+    def iter_plates(self, after: Optional[str] = None) -> Iterator[Plate]:
+        """Recorre las matrículas disponibles a partir del cursor `after`"""
+        return self.plate_repository.iter_plates(after)
+
+    def count_plates(self) -> int:
+        """Número de matrículas en el repositorio"""
+        return self.plate_repository.count_plates()
+
+    def get_version(self) -> int:
+        """Versión de los datos del repositorio; cambia cuando se recargan"""
+        return self.plate_repository.get_version()
+
+    def get_available_view(self, available_images: Set[str], images_version: int) -> AvailablePlatesView:
+        """
+        Vista de matrículas disponibles. Solo se recalcula cuando cambia el
+        repositorio (recarga de plates.dat) o el conjunto de imágenes.
+
+        Args:
+            available_images: Imágenes disponibles en el almacenamiento externo
+            images_version: Versión de ese conjunto; cambia cuando cambia su contenido
+        """
+        key = (self.plate_repository.get_version(), images_version)
+
+        with self._view_lock:
+            if self._available_view is None or self._available_view_key != key:
+                self._available_view = AvailablePlatesView([
+                    name for name in self.plate_repository.iter_image_names()
+                    if name in available_images
+                ])
+                self._available_view_key = key
+            return self._available_view
+
+    def get_plates_in_order(self, image_names: List[str]) -> List[Plate]:
+        """Matrículas de las imágenes indicadas, en el mismo orden y omitiendo las ausentes"""
+        plates = self.plate_repository.get_plates_by_image_names(image_names)
+        return [plates[name] for name in image_names if plates.get(name) is not None]
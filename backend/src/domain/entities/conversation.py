@@ -7,6 +7,8 @@ from typing import Optional
 
 
 class Conversation:
+    __slots__ = ('id', 'user_id', 'title', 'created_at', 'updated_at')
+
     def __init__(
         self,
         id: str,
@@ -7,6 +7,8 @@ from typing import Literal
 
 
 class Message:
+    __slots__ = ('id', 'conversation_id', 'role', 'content', 'created_at')
+
     def __init__(
         self,
         id: str,
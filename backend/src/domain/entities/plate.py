@@ -1,13 +1,35 @@
 """
 Entidades del dominio para OCR de matrículas
+
+Las entidades declaran __slots__ (sin __dict__ por instancia): con millones de
+caracteres en memoria es su principal coste. Character y PlateCoordinates son
+valores inmutables (frozen).
 """
+import math
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
 
-@dataclass
-class Character:
+class _SlotsState:
+    """
+    Copia y serialización (pickle) de entidades con __slots__ congeladas:
+    el mecanismo por defecto reasigna atributos y un dataclass frozen lo impide
+    """
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
+class Character(_SlotsState):
     """Carácter individual detectado en la matrícula"""
+    __slots__ = ('char', 'left', 'top', 'width', 'height')
+
     char: str
     left: float      # Posición horizontal (0.0 - 1.0)
     top: float       # Posición vertical (0.0 - 1.0)
@@ -16,12 +38,19 @@ class Character:
 
     def is_valid(self) -> bool:
         """Valida que sea alfanumérico mayúscula o número"""
-        return self.char.isalnum() and (self.char.isupper() or self.char.isdigit())
+        return self.is_valid_char(self.char)
 
+    @staticmethod
+    def is_valid_char(char: str) -> bool:
+        """Regla de validez de un carácter, reutilizable sin crear la entidad"""
+        return char.isalnum() and (char.isupper() or char.isdigit())
 
-@dataclass
-class PlateCoordinates:
+
+@dataclass(frozen=True)
+class PlateCoordinates(_SlotsState):
     """Coordenadas de las esquinas de la matrícula"""
+    __slots__ = ('top_left', 'top_right', 'bottom_right', 'bottom_left')
+
     top_left: tuple[int, int]
     top_right: tuple[int, int]
     bottom_right: tuple[int, int]
@@ -32,7 +61,7 @@ class PlateCoordinates:
         """Crea instancia desde lista [x1, y1, x2, y2, x3, y3, x4, y4]"""
         if len(coords) != 8:
             raise ValueError(f"Se esperan 8 coordenadas, se recibieron {len(coords)}")
-        
+
         return cls(
             top_left=(coords[0], coords[1]),
             top_right=(coords[2], coords[3]),
@@ -41,15 +70,145 @@ class PlateCoordinates:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
+class PlateGeometry(_SlotsState):
+    """
+    Medidas derivadas del cuadrilátero de la matrícula y de las cajas de sus
+    caracteres. Las cajas se recorren de izquierda a derecha y se comparan
+    con la siguiente: solapamientos y separaciones son entre consecutivas.
+    """
+    __slots__ = (
+        'area', 'skew_angle', 'aspect_ratio', 'bounding_box',
+        'overlapping_chars', 'char_spacing_mean', 'char_spacing_std'
+    )
+
+    area: float                                 # Píxeles² (fórmula del área de Gauss)
+    skew_angle: float                           # Grados respecto a la horizontal (bordes superior e inferior)
+    aspect_ratio: float                         # Ancho medio / alto medio del cuadrilátero
+    bounding_box: Tuple[int, int, int, int]     # min_x, min_y, max_x, max_y
+    overlapping_chars: int                      # Pares de caracteres consecutivos que se solapan
+    char_spacing_mean: float                    # Separación media entre caracteres (unidades normalizadas)
+    char_spacing_std: float
+
+    @classmethod
+    def compute(cls, coordinates: PlateCoordinates, characters: Sequence[Character]) -> 'PlateGeometry':
+        """Calcula la geometría de una sola matrícula"""
+        corners = (coordinates.top_left, coordinates.top_right, coordinates.bottom_right, coordinates.bottom_left)
+        xs = [float(x) for x, _ in corners]
+        ys = [float(y) for _, y in corners]
+
+        area = 0.5 * abs(sum(xs[i] * ys[(i + 1) % 4] - xs[(i + 1) % 4] * ys[i] for i in range(4)))
+        skew = math.degrees(math.atan2((ys[1] - ys[0]) + (ys[2] - ys[3]), (xs[1] - xs[0]) + (xs[2] - xs[3])))
+        width = math.hypot(xs[1] - xs[0], ys[1] - ys[0]) + math.hypot(xs[2] - xs[3], ys[2] - ys[3])
+        height = math.hypot(xs[3] - xs[0], ys[3] - ys[0]) + math.hypot(xs[2] - xs[1], ys[2] - ys[1])
+
+        ordered = sorted(characters, key=lambda c: c.left)
+        overlapping = 0
+        gaps = []
+        for current, following in zip(ordered, ordered[1:]):
+            gap = following.left - (current.left + current.width)
+            gaps.append(gap)
+            if gap < 0 and following.top < current.top + current.height and current.top < following.top + following.height:
+                overlapping += 1
+
+        mean = sum(gaps) / len(gaps) if gaps else 0.0
+        variance = sum(g * g for g in gaps) / len(gaps) - mean * mean if gaps else 0.0
+
+        return cls(
+            area=area,
+            skew_angle=skew,
+            aspect_ratio=width / height if height else 0.0,
+            bounding_box=(int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))),
+            overlapping_chars=overlapping,
+            char_spacing_mean=mean,
+            char_spacing_std=math.sqrt(max(variance, 0.0))
+        )
+
+
+@dataclass(frozen=True)
+class GeometryFilter:
+    """
+    Criterios de consulta por geometría; None = sin límite.
+    La inclinación se compara en valor absoluto.
+    """
+    min_skew: Optional[float] = None
+    max_skew: Optional[float] = None
+    min_area: Optional[float] = None
+    max_area: Optional[float] = None
+    min_aspect: Optional[float] = None
+    max_aspect: Optional[float] = None
+    overlapping: Optional[bool] = None      # True: con caracteres solapados; False: sin ellos
+
+    def ranges(self) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        """(medida, mínimo, máximo) de cada rango del filtro"""
+        return [
+            ('skew', self.min_skew, self.max_skew),
+            ('area', self.min_area, self.max_area),
+            ('aspect_ratio', self.min_aspect, self.max_aspect),
+        ]
+
+    def matches(self, geometry: PlateGeometry) -> bool:
+        """Evalúa el filtro sobre una sola matrícula"""
+        values = {
+            'skew': abs(geometry.skew_angle),
+            'area': geometry.area,
+            'aspect_ratio': geometry.aspect_ratio,
+        }
+        for name, low, high in self.ranges():
+            if (low is not None and values[name] < low) or (high is not None and values[name] > high):
+                return False
+        if self.overlapping is not None and (geometry.overlapping_chars > 0) != self.overlapping:
+            return False
+        return True
+
+
+@dataclass(init=False)
 class Plate:
-    """Matrícula detectada con todos sus metadatos"""
+    """
+    Matrícula detectada con todos sus metadatos
+
+    Si la imagen contiene varias matrículas, esta es la principal (la primera
+    del fichero) y las demás van en additional_plates.
+
+    invalid_chars, sorted_chars y geometry son valores derivados precalculados
+    al cargar (None = se calculan al vuelo); no forman parte de repr ni de la
+    igualdad.
+    """
+    __slots__ = (
+        'image_name', 'plate_number', 'characters', 'coordinates',
+        'num_plates_in_image', 'additional_plates', 'invalid_chars', 'sorted_chars', 'geometry'
+    )
+
     image_name: str
     plate_number: str
     characters: List[Character]
     coordinates: PlateCoordinates
     num_plates_in_image: int
-    
+    additional_plates: Sequence['Plate']
+
+    def __init__(
+        self,
+        image_name: str,
+        plate_number: str,
+        characters: List[Character],
+        coordinates: PlateCoordinates,
+        num_plates_in_image: int,
+        invalid_chars: Optional[List[str]] = None,
+        sorted_chars: Optional[str] = None,
+        additional_plates: Sequence['Plate'] = (),
+        geometry: Optional[PlateGeometry] = None,
+    ):
+        self.image_name = image_name
+        self.plate_number = plate_number
+        self.characters = characters
+        self.coordinates = coordinates
+        self.num_plates_in_image = num_plates_in_image
+        self.additional_plates = additional_plates
+        self.invalid_chars = invalid_chars
+        self.sorted_chars = sorted_chars
+        self.geometry = geometry
+        self.__post_init__()
+
     def __post_init__(self):
         if not self.plate_number:
             raise ValueError("La matrícula no puede estar vacía")
@@ -58,13 +217,44 @@ class Plate:
 
     def is_valid(self) -> bool:
         """Valida que todos los caracteres sean válidos"""
+        if self.invalid_chars is not None:
+            return not self.invalid_chars
         return all(char.is_valid() for char in self.characters)
-    
+
+    def get_invalid_characters(self) -> List[str]:
+        """Retorna los caracteres que no cumplen la regla de validez"""
+        if self.invalid_chars is not None:
+            return list(self.invalid_chars)
+        return [c.char for c in self.characters if not c.is_valid()]
+
     def get_sorted_characters(self) -> str:
         """Retorna caracteres ordenados de izquierda a derecha"""
+        if self.sorted_chars is not None:
+            return self.sorted_chars
         sorted_chars = sorted(self.characters, key=lambda c: c.left)
         return ''.join(c.char for c in sorted_chars)
-    
+
+    def get_geometry(self) -> PlateGeometry:
+        """Retorna la geometría precalculada o la calcula al vuelo"""
+        if self.geometry is not None:
+            return self.geometry
+        return PlateGeometry.compute(self.coordinates, self.characters)
+
     @property
     def num_characters(self) -> int:
         return len(self.characters)
+
+    @property
+    def all_plates(self) -> List['Plate']:
+        """Todas las matrículas de la imagen, empezando por la principal"""
+        return [self, *self.additional_plates]
+
+
+@dataclass
+class PlateMatch:
+    """Resultado de una búsqueda por número de matrícula"""
+    __slots__ = ('plate_number', 'distance', 'image_names')
+
+    plate_number: str
+    distance: int           # Distancia de edición a la consulta (0 = coincidencia)
+    image_names: List[str]
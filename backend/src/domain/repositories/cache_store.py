@@ -0,0 +1,50 @@
+"""
+Puerto (Interface) de un almacén clave-valor con caducidad.
+Lo usa la caché de lecturas de conversaciones sin conocer si los datos
+viven en memoria del proceso o en un servidor compatible con Redis.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Mapping, Optional
+
+
+class CacheStore(ABC):
+    """
+    Interface del almacén de caché.
+    Las implementaciones concretas irán en infrastructure/adapters/outbound/cache/
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Obtiene el valor guardado para una clave.
+
+        Returns:
+            El valor, o None si no existe o ha caducado
+        """
+        pass
+
+    @abstractmethod
+    async def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        """
+        Guarda varios valores que caducan a los `ttl` segundos.
+        """
+        pass
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Elimina las claves indicadas (las que no existen se ignoran).
+        """
+        pass
+
+    def stats(self) -> Dict:
+        """Contadores propios del almacén (entradas, expulsiones...)"""
+        return {}
+
+    async def close(self) -> None:
+        """Libera conexiones u otros recursos del almacén"""
+        pass
@@ -4,8 +4,9 @@ Define el contrato para obtener datos de OCR sin conocer la implementación.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from domain.entities.plate import Plate
+from datetime import datetime
+from typing import Dict, Iterator, Optional, List
+from domain.entities.plate import GeometryFilter, Plate, PlateMatch
 
 
 class PlateRepository(ABC):
@@ -30,6 +31,19 @@ class PlateRepository(ABC):
         """
         pass
 
+    def get_plates_by_image_names(self, image_names: List[str]) -> Dict[str, Optional[Plate]]:
+        """
+        Obtiene las matrículas de varias imágenes en una sola operación.
+        Las implementaciones pueden sobrescribirlo para resolver todo en una pasada.
+        
+        Args:
+            image_names: Nombres de archivo de imagen
+        
+        Returns:
+            Diccionario imagen -> Plate (None si no existe)
+        """
+        return {name: self.get_plate_by_image_name(name) for name in image_names}
+
     @abstractmethod
     def get_all_plates(self) -> List[Plate]:
         """
@@ -40,6 +54,41 @@ class PlateRepository(ABC):
         """
         pass
 
+    def iter_plates(self, after: Optional[str] = None) -> Iterator[Plate]:
+        """
+        Recorre las matrículas en un orden estable sin mantener la lista completa.
+        
+        Args:
+            after: Cursor; si se indica, empieza tras la matrícula de esa imagen
+        
+        Returns:
+            Iterador de objetos Plate
+        """
+        started = after is None
+        for plate in self.get_all_plates():
+            if started:
+                yield plate
+            elif plate.image_name == after:
+                started = True
+
+    def iter_image_names(self) -> Iterator[str]:
+        """
+        Recorre los nombres de imagen en el mismo orden que iter_plates,
+        sin construir las entidades.
+        """
+        return (plate.image_name for plate in self.iter_plates())
+
+    def count_plates(self) -> int:
+        """Número de matrículas disponibles"""
+        return len(self.get_all_plates())
+
+    def get_version(self) -> int:
+        """
+        Versión de los datos. Cambia cada vez que el repositorio se recarga,
+        para que las vistas derivadas sepan cuándo recalcularse.
+        """
+        return 0
+
     @abstractmethod
     def plate_exists(self, image_name: str) -> bool:
         """
@@ -52,3 +101,106 @@ class PlateRepository(ABC):
             True si existe, False en caso contrario
         """
         pass
+
+    def plates_exist(self, image_names: List[str]) -> Dict[str, bool]:
+        """
+        Comprueba la existencia de varias imágenes en una sola operación.
+        Las implementaciones pueden sobrescribirlo para resolverlo en bloque.
+
+        Returns:
+            Diccionario imagen -> existe
+        """
+        return {name: self.plate_exists(name) for name in image_names}
+
+    def search_plates(
+        self, query: str, mode: str = "fuzzy", max_distance: int = 1, limit: int = 50
+    ) -> List[PlateMatch]:
+        """
+        Busca imágenes por número de matrícula.
+
+        Args:
+            query: Matrícula (o prefijo) a buscar
+            mode: 'exact', 'prefix' o 'fuzzy' (distancia de edición <= max_distance)
+            max_distance: Distancia de edición máxima en modo 'fuzzy' (1 o 2)
+            limit: Número máximo de matrículas devueltas
+
+        Raises:
+            NotImplementedError: si la implementación no soporta búsquedas
+        """
+        raise NotImplementedError("Este repositorio no soporta búsquedas por matrícula")
+
+    def find_captures(
+        self,
+        lane: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Plate]:
+        """
+        Lecturas de un carril (o de todos) capturadas en [start, end), en
+        orden de captura. Carril y momento se extraen del nombre de la imagen.
+
+        Args:
+            after: Cursor: nombre de la última imagen ya recibida
+
+        Raises:
+            ValueError: si el cursor no corresponde a ninguna imagen
+            NotImplementedError: si la implementación no soporta estas consultas
+        """
+        raise NotImplementedError("Este repositorio no soporta consultas por carril y fecha")
+
+    def find_by_geometry(
+        self, criteria: GeometryFilter, after: Optional[str] = None, limit: int = 100
+    ) -> List[Plate]:
+        """
+        Imágenes con alguna matrícula cuya geometría (inclinación, área,
+        proporción, solapamiento de caracteres) cumple el filtro, en orden de
+        fichero.
+
+        Args:
+            after: Cursor: nombre de la última imagen ya recibida
+
+        Raises:
+            ValueError: si el cursor no corresponde a ninguna imagen
+            NotImplementedError: si la implementación no soporta estas consultas
+        """
+        raise NotImplementedError("Este repositorio no soporta consultas por geometría")
+
+    def get_statistics(self) -> Dict:
+        """
+        Agregados del conjunto: imágenes, matrículas, tasa de inválidas,
+        frecuencia de caracteres, histograma de longitudes e imágenes por
+        carril y por día. Diccionario serializable.
+
+        Raises:
+            NotImplementedError: si la implementación no mantiene estadísticas
+        """
+        raise NotImplementedError("Este repositorio no calcula estadísticas")
+
+    def warm_up(self) -> None:
+        """
+        Prepara los datos al arrancar la aplicación según la política de carga.
+        Por defecto no hace nada (repositorios sin carga previa).
+        """
+        pass
+
+    def close(self) -> None:
+        """Libera recursos (hilos, ficheros) al apagar la aplicación"""
+        pass
+
+    def is_ready(self) -> bool:
+        """
+        Indica si el repositorio puede responder sin esperar a una carga.
+        
+        Returns:
+            True si los datos están disponibles
+        """
+        return True
+
+    async def wait_until_ready(self) -> None:
+        """
+        Espera (sin bloquear el event loop) a que los datos estén disponibles.
+        Varias corrutinas pueden esperar a la vez sin disparar cargas duplicadas.
+        """
+        pass
@@ -0,0 +1,83 @@
+"""
+Caché LRU de respuestas ya serializadas
+Guarda el JSON listo para enviar, de modo que una consulta repetida no
+vuelve a construir DTOs ni a validarlos y serializarlos
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+
+class ResponseCache:
+    """
+    LRU acotada de cuerpos JSON (bytes) con contadores de aciertos.
+    Con max_entries=0 queda desactivada y solo cuenta fallos.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Retorna el cuerpo cacheado y lo marca como usado recientemente"""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes, epoch: Optional[int] = None) -> None:
+        """
+        Guarda un cuerpo, expulsando el menos usado si se supera el límite.
+        Si se indica epoch y la caché se invalidó desde entonces, se descarta
+        (el cuerpo se construyó con datos anteriores a la recarga).
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if epoch is not None and epoch != self.invalidations:
+                return
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """Retorna el cuerpo cacheado o lo construye (None no se cachea)"""
+        epoch = self.invalidations
+        body = self.get(key)
+        if body is None:
+            body = build()
+            if body is not None:
+                self.put(key, body, epoch)
+        return body
+
+    def clear(self) -> None:
+        """Vacía la caché (p. ej. tras recargar los datos)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Contadores de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -1,9 +1,10 @@
 """Authentication API routes"""
-from fastapi import APIRouter, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header
 from typing import Optional
+from gotrue import AsyncGoTrueClient
 from application.use_cases.login_user import LoginUserUseCase
 from application.services.auth_service import AuthService
-from infrastructure.adapters.outbound.database.supabase_client import get_supabase_client
+from infrastructure.adapters.outbound.database.supabase_client import get_supabase_auth_client
 from infrastructure.adapters.outbound.database.supabase_auth_repository import SupabaseAuthRepository
 from presentation.dto.auth_dto import LoginRequest, LoginResponse, LogoutRequest, MessageResponse, UserDTO
 
@@ -11,18 +12,21 @@ from presentation.dto.auth_dto import LoginRequest, LoginResponse, LogoutRequest
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-def get_auth_service() -> AuthService:
-    """Create authentication service instance"""
-    supabase_client = get_supabase_client()
-    auth_repository = SupabaseAuthRepository(supabase_client)
+def get_auth_service(
+    auth_client: AsyncGoTrueClient = Depends(get_supabase_auth_client)
+) -> AuthService:
+    """Authentication service bound to the process-wide Supabase auth client"""
+    auth_repository = SupabaseAuthRepository(auth_client)
     return AuthService(auth_repository)
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(credentials: LoginRequest):
+async def login(
+    credentials: LoginRequest,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     """User login endpoint"""
     try:
-        auth_service = get_auth_service()
         login_use_case = LoginUserUseCase(auth_service)
         
         user, access_token = await login_use_case.execute(
@@ -46,14 +50,16 @@ async def login(credentials: LoginRequest):
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(authorization: Optional[str] = Header(None)):
+async def logout(
+    authorization: Optional[str] = Header(None),
+    auth_service: AuthService = Depends(get_auth_service)
+):
     """User logout endpoint"""
     try:
         if not authorization or not authorization.startswith("Bearer "):
             raise HTTPException(status_code=401, detail="Token not provided")
         
         access_token = authorization.replace("Bearer ", "")
-        auth_service = get_auth_service()
         
         success = await auth_service.logout(access_token)
         
@@ -66,14 +72,16 @@ async def logout(authorization: Optional[str] = Header(None)):
 
 
 @router.get("/me", response_model=UserDTO)
-async def get_current_user(authorization: Optional[str] = Header(None)):
+async def get_current_user(
+    authorization: Optional[str] = Header(None),
+    auth_service: AuthService = Depends(get_auth_service)
+):
     """Get current authenticated user"""
     try:
         if not authorization or not authorization.startswith("Bearer "):
             raise HTTPException(status_code=401, detail="Token not provided")
         
         access_token = authorization.replace("Bearer ", "")
-        auth_service = get_auth_service()
         
         user = await auth_service.get_current_user(access_token)
         
@@ -1,61 +1,192 @@
 """Conversation management API routes"""
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
+from postgrest import AsyncPostgrestClient
+from application.services.conversation_cache import ConversationCache
 from application.services.conversation_service import ConversationService
+from infrastructure.adapters.outbound.cache.memory_cache_store import MemoryCacheStore
+from infrastructure.adapters.outbound.cache.redis_cache_store import RedisCacheStore
+from infrastructure.adapters.outbound.database.supabase_client import get_supabase_data_client
 from presentation.dto.conversation_dto import (
     ConversationCreate,
+    ConversationPage,
     ConversationResponse,
     MessageCreate,
+    MessagesCreate,
+    MessagePage,
     MessageResponse,
 )
 
 router = APIRouter(prefix="/conversations", tags=["Conversations"])
 
+# Tamaño de página si se pasa un cursor sin page_size
+DEFAULT_PAGE_SIZE = 50
 
-def get_conversation_service() -> ConversationService:
-    """Create conversation service instance"""
-    return ConversationService()
+# Segundos que se sirven de caché las listas completas de conversaciones y mensajes (0, por
+# defecto, la desactiva). Con el almacén en memoria la invalidación es de cada worker: con
+# varios workers, una lista puede quedar desactualizada hasta este TTL tras escribir en otro
+CONVERSATION_CACHE_TTL = float(os.getenv("CONVERSATION_CACHE_TTL", "0"))
+# "memory": LRU en cada worker; "redis": servidor compatible con Redis compartido por todos
+CONVERSATION_CACHE_BACKEND = os.getenv("CONVERSATION_CACHE_BACKEND", "memory")
+# Entradas de la LRU en memoria (0 desactiva la caché)
+CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "10000"))
+CONVERSATION_CACHE_URL = os.getenv("CONVERSATION_CACHE_URL", "redis://localhost:6379/0")
 
 
-@router.get("", response_model=List[ConversationResponse])
-async def get_conversations(user_id: str = Query(...)):
-    """Get all conversations for a user"""
+def create_conversation_cache() -> Optional[ConversationCache]:
+    """Read-through cache configured from the environment, or None when disabled"""
+    if CONVERSATION_CACHE_TTL <= 0:
+        return None
+    if CONVERSATION_CACHE_BACKEND == "redis":
+        return ConversationCache(RedisCacheStore(CONVERSATION_CACHE_URL), CONVERSATION_CACHE_TTL, backend="redis")
+    if CONVERSATION_CACHE_BACKEND != "memory":
+        raise ValueError(f"CONVERSATION_CACHE_BACKEND desconocido: {CONVERSATION_CACHE_BACKEND}")
+    if CONVERSATION_CACHE_SIZE <= 0:
+        return None
+    return ConversationCache(MemoryCacheStore(CONVERSATION_CACHE_SIZE), CONVERSATION_CACHE_TTL)
+
+
+conversation_cache = create_conversation_cache()
+
+
+def get_conversation_service(
+    supabase: AsyncPostgrestClient = Depends(get_supabase_data_client)
+) -> ConversationService:
+    """Conversation service bound to the process-wide Supabase client and list cache"""
+    return ConversationService(supabase, conversation_cache)
+
+
+async def ndjson_lines(batches, dto):
+    """One JSON object per line (serialized like the list endpoints), one chunk per batch read from Supabase."""
+    async for rows in batches:
+        yield "".join(dto.model_validate(row).model_dump_json() + "\n" for row in rows)
+
+
+@router.get("/cache-stats", response_model=dict)
+async def conversation_cache_stats():
+    """Hit/miss counters of the conversation and message list cache."""
+    if conversation_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **conversation_cache.stats()}
+
+
+@router.get("", response_model=Union[List[ConversationResponse], ConversationPage])
+async def get_conversations(
+    user_id: str = Query(...),
+    after: Optional[str] = Query(default=None, description="Cursor: next_after of the previous page"),
+    before: Optional[str] = Query(default=None, description="Cursor: next_before of the previous page"),
+    page_size: Optional[int] = Query(default=None, ge=1, le=1000),
+    stream: bool = Query(default=False, description="Stream every conversation as NDJSON"),
+    service: ConversationService = Depends(get_conversation_service)
+):
+    """Get the conversations of a user, most recently updated first.
+    
+    Without cursor parameters the whole list is returned as before. With
+    `page_size`, `after` or `before` a keyset page is returned; follow
+    `next_after`/`next_before` for the adjacent pages. `stream=true` sends
+    every conversation as NDJSON, fetched from Supabase in batches.
+    """
+    if stream:
+        return StreamingResponse(ndjson_lines(service.iter_conversations(user_id), ConversationResponse), media_type="application/x-ndjson")
+    
     try:
-        service = get_conversation_service()
+        if after is not None or before is not None or page_size is not None:
+            size = page_size or DEFAULT_PAGE_SIZE
+            page = await service.get_conversations_page(user_id, size, after=after, before=before)
+            return ConversationPage(
+                conversations=page.rows,
+                page_size=size,
+                next_before=page.next_before,
+                next_after=page.next_after
+            )
+        
         conversations = await service.get_conversations(user_id)
         return conversations
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("", response_model=ConversationResponse)
-async def create_conversation(data: ConversationCreate):
+async def create_conversation(
+    data: ConversationCreate,
+    service: ConversationService = Depends(get_conversation_service)
+):
     """Create new conversation"""
     try:
-        service = get_conversation_service()
         conversation = await service.create_conversation(data.user_id, data.title)
         return conversation
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{conversation_id}/messages", response_model=List[MessageResponse])
-async def get_messages(conversation_id: str):
-    """Get all messages in a conversation"""
+@router.get("/{conversation_id}/messages", response_model=Union[List[MessageResponse], MessagePage])
+async def get_messages(
+    conversation_id: str,
+    after: Optional[str] = Query(default=None, description="Cursor: newer messages than this one"),
+    before: Optional[str] = Query(default=None, description="Cursor: older messages than this one"),
+    page_size: Optional[int] = Query(default=None, ge=1, le=1000),
+    stream: bool = Query(default=False, description="Stream every message as NDJSON"),
+    service: ConversationService = Depends(get_conversation_service)
+):
+    """Get the messages of a conversation in chronological order.
+    
+    Without cursor parameters the whole history is returned as before.
+    With `page_size` alone the latest messages are returned; `before`
+    pages back through older ones and `after` fetches newer ones.
+    `stream=true` exports the full history as NDJSON, fetched from
+    Supabase in batches.
+    """
+    if stream:
+        return StreamingResponse(ndjson_lines(service.iter_messages(conversation_id), MessageResponse), media_type="application/x-ndjson")
+    
     try:
-        service = get_conversation_service()
+        if after is not None or before is not None or page_size is not None:
+            size = page_size or DEFAULT_PAGE_SIZE
+            page = await service.get_messages_page(conversation_id, size, after=after, before=before)
+            return MessagePage(
+                messages=page.rows,
+                page_size=size,
+                next_before=page.next_before,
+                next_after=page.next_after
+            )
+        
         messages = await service.get_messages(conversation_id)
         return messages
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/{conversation_id}/messages", response_model=MessageResponse)
-async def save_message(conversation_id: str, data: MessageCreate):
+async def save_message(
+    conversation_id: str,
+    data: MessageCreate,
+    service: ConversationService = Depends(get_conversation_service)
+):
     """Save message to conversation"""
     try:
-        service = get_conversation_service()
         message = await service.save_message(conversation_id, data.role, data.content)
         return message
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{conversation_id}/messages/batch", response_model=List[MessageResponse])
+async def save_messages(
+    conversation_id: str,
+    data: MessagesCreate,
+    service: ConversationService = Depends(get_conversation_service)
+):
+    """Save several messages in order (e.g. user message and bot reply) in one round trip"""
+    try:
+        messages = await service.save_messages(
+            conversation_id, [{"role": m.role, "content": m.content} for m in data.messages]
+        )
+        return messages
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
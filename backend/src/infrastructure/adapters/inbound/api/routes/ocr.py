@@ -1,17 +1,28 @@
 """OCR API routes for license plate recognition"""
+import asyncio
+import json
 import os
+import threading
+from datetime import datetime
 import cloudinary
 import cloudinary.api
-from typing import Set
+from typing import List, Literal, Optional, Set
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from pathlib import Path
 from dotenv import load_dotenv
-from application.services.ocr_service import OCRService
+from application.services.ocr_service import OCRService, AvailablePlatesView
+from domain.entities.plate import GeometryFilter, Plate, PlateGeometry
 from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+from infrastructure.adapters.outbound.file.capture_index import parse_capture, key_to_datetime
+from infrastructure.adapters.outbound.cloudinary.cloudinary_image_catalog import CloudinaryImageCatalog
+from infrastructure.adapters.outbound.cloudinary.cloudinary_sync import CloudinarySync
+from infrastructure.adapters.inbound.api.response_cache import ResponseCache
 from presentation.dto.ocr_dto import (
     OCRRequest, OCRResponseSimple, OCRResponseDetailed,
-    OCRErrorResponse, CharacterDTO, PlateCoordinatesDTO
+    OCRErrorResponse, CharacterDTO, PlateCoordinatesDTO, PlateDetailDTO, PlateGeometryDTO,
+    OCRBatchRequest, OCRBatchItem, OCRBatchResponse, OCRExistsRequest, OCRExistsResponse
 )
 
 router = APIRouter(prefix="/ocr", tags=["OCR"])
@@ -19,12 +30,33 @@ router = APIRouter(prefix="/ocr", tags=["OCR"])
 load_dotenv()
 
 BASE_DIR = Path(__file__).parent.parent.parent.parent.parent.parent.parent
-PLATES_DAT_PATH = BASE_DIR / "assets" / "plates.dat"
+# Ruta de plates.dat; por defecto assets/plates.dat o, si no existe, assets/plates.dat.gz
+PLATES_DAT_PATH = Path(os.getenv("PLATES_DAT_PATH", str(BASE_DIR / "assets" / "plates.dat")))
+if "PLATES_DAT_PATH" not in os.environ and not PLATES_DAT_PATH.exists():
+    # Solo se despliega el artefacto comprimido; se lee en streaming
+    PLATES_DAT_PATH = BASE_DIR / "assets" / "plates.dat.gz"
+# "memory": plates.dat parseado en memoria; "index": índice binario compartido vía mmap
+PLATES_REPOSITORY = os.getenv("PLATES_REPOSITORY", "memory")
+# Política de carga del repositorio en memoria: "lazy", "eager" o "streaming"
+PLATES_LOAD_MODE = os.getenv("PLATES_LOAD_MODE", "lazy")
+# Procesos para parsear plates.dat grandes (por defecto, uno por CPU)
+PLATES_PARSE_WORKERS = int(os.getenv("PLATES_PARSE_WORKERS", "0")) or None
+# Segundos entre comprobaciones de cambios en plates.dat (0 desactiva la recarga en caliente)
+PLATES_WATCH_INTERVAL = float(os.getenv("PLATES_WATCH_INTERVAL", "0"))
+# Respuestas de /recognize ya serializadas que se guardan en memoria (0 desactiva la caché)
+OCR_RESPONSE_CACHE_SIZE = int(os.getenv("OCR_RESPONSE_CACHE_SIZE", "10000"))
 
 CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
 CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
 CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
 CLOUDINARY_FOLDER = "innova-plates/innova-plates"
+# Segundos que se sirve el conjunto de imágenes de Cloudinary antes de refrescarlo
+CLOUDINARY_CACHE_TTL = float(os.getenv("CLOUDINARY_CACHE_TTL", "300"))
+# Instantánea local del listado y cada cuántos segundos se hace un listado completo
+CLOUDINARY_SNAPSHOT_PATH = os.getenv(
+    "CLOUDINARY_SNAPSHOT_PATH", str(BASE_DIR / "assets" / "cloudinary_snapshot.sqlite3")
+)
+CLOUDINARY_FULL_SYNC_INTERVAL = float(os.getenv("CLOUDINARY_FULL_SYNC_INTERVAL", "86400"))
 
 if not all([CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET]):
     print("Warning: Cloudinary credentials not configured")
@@ -38,51 +70,175 @@ else:
         secure=True
     )
 
+# Matrículas por bloque al emitir NDJSON
+STREAM_BATCH_SIZE = 500
+
 CLOUDINARY_BASE_URL = f"https://res.cloudinary.com/{CLOUDINARY_CLOUD_NAME}/image/upload"
 
-plate_repository = PlatesDatRepository(str(PLATES_DAT_PATH))
+if PLATES_REPOSITORY == "index":
+    plate_repository = PlatesIndexRepository(str(PLATES_DAT_PATH))
+else:
+    plate_repository = PlatesDatRepository(
+        str(PLATES_DAT_PATH),
+        load_mode=PLATES_LOAD_MODE,
+        parse_workers=PLATES_PARSE_WORKERS,
+        watch_interval=PLATES_WATCH_INTERVAL
+    )
 ocr_service = OCRService(plate_repository)
 
+# En modo streaming cada consulta recorre plates.dat: se ejecuta fuera del event loop
+SCANS_PLATES_FILE = isinstance(plate_repository, PlatesDatRepository) and PLATES_LOAD_MODE == "streaming"
+
+response_cache = ResponseCache(OCR_RESPONSE_CACHE_SIZE)
+if isinstance(plate_repository, PlatesDatRepository):
+    # Las claves llevan la versión de los datos; al recargar se liberan además las entradas antiguas
+    plate_repository.add_reload_listener(response_cache.clear)
 
-def get_cloudinary_available_images() -> Set[str]:
+
+_cloudinary_sync: Optional[CloudinarySync] = None
+_cloudinary_sync_lock = threading.Lock()
+
+
+def get_cloudinary_sync() -> Optional[CloudinarySync]:
+    """Incremental Cloudinary sync, or None when Cloudinary is not configured.
+    
+    Created on first use, not at import: it opens (and creates) the SQLite
+    snapshot, which tests, scripts and parser worker processes that import
+    this module do not need.
+    """
+    global _cloudinary_sync
+    if not CLOUDINARY_CONFIGURED:
+        return None
+    if _cloudinary_sync is None:
+        with _cloudinary_sync_lock:
+            if _cloudinary_sync is None:
+                _cloudinary_sync = CloudinarySync(
+                    cloudinary.api.resources,
+                    CLOUDINARY_FOLDER,
+                    CLOUDINARY_SNAPSHOT_PATH,
+                    full_sync_interval=CLOUDINARY_FULL_SYNC_INTERVAL
+                )
+    return _cloudinary_sync
+
+
+def fetch_cloudinary_images() -> Set[str]:
     """Query Cloudinary API 
     
     Returns:
         Los archivos (e.g., {'12282863.jpg', '12365363.jpg'})
     """
-    if not CLOUDINARY_CONFIGURED:
+    cloudinary_sync = get_cloudinary_sync()
+    if cloudinary_sync is None:
         return set()
     
-    try:
-        all_images = set()
-        next_cursor = None
-        
-        while True:
-            params = {
-                "type": "upload",
-                "prefix": CLOUDINARY_FOLDER + "/",
-                "max_results": 500,
-            }
-            
-            if next_cursor:
-                params["next_cursor"] = next_cursor
-            
-            response = cloudinary.api.resources(**params)
-            
-            for resource in response.get('resources', []):
-                public_id = resource.get('public_id', '')
-                filename = public_id.split('/')[-1] + '.jpg'
-                all_images.add(filename)
-            
-            next_cursor = response.get('next_cursor')
-            if not next_cursor:
-                break
-        
-        return all_images
+    return cloudinary_sync.sync()
+
+
+cloudinary_catalog = CloudinaryImageCatalog(fetch_cloudinary_images, ttl_seconds=CLOUDINARY_CACHE_TTL)
+
+
+async def get_cloudinary_available_images() -> Set[str]:
+    """Available images, served from the in-memory catalog."""
+    return await cloudinary_catalog.get_available_images()
+
+
+def to_plate_detail(plate: Plate) -> PlateDetailDTO:
+    """Build the per-plate part of the detailed response."""
+    characters_dto = [
+        CharacterDTO(
+            char=c.char,
+            left=c.left,
+            top=c.top,
+            width=c.width,
+            height=c.height
+        )
+        for c in plate.characters
+    ]
     
-    except Exception as e:
-        print(f"Error querying Cloudinary API: {e}")
-        return set()
+    coordinates_dto = PlateCoordinatesDTO(
+        top_left=plate.coordinates.top_left,
+        top_right=plate.coordinates.top_right,
+        bottom_right=plate.coordinates.bottom_right,
+        bottom_left=plate.coordinates.bottom_left
+    )
+    
+    return PlateDetailDTO(
+        plate_number=plate.plate_number,
+        num_characters=plate.num_characters,
+        characters=characters_dto,
+        coordinates=coordinates_dto,
+        geometry=to_geometry_dto(plate.get_geometry()),
+        is_valid=plate.is_valid()
+    )
+
+
+def to_geometry_dto(geometry: PlateGeometry) -> PlateGeometryDTO:
+    """Build the geometry part of a plate detail."""
+    return PlateGeometryDTO(
+        area=geometry.area,
+        skew_angle=geometry.skew_angle,
+        aspect_ratio=geometry.aspect_ratio,
+        bounding_box=geometry.bounding_box,
+        overlapping_chars=geometry.overlapping_chars,
+        char_spacing_mean=geometry.char_spacing_mean,
+        char_spacing_std=geometry.char_spacing_std
+    )
+
+
+def to_detailed_response(plate: Plate) -> OCRResponseDetailed:
+    """Build the detailed DTO for a recognized plate, including the other plates in the image."""
+    detail = to_plate_detail(plate)
+    
+    return OCRResponseDetailed(
+        plate_number=detail.plate_number,
+        image_name=plate.image_name,
+        num_characters=detail.num_characters,
+        num_plates_in_image=plate.num_plates_in_image,
+        characters=detail.characters,
+        coordinates=detail.coordinates,
+        geometry=detail.geometry,
+        is_valid=detail.is_valid,
+        additional_plates=[to_plate_detail(p) for p in plate.additional_plates]
+    )
+
+
+async def run_lookup(func, *args):
+    """Run a plates lookup, in a worker thread when it scans plates.dat."""
+    if SCANS_PLATES_FILE:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+def cached_recognition(variant: str, image_name: str, serialize) -> Response:
+    """Serve a recognition response from the pre-serialized cache, building it on a miss.
+    
+    Only successful recognitions are cached; a missing image raises 404 and
+    an invalid plate raises ValueError, exactly as without the cache. Keys
+    carry the repository data version, so a changed plates.dat is never
+    served from bodies built before the change, even by repositories that
+    do not notify reloads.
+    """
+    def build() -> Optional[bytes]:
+        plate = ocr_service.recognize_plate(image_name)
+        if plate is None:
+            return None
+        return serialize(plate).model_dump_json().encode("utf-8")
+    
+    body = response_cache.get_or_build((ocr_service.get_version(), variant, image_name), build)
+    if body is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"OCR data not found for: {image_name}"
+        )
+    return Response(content=body, media_type="application/json")
+
+
+def to_simple_response(plate: Plate) -> OCRResponseSimple:
+    """Build the simple DTO for a recognized plate."""
+    return OCRResponseSimple(
+        plate_number=plate.plate_number,
+        image_name=plate.image_name
+    )
 
 
 @router.post("/recognize", response_model=OCRResponseSimple, responses={404: {"model": OCRErrorResponse}})
@@ -92,19 +248,11 @@ async def recognize_plate(request: OCRRequest):
     Returns plate number only.
     """
     try:
-        plate = ocr_service.recognize_plate(request.image_name)
-        
-        if plate is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"OCR data not found for: {request.image_name}"
-            )
-        
-        return OCRResponseSimple(
-            plate_number=plate.plate_number,
-            image_name=plate.image_name
-        )
+        await ocr_service.wait_until_ready()
+        return await run_lookup(cached_recognition, "simple", request.image_name, to_simple_response)
     
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -118,92 +266,338 @@ async def recognize_plate_detailed(request: OCRRequest):
     Includes coordinates, individual characters, and metadata.
     """
     try:
-        plate = ocr_service.recognize_plate(request.image_name)
-        
-        if plate is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"OCR data not found for: {request.image_name}"
-            )
-        
-        characters_dto = [
-            CharacterDTO(
-                char=c.char,
-                left=c.left,
-                top=c.top,
-                width=c.width,
-                height=c.height
-            )
-            for c in plate.characters
-        ]
-        
-        coordinates_dto = PlateCoordinatesDTO(
-            top_left=plate.coordinates.top_left,
-            top_right=plate.coordinates.top_right,
-            bottom_right=plate.coordinates.bottom_right,
-            bottom_left=plate.coordinates.bottom_left
-        )
-        
-        return OCRResponseDetailed(
-            plate_number=plate.plate_number,
-            image_name=plate.image_name,
-            num_characters=plate.num_characters,
-            num_plates_in_image=plate.num_plates_in_image,
-            characters=characters_dto,
-            coordinates=coordinates_dto,
-            is_valid=plate.is_valid()
-        )
+        await ocr_service.wait_until_ready()
+        return await run_lookup(cached_recognition, "detailed", request.image_name, to_detailed_response)
     
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
+@router.get("/recognize/cache-stats", response_model=dict)
+async def recognize_cache_stats():
+    """Hit/miss counters of the pre-serialized recognition cache."""
+    return response_cache.stats()
+
+
+@router.post("/recognize/batch", response_model=OCRBatchResponse)
+async def recognize_plates_batch(request: OCRBatchRequest):
+    """Recognize license plates for many images in one request.
+    
+    Missing or invalid images are reported per item instead of failing the batch.
+    """
+    try:
+        await ocr_service.wait_until_ready()
+        recognized = await run_lookup(ocr_service.recognize_plates, request.image_names)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    
+    items = []
+    for image_name, plate, error in recognized:
+        if error is not None:
+            items.append(OCRBatchItem(image_name=image_name, status="invalid", error=error))
+        elif plate is None:
+            items.append(OCRBatchItem(
+                image_name=image_name,
+                status="not_found",
+                error=f"OCR data not found for: {image_name}"
+            ))
+        elif request.detailed:
+            items.append(OCRBatchItem(image_name=image_name, status="ok", result=to_detailed_response(plate)))
+        else:
+            items.append(OCRBatchItem(
+                image_name=image_name,
+                status="ok",
+                result=to_simple_response(plate)
+            ))
+    
+    return OCRBatchResponse(
+        total=len(items),
+        recognized=sum(1 for item in items if item.status == "ok"),
+        results=items
+    )
+
+
 @router.get("/exists/{image_name}", response_model=dict)
 async def check_image_exists(image_name: str):
     """Check if OCR data exists for an image."""
-    exists = ocr_service.image_exists(image_name)
+    await ocr_service.wait_until_ready()
+    exists = await run_lookup(ocr_service.image_exists, image_name)
     return {"image_name": image_name, "exists": exists}
 
 
+@router.post("/exists", response_model=OCRExistsResponse)
+async def check_images_exist(request: OCRExistsRequest):
+    """Check in one request whether OCR data exists for many images.
+    
+    All names are resolved in one repository call; in streaming mode the
+    names ruled out by the shared Bloom filter never trigger a file scan.
+    """
+    await ocr_service.wait_until_ready()
+    exists = await asyncio.to_thread(ocr_service.images_exist, request.image_names)
+    return OCRExistsResponse(
+        total=len(exists),
+        found=sum(exists.values()),
+        exists=exists
+    )
+
+
+def plate_summary(plate: Plate) -> dict:
+    """Compact representation used by the plate listings."""
+    return {
+        "image_name": plate.image_name,
+        "plate_number": plate.plate_number,
+        "num_characters": plate.num_characters
+    }
+
+
+async def get_available_view() -> AvailablePlatesView:
+    """Available plates view, recomputed off the event loop only when its inputs change."""
+    cloudinary_images = await get_cloudinary_available_images()
+    return await asyncio.to_thread(
+        ocr_service.get_available_view, cloudinary_images, cloudinary_catalog.version
+    )
+
+
+def next_cursor(selected_names: List[str], size: int) -> Optional[str]:
+    """Cursor for the next page: the last name the page query selected, if it filled the page.
+    
+    Must be computed from the names selected for the page, before any
+    lookup that can drop some of them, or a shortened page would look
+    like the last one.
+    """
+    return selected_names[-1] if len(selected_names) == size else None
+
+
 @router.get("/plates", response_model=dict)
-async def list_all_plates(limit: int = Query(default=None, ge=1, le=10000)):
+async def list_all_plates(
+    limit: int = Query(default=None, ge=1, le=10000),
+    after: Optional[str] = Query(default=None, description="Cursor: image_name of the last plate already received"),
+    page_size: Optional[int] = Query(default=None, ge=1, le=10000),
+    stream: bool = Query(default=False, description="Stream the plates as NDJSON")
+):
     """List all available plates from Cloudinary.
     
-    Queries Cloudinary API dynamically to get available images.
+    Served from a precomputed view of plates available in Cloudinary, so
+    `limit` and cursor pages (`after`/`page_size`) are plain slices. With
+    `stream=true` plates are sent as NDJSON in batches, so the server never
+    holds the whole list.
     """
-    all_plates = ocr_service.get_all_plates()
-    cloudinary_images = get_cloudinary_available_images()
+    await ocr_service.wait_until_ready()
+    view = await get_available_view()
     
-    available_plates = [
-        plate for plate in all_plates 
-        if plate.image_name in cloudinary_images
-    ]
+    if after is not None and after not in view:
+        raise HTTPException(status_code=400, detail=f"Unknown cursor: {after}")
+    
+    if stream:
+        names = view.page(after, page_size or limit)
+        
+        def ndjson_lines():
+            for start in range(0, len(names), STREAM_BATCH_SIZE):
+                batch = ocr_service.get_plates_in_order(names[start:start + STREAM_BATCH_SIZE])
+                yield "".join(json.dumps(plate_summary(p)) + "\n" for p in batch)
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
+    if after is not None or page_size is not None:
+        size = page_size or limit or 100
+        names = view.page(after, size)
+        # Las imágenes que desaparecieron tras construir la vista se omiten, sin acortar la paginación
+        page = ocr_service.get_plates_in_order(names)
+        
+        return {
+            "showing": len(page),
+            "page_size": size,
+            "next_after": next_cursor(names, size),
+            "cloudinary_synced": CLOUDINARY_CONFIGURED,
+            "plates": [plate_summary(p) for p in page]
+        }
     
-    if limit is not None:
-        available_plates = available_plates[:limit]
+    available_plates = ocr_service.get_plates_in_order(view.page(size=limit))
     
     return {
-        "total": len(all_plates),
-        "available": len(available_plates),
+        "total": ocr_service.count_plates(),
+        "available": len(view),
         "showing": len(available_plates),
         "cloudinary_synced": CLOUDINARY_CONFIGURED,
+        "plates": [plate_summary(p) for p in available_plates]
+    }
+
+
+@router.post("/plates/refresh", response_model=dict)
+async def refresh_available_images():
+    """Invalidate the cached Cloudinary image set and fetch it again."""
+    images = await cloudinary_catalog.refresh()
+    return {
+        "available_images": len(images),
+        "cloudinary_synced": CLOUDINARY_CONFIGURED,
+        "error": cloudinary_catalog.last_error
+    }
+
+
+@router.get("/plates/sync-status", response_model=dict)
+async def cloudinary_sync_status():
+    """Metrics of the incremental Cloudinary sync (lag, duration, API calls)."""
+    cloudinary_sync = get_cloudinary_sync()
+    return {
+        "cloudinary_synced": CLOUDINARY_CONFIGURED,
+        "cache_fresh": cloudinary_catalog.is_fresh(),
+        "last_error": cloudinary_catalog.last_error,
+        **(cloudinary_sync.metrics() if cloudinary_sync else {})
+    }
+
+
+@router.get("/search", response_model=dict)
+async def search_plates(
+    q: str = Query(..., min_length=1, max_length=32, description="Plate number or prefix"),
+    mode: Literal["exact", "prefix", "fuzzy"] = Query(default="fuzzy"),
+    max_distance: int = Query(default=1, ge=0, le=2, description="Edit distance for fuzzy mode"),
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """Find images by plate number.
+    
+    Matching treats common OCR confusions (0/O, 1/I, 8/B) as equal. `fuzzy`
+    also returns plates within `max_distance` insertions, deletions or
+    substitutions, closest first.
+    """
+    await ocr_service.wait_until_ready()
+    
+    try:
+        matches = await asyncio.to_thread(ocr_service.search_plates, q, mode, max_distance, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    return {
+        "query": q,
+        "mode": mode,
+        "total": len(matches),
+        "results": [
+            {"plate_number": m.plate_number, "distance": m.distance, "image_names": m.image_names}
+            for m in matches
+        ]
+    }
+
+
+def capture_summary(plate: Plate) -> dict:
+    """Listing entry with the lane and capture time encoded in the image name."""
+    lane, timestamp = parse_capture(plate.image_name)
+    return {
+        **plate_summary(plate),
+        "lane": lane,
+        "captured_at": key_to_datetime(timestamp).isoformat()
+    }
+
+
+@router.get("/captures", response_model=dict)
+async def list_captures(
+    lane: Optional[int] = Query(default=None, ge=0, description="Camera lane; all lanes if omitted"),
+    start: Optional[datetime] = Query(default=None, description="Capture time lower bound (inclusive)"),
+    end: Optional[datetime] = Query(default=None, description="Capture time upper bound (exclusive)"),
+    after: Optional[str] = Query(default=None, description="Cursor: image_name of the last capture already received"),
+    limit: int = Query(default=100, ge=1, le=1000)
+):
+    """List reads by camera lane and capture time range, in capture order.
+    
+    Lane and capture time are parsed from the image name
+    (`<plate>_lane<N>_<seq>_<YYYYMMDD>_<HHMMSS>.jpg`). Pages are cursor
+    based: pass the returned `next_after` as `after`.
+    """
+    await ocr_service.wait_until_ready()
+    
+    try:
+        plates = await asyncio.to_thread(ocr_service.find_captures, lane, start, end, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    return {
+        "lane": lane,
+        "start": start,
+        "end": end,
+        "showing": len(plates),
+        "next_after": next_cursor([p.image_name for p in plates], limit),
+        "captures": [capture_summary(p) for p in plates]
+    }
+
+
+@router.get("/geometry", response_model=dict)
+async def find_by_geometry(
+    min_skew: Optional[float] = Query(default=None, ge=0, le=90, description="Minimum absolute skew in degrees"),
+    max_skew: Optional[float] = Query(default=None, ge=0, le=90, description="Maximum absolute skew in degrees"),
+    min_area: Optional[float] = Query(default=None, ge=0, description="Minimum plate area in px²"),
+    max_area: Optional[float] = Query(default=None, ge=0, description="Maximum plate area in px²"),
+    min_aspect: Optional[float] = Query(default=None, ge=0, description="Minimum width / height ratio"),
+    max_aspect: Optional[float] = Query(default=None, ge=0, description="Maximum width / height ratio"),
+    overlapping: Optional[bool] = Query(default=None, description="Only plates with (true) or without (false) overlapping characters"),
+    after: Optional[str] = Query(default=None, description="Cursor: image_name of the last image already received"),
+    limit: int = Query(default=100, ge=1, le=1000)
+):
+    """List images with a plate whose geometry matches every given bound.
+    
+    Geometry is computed in bulk when plates.dat is loaded, e.g.
+    `?min_skew=10` returns plates tilted more than 10 degrees. Results are in
+    file order; pass the returned `next_after` as `after` for the next page.
+    """
+    await ocr_service.wait_until_ready()
+    
+    criteria = GeometryFilter(
+        min_skew=min_skew, max_skew=max_skew,
+        min_area=min_area, max_area=max_area,
+        min_aspect=min_aspect, max_aspect=max_aspect,
+        overlapping=overlapping
+    )
+    try:
+        plates = await asyncio.to_thread(ocr_service.find_by_geometry, criteria, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    return {
+        "showing": len(plates),
+        "next_after": next_cursor([p.image_name for p in plates], limit),
         "plates": [
             {
-                "image_name": p.image_name,
-                "plate_number": p.plate_number,
-                "num_characters": p.num_characters
+                "image_name": plate.image_name,
+                "plates": [
+                    {"plate_number": p.plate_number, "geometry": to_geometry_dto(p.get_geometry()).model_dump()}
+                    for p in plate.all_plates
+                ]
             }
-            for p in available_plates
+            for plate in plates
         ]
     }
 
 
+@router.get("/stats", response_model=dict)
+async def dataset_statistics():
+    """Dataset aggregates for dashboards.
+    
+    Plate count, invalid-plate rate, character frequency, plate-length
+    histogram and images per lane and capture day. They are computed when
+    plates.dat is loaded and updated on each append, so this endpoint does
+    not depend on the dataset size.
+    """
+    await ocr_service.wait_until_ready()
+    
+    try:
+        # El primer cálculo (o el modo streaming) recorre los datos: fuera del event loop
+        return await asyncio.to_thread(ocr_service.get_statistics)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
 @router.get("/image/{image_name}")
 async def get_plate_image(image_name: str):
     """Redirect to plate image in Cloudinary CDN."""
-    if not ocr_service.image_exists(image_name):
+    await ocr_service.wait_until_ready()
+    if not await run_lookup(ocr_service.image_exists, image_name):
         raise HTTPException(status_code=404, detail=f"Image not found: {image_name}")
     
     image_stem = Path(image_name).stem
@@ -0,0 +1 @@
+"""Adaptadores de almacenes de caché (memoria del proceso y Redis)"""
@@ -0,0 +1,68 @@
+"""
+Almacén de caché en memoria del proceso
+LRU acotada con caducidad por entrada; cada worker tiene la suya
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional, Tuple
+
+from domain.repositories.cache_store import CacheStore
+
+
+class MemoryCacheStore(CacheStore):
+    """
+    LRU de valores (bytes) con TTL. Las entradas caducadas se descartan al
+    leerlas o al expulsar por tamaño. Con max_entries=0 no guarda nada.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        # clave -> (instante de caducidad en time.monotonic(), valor)
+        self._entries: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, (oldest_expiry, _) = self._entries.popitem(last=False)
+                if oldest_expiry <= time.monotonic():
+                    self.expirations += 1
+                else:
+                    self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,59 @@
+"""
+Almacén de caché en un servidor compatible con Redis
+Compartido por todos los workers e instancias: una invalidación en uno
+se ve en los demás. Un fallo del servidor se trata como un fallo de caché
+y la petición sigue contra Supabase
+"""
+from typing import Mapping, Optional
+
+from domain.repositories.cache_store import CacheStore
+
+try:
+    import redis.asyncio as redis_asyncio
+    from redis.exceptions import RedisError
+except ImportError:  # dependencia opcional
+    redis_asyncio = None
+    RedisError = Exception
+
+
+class RedisCacheStore(CacheStore):
+    """Valores con caducidad (SET PX) en Redis o un sustituto compatible"""
+
+    def __init__(self, url: str, key_prefix: str = "innova:"):
+        if redis_asyncio is None:
+            raise ValueError("Se requiere el paquete 'redis' para usar una caché Redis")
+        self.key_prefix = key_prefix
+        self._client = redis_asyncio.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._client.get(self.key_prefix + key)
+        except RedisError as e:
+            print(f"Redis cache get failed: {e}")
+            return None
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: float) -> None:
+        if ttl <= 0 or not items:
+            return
+
+        try:
+            # Un solo viaje de ida y vuelta para todas las claves
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self.key_prefix + key, value, px=int(ttl * 1000))
+                await pipe.execute()
+        except RedisError as e:
+            print(f"Redis cache set failed: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+
+        try:
+            await self._client.delete(*(self.key_prefix + key for key in keys))
+        except RedisError as e:
+            # La entrada antigua caduca como mucho al cumplirse su TTL
+            print(f"Redis cache delete failed: {e}")
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1 @@
+"""Adaptadores para el catálogo de imágenes en Cloudinary"""
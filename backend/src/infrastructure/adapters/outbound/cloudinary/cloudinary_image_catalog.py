@@ -0,0 +1,134 @@
+"""
+Catálogo de imágenes disponibles en Cloudinary
+Mantiene en memoria el conjunto de imágenes con TTL y lo refresca en segundo
+plano (stale-while-revalidate) para no consultar la Admin API en cada petición
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+PAGE_SIZE = 500
+
+
+def iter_resources(resources: Callable[..., Dict[str, Any]], **params: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Pagina la Admin API de Cloudinary siguiendo next_cursor.
+
+    Args:
+        resources: Función con la firma de cloudinary.api.resources
+        params: Filtros de la consulta (prefix, start_at, direction...)
+    """
+    next_cursor = None
+
+    while True:
+        page_params = {"type": "upload", "max_results": PAGE_SIZE, **params}
+
+        if next_cursor:
+            page_params["next_cursor"] = next_cursor
+
+        response = resources(**page_params)
+        yield from response.get('resources', [])
+
+        next_cursor = response.get('next_cursor')
+        if not next_cursor:
+            break
+
+
+def iter_folder_resources(resources: Callable[..., Dict[str, Any]], folder: str) -> Iterator[Dict[str, Any]]:
+    """Recursos de una carpeta de Cloudinary (sin barra final)"""
+    return iter_resources(resources, prefix=folder + "/")
+
+
+def image_filename(resource: Dict[str, Any]) -> str:
+    """Nombre de archivo de un recurso (último tramo del public_id + .jpg)"""
+    return resource.get('public_id', '').split('/')[-1] + '.jpg'
+
+
+def list_folder_images(resources: Callable[..., Dict[str, Any]], folder: str) -> Set[str]:
+    """
+    Lista completa de imágenes de la carpeta.
+
+    Returns:
+        Los archivos (e.g., {'12282863.jpg', '12365363.jpg'})
+    """
+    return {image_filename(resource) for resource in iter_folder_resources(resources, folder)}
+
+
+class CloudinaryImageCatalog:
+    """
+    Caché del conjunto de imágenes disponibles.
+
+    - Dentro del TTL se sirve desde memoria.
+    - Pasado el TTL se sirve el valor anterior y se lanza un refresco en
+      segundo plano (un solo refresco a la vez).
+    - invalidate() descarta el valor: la siguiente petición espera al refresco.
+    - Si un refresco falla se conserva el último conjunto conocido.
+    """
+
+    def __init__(
+        self,
+        fetch_images: Callable[[], Set[str]],
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch_images = fetch_images
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._images: Optional[Set[str]] = None
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._epoch = 0
+        self.version = 0
+        self.refresh_count = 0
+        self.last_error: Optional[str] = None
+
+    def is_fresh(self) -> bool:
+        return self._images is not None and self._clock() - self._fetched_at < self.ttl_seconds
+
+    async def _refresh(self, epoch: int) -> None:
+        try:
+            images = await asyncio.to_thread(self._fetch_images)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Error querying Cloudinary API: {e}")
+            return
+
+        if epoch != self._epoch:
+            # Invalidado durante la consulta: el resultado puede estar desfasado
+            return
+
+        self.refresh_count += 1
+        self.last_error = None
+        self._fetched_at = self._clock()
+        if images != self._images:
+            self._images = images
+            self.version += 1
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Lanza un refresco salvo que ya haya uno en curso"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(self._epoch))
+        return self._refresh_task
+
+    async def get_available_images(self) -> Set[str]:
+        """Conjunto de imágenes disponibles, sin bloquear el event loop"""
+        if self._images is None:
+            await asyncio.shield(self._start_refresh())
+            return self._images if self._images is not None else set()
+
+        if not self.is_fresh():
+            self._start_refresh()
+
+        return self._images
+
+    async def refresh(self) -> Set[str]:
+        """Fuerza un refresco y espera su resultado"""
+        self.invalidate()
+        return await self.get_available_images()
+
+    def invalidate(self) -> None:
+        """Descarta el conjunto en memoria (p. ej. tras subir imágenes nuevas)"""
+        self._images = None
+        self._fetched_at = 0.0
+        self._epoch += 1
+        self._refresh_task = None
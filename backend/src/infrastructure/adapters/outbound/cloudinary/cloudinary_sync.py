@@ -0,0 +1,147 @@
+"""
+Sincronización incremental del catálogo de Cloudinary
+Persiste el último conjunto conocido en SQLite y, en cada refresco, solo pide
+a la Admin API los recursos subidos desde el último created_at visto
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+from infrastructure.adapters.outbound.cloudinary.cloudinary_image_catalog import (
+    image_filename, iter_folder_resources, iter_resources
+)
+
+
+class CloudinarySync:
+    """
+    Mantiene una copia local del listado de la carpeta de Cloudinary.
+
+    - La primera vez (o cada full_sync_interval segundos) se lista la carpeta
+      completa y se reemplaza la instantánea; así se detectan los borrados.
+    - El resto de refrescos piden solo los recursos con created_at >= cursor,
+      ordenados de forma ascendente, y los añaden a la instantánea. La Admin
+      API no admite start_at junto con prefix, así que la carpeta se filtra
+      en local.
+    """
+
+    def __init__(
+        self,
+        resources: Callable[..., Dict[str, Any]],
+        folder: str,
+        snapshot_path: str,
+        full_sync_interval: float = 86400.0,
+    ):
+        self._resources = resources
+        self.folder = folder
+        self.snapshot_path = Path(snapshot_path)
+        self.full_sync_interval = full_sync_interval
+        self._lock = threading.Lock()
+
+        # Métricas de la última sincronización
+        self.last_sync_at: Optional[float] = None
+        self.last_sync_duration: Optional[float] = None
+        self.last_sync_mode: Optional[str] = None
+        self.last_sync_api_calls = 0
+        self.last_sync_new_images = 0
+
+        with self._session() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS images ("
+                "filename TEXT PRIMARY KEY, public_id TEXT NOT NULL, created_at TEXT)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        """Conexión en transacción: commit al salir o rollback si hay error"""
+        conn = sqlite3.connect(self.snapshot_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _get_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_state(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _counting_resources(self) -> Callable[..., Dict[str, Any]]:
+        def resources(**params):
+            self.last_sync_api_calls += 1
+            return self._resources(**params)
+        return resources
+
+    def _store(self, conn: sqlite3.Connection, listing: Iterator[Dict[str, Any]]) -> Optional[str]:
+        """Guarda los recursos de la carpeta y retorna el created_at más reciente"""
+        prefix = self.folder + "/"
+        newest = None
+        before = conn.total_changes
+
+        for resource in listing:
+            public_id = resource.get('public_id', '')
+            if not public_id.startswith(prefix):
+                continue
+            created_at = resource.get('created_at')
+            conn.execute(
+                "INSERT OR IGNORE INTO images (filename, public_id, created_at) VALUES (?, ?, ?)",
+                (image_filename(resource), public_id, created_at)
+            )
+            if created_at and (newest is None or created_at > newest):
+                newest = created_at
+
+        self.last_sync_new_images = conn.total_changes - before
+        return newest
+
+    def sync(self) -> Set[str]:
+        """
+        Sincroniza la instantánea con Cloudinary y retorna el conjunto de imágenes.
+        Si la API falla, la excepción se propaga y la instantánea queda intacta.
+        """
+        with self._lock:
+            started = time.monotonic()
+            self.last_sync_api_calls = 0
+
+            with self._session() as conn:
+                cursor = self._get_state(conn, "last_created_at")
+                last_full = float(self._get_state(conn, "last_full_sync") or 0)
+                full = not cursor or time.time() - last_full >= self.full_sync_interval
+                resources = self._counting_resources()
+
+                if full:
+                    conn.execute("DELETE FROM images")
+                    newest = self._store(conn, iter_folder_resources(resources, self.folder))
+                    self._set_state(conn, "last_full_sync", str(time.time()))
+                else:
+                    newest = self._store(conn, iter_resources(resources, start_at=cursor, direction="asc"))
+
+                if newest is not None and (not cursor or newest > cursor):
+                    self._set_state(conn, "last_created_at", newest)
+
+                images = {row[0] for row in conn.execute("SELECT filename FROM images")}
+
+            self.last_sync_mode = "full" if full else "incremental"
+            self.last_sync_duration = time.monotonic() - started
+            self.last_sync_at = time.time()
+            return images
+
+    def metrics(self) -> Dict[str, Any]:
+        """Métricas de la sincronización (lag = segundos desde la última sincronización correcta)"""
+        return {
+            "last_sync_at": (
+                datetime.fromtimestamp(self.last_sync_at, tz=timezone.utc).isoformat()
+                if self.last_sync_at else None
+            ),
+            "sync_lag_seconds": time.time() - self.last_sync_at if self.last_sync_at else None,
+            "last_sync_duration_seconds": self.last_sync_duration,
+            "last_sync_mode": self.last_sync_mode,
+            "last_sync_api_calls": self.last_sync_api_calls,
+            "last_sync_new_images": self.last_sync_new_images,
+        }
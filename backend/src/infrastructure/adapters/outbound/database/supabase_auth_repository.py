@@ -2,18 +2,36 @@
 Supabase Auth Repository Implementation
 Implementa AuthRepository usando Supabase (Adapter)
 """
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime
-from supabase import Client
+from gotrue import AsyncGoTrueClient
 from domain.entities.user import User
 from domain.repositories.auth_repository import AuthRepository
 
 
+def _parse_timestamp(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """gotrue devuelve datetime en versiones recientes y cadenas ISO en las antiguas"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _to_user(auth_user) -> User:
+    """Convierte el usuario de Supabase en la entidad de dominio"""
+    return User(
+        id=auth_user.id,
+        email=auth_user.email,
+        created_at=_parse_timestamp(auth_user.created_at),
+        last_sign_in_at=_parse_timestamp(auth_user.last_sign_in_at)
+    )
+
+
 class SupabaseAuthRepository(AuthRepository):
     """Implementación del repositorio de autenticación con Supabase"""
     
-    def __init__(self, supabase_client: Client):
-        self.client = supabase_client
+    def __init__(self, auth_client: AsyncGoTrueClient):
+        # Cliente compartido por todas las peticiones: no se usa su sesión guardada
+        self.auth = auth_client
     
     async def login(self, email: str, password: str) -> tuple[User, str]:
         """
@@ -22,7 +40,7 @@ class SupabaseAuthRepository(AuthRepository):
         """
         try:
             # Autenticar con Supabase
-            response = self.client.auth.sign_in_with_password({
+            response = await self.auth.sign_in_with_password({
                 "email": email,
                 "password": password
             })
@@ -31,12 +49,7 @@ class SupabaseAuthRepository(AuthRepository):
                 raise ValueError("Credenciales inválidas")
             
             # Convertir a entidad de dominio
-            user = User(
-                id=response.user.id,
-                email=response.user.email,
-                created_at=datetime.fromisoformat(response.user.created_at.replace('Z', '+00:00')),
-                last_sign_in_at=datetime.fromisoformat(response.user.last_sign_in_at.replace('Z', '+00:00')) if response.user.last_sign_in_at else None
-            )
+            user = _to_user(response.user)
             
             access_token = response.session.access_token
             
@@ -48,7 +61,8 @@ class SupabaseAuthRepository(AuthRepository):
     async def logout(self, access_token: str) -> bool:
         """Cierra sesión del usuario"""
         try:
-            self.client.auth.sign_out()
+            # Revoca la sesión del token recibido, no la del último login del cliente
+            await self.auth.admin.sign_out(access_token)
             return True
         except Exception:
             return False
@@ -56,16 +70,11 @@ class SupabaseAuthRepository(AuthRepository):
     async def get_user_by_token(self, access_token: str) -> Optional[User]:
         """Obtiene usuario por token"""
         try:
-            response = self.client.auth.get_user(access_token)
+            response = await self.auth.get_user(access_token)
             
             if not response.user:
                 return None
             
-            return User(
-                id=response.user.id,
-                email=response.user.email,
-                created_at=datetime.fromisoformat(response.user.created_at.replace('Z', '+00:00')),
-                last_sign_in_at=datetime.fromisoformat(response.user.last_sign_in_at.replace('Z', '+00:00')) if response.user.last_sign_in_at else None
-            )
+            return _to_user(response.user)
         except Exception:
             return None
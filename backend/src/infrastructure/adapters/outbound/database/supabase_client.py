@@ -1,17 +1,30 @@
 """
 Supabase Client - Configuración
-Cliente singleton para Supabase
+Clientes compartidos por el proceso para Supabase
 """
-from supabase import create_client, Client
-from pydantic_settings import BaseSettings
+import threading
 from functools import lru_cache
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException
+from gotrue import AsyncGoTrueClient
+from gotrue.http_clients import AsyncClient as GoTrueHTTPClient
+from postgrest import AsyncPostgrestClient
+from postgrest.utils import AsyncClient as PostgrestHTTPClient
+from pydantic_settings import BaseSettings
 
 
 class SupabaseSettings(BaseSettings):
     """Configuración de Supabase desde variables de entorno"""
     supabase_url: str
     supabase_key: str
-    
+    # Pool HTTP de cada cliente, compartido por todas las peticiones del proceso
+    supabase_max_connections: int = 20
+    supabase_max_keepalive_connections: int = 10
+    supabase_keepalive_expiry: float = 60.0
+    supabase_timeout: float = 30.0
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -23,12 +36,115 @@ def get_supabase_settings() -> SupabaseSettings:
     return SupabaseSettings()
 
 
-def get_supabase_client() -> Client:
+class _PooledPostgrestClient(AsyncPostgrestClient):
+    """Cliente PostgREST cuya sesión HTTP respeta los límites del pool"""
+
+    def __init__(self, base_url: str, *, limits: httpx.Limits, **kwargs):
+        self._limits = limits
+        super().__init__(base_url, **kwargs)
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None) -> PostgrestHTTPClient:
+        return PostgrestHTTPClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            limits=self._limits,
+            follow_redirects=True,
+            http2=True,
+        )
+
+
+class SupabaseClients:
+    """
+    Clientes asíncronos de Supabase del proceso: se crean una vez y todas
+    las peticiones reutilizan sus conexiones HTTP keep-alive. Las consultas
+    se esperan con await, de modo que una consulta lenta no bloquea el event
+    loop ni al resto de peticiones del worker.
+
+    Datos (PostgREST) y autenticación (GoTrue) van en clientes separados:
+    el login guarda la sesión del usuario en el cliente de auth y, con un
+    único cliente compartido, las consultas de datos pasarían a hacerse
+    con el token del último usuario que inició sesión.
+    """
+
+    def __init__(self, settings: SupabaseSettings):
+        url = settings.supabase_url.rstrip('/')
+        headers = {
+            "apiKey": settings.supabase_key,
+            "Authorization": f"Bearer {settings.supabase_key}",
+        }
+        limits = httpx.Limits(
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(settings.supabase_timeout)
+
+        self.data = _PooledPostgrestClient(
+            f"{url}/rest/v1",
+            headers={"Accept": "application/json", "Content-Type": "application/json", **headers},
+            timeout=timeout,
+            limits=limits,
+        )
+        self.auth = AsyncGoTrueClient(
+            url=f"{url}/auth/v1",
+            headers=headers,
+            auto_refresh_token=False,
+            persist_session=False,
+            http_client=GoTrueHTTPClient(timeout=timeout, limits=limits, follow_redirects=True, http2=True),
+        )
+
+    async def close(self) -> None:
+        """Cierra las conexiones de ambos clientes"""
+        await self.data.aclose()
+        await self.auth.close()
+
+
+_clients: Optional[SupabaseClients] = None
+_clients_lock = threading.Lock()
+
+
+def get_supabase_clients() -> SupabaseClients:
+    """
+    Clientes compartidos del proceso; se crean en el primer uso, de modo
+    que la API arranca aunque Supabase no esté configurado
+    """
+    global _clients
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:
+                _clients = SupabaseClients(get_supabase_settings())
+    return _clients
+
+
+async def close_supabase_clients() -> None:
+    """Cierra los clientes compartidos (apagado de la aplicación)"""
+    global _clients
+    with _clients_lock:
+        clients, _clients = _clients, None
+    if clients is not None:
+        await clients.close()
+
+
+def _get_supabase_clients_or_http_error() -> SupabaseClients:
     """
-    Crea y retorna cliente de Supabase
-    
-    Returns:
-        Client: Cliente de Supabase configurado
+    Clientes compartidos para las dependencias FastAPI: si falta la
+    configuración de Supabase responde 500 con el motivo, como hacían las
+    rutas al crear el cliente dentro de su try
     """
-    settings = get_supabase_settings()
-    return create_client(settings.supabase_url, settings.supabase_key)
+    try:
+        return get_supabase_clients()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def get_supabase_data_client() -> AsyncPostgrestClient:
+    """Dependencia FastAPI: cliente PostgREST compartido"""
+    return _get_supabase_clients_or_http_error().data
+
+
+def get_supabase_auth_client() -> AsyncGoTrueClient:
+    """Dependencia FastAPI: cliente de autenticación compartido"""
+    return _get_supabase_clients_or_http_error().auth
@@ -0,0 +1,128 @@
+"""
+Índices secundarios por carril y momento de captura
+Los nombres de imagen codifican ambos datos, p. ej.
+MD7193_lane1_97_20221102_145250.jpg -> carril 1, 2022-11-02 14:52:50
+"""
+import re
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CAPTURE_PATTERN = re.compile(r'_lane(\d+)_\d+_(\d{8})_(\d{6})(?:_|\.|$)')
+
+# Los ids (fila del almacén u offset del índice binario) ocupan los bits bajos de la clave de ordenación
+_ID_BITS = 48
+
+
+def parse_capture(image_name: str) -> Optional[Tuple[int, int]]:
+    """
+    Extrae (carril, momento) del nombre de imagen o None si no sigue el
+    formato o la fecha no existe (p. ej. mes 13 o 99:99:99).
+    El momento es el entero YYYYMMDDHHMMSS, que ordena igual que la fecha.
+    """
+    match = CAPTURE_PATTERN.search(image_name)
+    if match is None:
+        return None
+    lane, date, time = match.groups()
+    try:
+        datetime(int(date[:4]), int(date[4:6]), int(date[6:]), int(time[:2]), int(time[2:4]), int(time[4:]))
+    except ValueError:
+        return None
+    return int(lane), int(date + time)
+
+
+def timestamp_key(moment: datetime) -> int:
+    """Convierte una fecha al entero YYYYMMDDHHMMSS usado en el índice"""
+    return int(moment.strftime('%Y%m%d%H%M%S'))
+
+
+def key_to_datetime(key: int) -> datetime:
+    """Inversa de timestamp_key"""
+    return datetime.strptime(str(key), '%Y%m%d%H%M%S')
+
+
+class _SortedCaptures:
+    """Momentos ordenados y el id de cada registro en arrays paralelos"""
+
+    __slots__ = ('timestamps', 'ids')
+
+    def __init__(self, keys: List[int]):
+        keys.sort()
+        mask = (1 << _ID_BITS) - 1
+        self.timestamps = array('q', (key >> _ID_BITS for key in keys))
+        self.ids = array('q', (key & mask for key in keys))
+
+    def position_after(self, timestamp: int, record_id: int) -> int:
+        """Posición siguiente al registro (timestamp, id) en el orden del índice"""
+        low = bisect_left(self.timestamps, timestamp)
+        high = bisect_left(self.timestamps, timestamp + 1, low)
+        return bisect_left(self.ids, record_id + 1, low, high)
+
+
+class CaptureIndex:
+    """
+    Índices carril -> momentos ordenados -> registros, más uno global para
+    consultas sin carril. Las consultas por rango son O(log n + k).
+    """
+
+    def __init__(self, by_lane: Dict[int, _SortedCaptures], all_lanes: _SortedCaptures):
+        self._by_lane = by_lane
+        self._all = all_lanes
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[int, str]]) -> 'CaptureIndex':
+        """
+        Construye los índices a partir de pares (id, imagen) en cualquier orden.
+        Las imágenes cuyo nombre no sigue el formato se ignoran.
+        """
+        by_lane: Dict[int, List[int]] = {}
+        all_keys: List[int] = []
+
+        for record_id, image_name in entries:
+            capture = parse_capture(image_name)
+            if capture is None:
+                continue
+            lane, timestamp = capture
+            key = (timestamp << _ID_BITS) | record_id
+            by_lane.setdefault(lane, []).append(key)
+            all_keys.append(key)
+
+        return cls(
+            {lane: _SortedCaptures(keys) for lane, keys in by_lane.items()},
+            _SortedCaptures(all_keys)
+        )
+
+    @property
+    def lanes(self) -> List[int]:
+        return sorted(self._by_lane)
+
+    def __len__(self) -> int:
+        return len(self._all.ids)
+
+    def query(
+        self,
+        lane: Optional[int] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        limit: int = 100,
+    ) -> List[int]:
+        """
+        Ids de los registros del carril (o de todos) capturados en [start, end),
+        en orden de captura.
+
+        Args:
+            after: (momento, id) del último registro ya devuelto (paginación)
+        """
+        captures = self._all if lane is None else self._by_lane.get(lane)
+        if captures is None:
+            return []
+
+        timestamps = captures.timestamps
+        first = 0 if start is None else bisect_left(timestamps, start)
+        if after is not None:
+            first = max(first, captures.position_after(*after))
+        last = len(timestamps) if end is None else bisect_left(timestamps, end, first)
+
+        return list(captures.ids[first:min(last, first + limit)])
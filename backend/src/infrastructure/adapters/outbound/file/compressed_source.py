@@ -0,0 +1,71 @@
+"""
+Apertura de plates.dat comprimido o sin comprimir
+Detecta el formato por los bytes mágicos y descomprime en streaming
+con lecturas de bloque grandes
+"""
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
+
+try:
+    import zstandard
+except ImportError:  # dependencia opcional
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # dependencia opcional
+    lz4_frame = None
+
+READ_BUFFER_SIZE = 1 << 20
+
+MAGIC_NUMBERS = {
+    b'\x1f\x8b': 'gzip',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+    b'\x04\x22\x4d\x18': 'lz4',
+}
+
+
+def detect_compression(path: Path) -> Optional[str]:
+    """Retorna el formato de compresión del fichero o None si es texto plano"""
+    with open(path, 'rb') as file:
+        head = file.read(6)
+
+    for magic, name in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_binary(path: Path) -> BinaryIO:
+    """Abre el fichero en binario, descomprimiendo en streaming si hace falta"""
+    compression = detect_compression(path)
+
+    if compression is None:
+        return open(path, 'rb', buffering=READ_BUFFER_SIZE)
+    if compression == 'gzip':
+        raw = gzip.open(path, 'rb')
+    elif compression == 'bz2':
+        raw = bz2.open(path, 'rb')
+    elif compression == 'xz':
+        raw = lzma.open(path, 'rb')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Se requiere el paquete 'zstandard' para leer ficheros .zst")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    else:
+        if lz4_frame is None:
+            raise ValueError("Se requiere el paquete 'lz4' para leer ficheros .lz4")
+        raw = lz4_frame.open(path, 'rb')
+
+    return io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+
+
+def open_text(path: Path) -> TextIO:
+    """Abre el fichero como texto UTF-8, comprimido o no"""
+    return io.TextIOWrapper(open_binary(path), encoding='utf-8')
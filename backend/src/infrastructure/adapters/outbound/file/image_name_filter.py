@@ -0,0 +1,155 @@
+"""
+Filtro de Bloom con los nombres de imagen de plates.dat
+Responde "seguro que no existe" sin consultar el repositorio; un positivo
+puede ser falso y se confirma con la consulta real. Se guarda en un fichero
+junto a plates.dat y se abre con mmap, de modo que todos los workers
+comparten las mismas páginas
+"""
+import hashlib
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from infrastructure.adapters.outbound.file.compressed_source import open_text
+from infrastructure.adapters.outbound.file.sidecar_file import (
+    HEADER_PREFIX, is_sidecar_stale, source_signature, write_atomically
+)
+
+FILTER_MAGIC = b'PLTBLOOM'
+FILTER_VERSION = 1
+
+# magic, versión, tamaño origen, mtime_ns origen, nº claves, nº bits, nº funciones hash, digest origen
+HEADER = struct.Struct(HEADER_PREFIX + 'QQQ32s')
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom con doble hashing sobre un digest blake2b de 128 bits
+    (estable entre procesos, a diferencia de hash()).
+    """
+
+    def __init__(self, bits: Union[bytearray, memoryview], num_bits: int, num_hashes: int, num_keys: int = 0):
+        self._bits = bits
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.num_keys = num_keys
+
+    @classmethod
+    def with_capacity(cls, capacity: int, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE) -> 'BloomFilter':
+        """Filtro dimensionado para `capacity` claves con la tasa de falsos positivos indicada"""
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("La tasa de falsos positivos debe estar entre 0 y 1")
+        capacity = max(1, capacity)
+        num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(bytearray((num_bits + 7) // 8), num_bits, num_hashes)
+
+    @staticmethod
+    def _hashes(name: str) -> Tuple[int, int]:
+        """Posición inicial y salto (impar) del doble hashing"""
+        digest = hashlib.blake2b(name.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def add(self, name: str) -> None:
+        position, step = self._hashes(name)
+        bits = self._bits
+        num_bits = self.num_bits
+        for _ in range(self.num_hashes):
+            bit = position % num_bits
+            bits[bit >> 3] |= 1 << (bit & 7)
+            position += step
+        self.num_keys += 1
+
+    def __contains__(self, name: str) -> bool:
+        """False: el nombre seguro que no está. True: probablemente está"""
+        position, step = self._hashes(name)
+        bits = self._bits
+        num_bits = self.num_bits
+        for _ in range(self.num_hashes):
+            bit = position % num_bits
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+            position += step
+        return True
+
+    def contains_many(self, names: Iterable[str]) -> List[bool]:
+        return [name in self for name in names]
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def expected_false_positive_rate(self) -> float:
+        """Tasa teórica de falsos positivos con las claves añadidas"""
+        return (1 - math.exp(-self.num_hashes * self.num_keys / self.num_bits)) ** self.num_hashes
+
+
+class MappedBloomFilter(BloomFilter):
+    """Filtro abierto desde fichero con mmap (solo lectura)"""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, self.source_size, self.source_mtime_ns, num_keys, num_bits, num_hashes, _ = HEADER.unpack_from(self._mm, 0)
+        super().__init__(memoryview(self._mm)[HEADER.size:], num_bits, num_hashes, num_keys)
+
+    def close(self) -> None:
+        self._bits.release()
+        self._mm.close()
+
+
+def iter_image_names(plates_dat_path: Union[str, Path]) -> Iterable[str]:
+    """Primer campo de cada línea no vacía, sin parsear el resto"""
+    with open_text(Path(plates_dat_path)) as file:
+        for line in file:
+            name = line.split(None, 1)[0] if line.strip() else None
+            if name:
+                yield name
+
+
+def build_name_filter(
+    plates_dat_path: str, filter_path: str, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE
+) -> BloomFilter:
+    """
+    Construye el filtro con todos los nombres de imagen de plates.dat (las
+    líneas inválidas solo pueden añadir falsos positivos) y lo escribe de
+    forma atómica (temporal + rename)
+    """
+    source = Path(plates_dat_path)
+    size, mtime_ns, digest = source_signature(source)
+
+    capacity = sum(1 for _ in iter_image_names(source))
+    bloom = BloomFilter.with_capacity(capacity, false_positive_rate)
+    for name in iter_image_names(source):
+        bloom.add(name)
+
+    def write(out) -> None:
+        out.write(HEADER.pack(
+            FILTER_MAGIC, FILTER_VERSION, size, mtime_ns, bloom.num_keys, bloom.num_bits, bloom.num_hashes, digest
+        ))
+        out.write(bloom._bits)
+
+    write_atomically(Path(filter_path), write)
+
+    return bloom
+
+
+def is_filter_stale(plates_dat_path: str, filter_path: str) -> bool:
+    """Mismo criterio que el índice binario (ver is_sidecar_stale)"""
+    return is_sidecar_stale(Path(plates_dat_path), Path(filter_path), HEADER, FILTER_MAGIC, FILTER_VERSION)
+
+
+def open_name_filter(
+    plates_dat_path: str, filter_path: Optional[str] = None,
+    false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE
+) -> MappedBloomFilter:
+    """Abre el filtro compartido de plates.dat, construyéndolo si falta o está desactualizado"""
+    if filter_path is None:
+        filter_path = str(Path(plates_dat_path).with_name(Path(plates_dat_path).name + '.bloom'))
+    if is_filter_stale(plates_dat_path, filter_path):
+        build_name_filter(plates_dat_path, filter_path, false_positive_rate)
+    return MappedBloomFilter(Path(filter_path))
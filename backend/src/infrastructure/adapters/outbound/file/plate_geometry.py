@@ -0,0 +1,177 @@
+"""
+Geometría de matrículas calculada en bloque con NumPy
+Una pasada vectorizada sobre las columnas del almacén (coordenadas, cajas de
+caracteres) obtiene las medidas de todas las filas a la vez; las consultas
+por geometría son máscaras sobre esas columnas
+"""
+from typing import Optional
+
+import numpy as np
+
+from domain.entities.plate import GeometryFilter, PlateGeometry
+
+
+class PlateGeometryTable:
+    """
+    Medidas de PlateGeometry por fila en arrays paralelos.
+
+    owners indica, para cada fila, la fila (u offset) de la matrícula
+    principal de su imagen, o -1 si la fila ya no está vigente (imagen
+    reemplazada). Es creciente en orden de fichero, lo que permite paginar
+    por cursor.
+    """
+
+    def __init__(
+        self,
+        area: np.ndarray,
+        skew_angle: np.ndarray,
+        aspect_ratio: np.ndarray,
+        bounding_box: np.ndarray,
+        overlapping_chars: np.ndarray,
+        char_spacing_mean: np.ndarray,
+        char_spacing_std: np.ndarray,
+        owners: np.ndarray,
+    ):
+        self.area = area
+        self.skew_angle = skew_angle
+        self.aspect_ratio = aspect_ratio
+        self.bounding_box = bounding_box
+        self.overlapping_chars = overlapping_chars
+        self.char_spacing_mean = char_spacing_mean
+        self.char_spacing_std = char_spacing_std
+        self.owners = owners
+
+    @classmethod
+    def compute(
+        cls,
+        coordinates: np.ndarray,
+        char_boxes: np.ndarray,
+        char_offsets: np.ndarray,
+        owners: np.ndarray,
+    ) -> 'PlateGeometryTable':
+        """
+        Calcula la geometría de n filas.
+
+        Args:
+            coordinates: (n, 8) esquinas x, y en el orden de PlateCoordinates
+            char_boxes: (m, 4) left, top, width, height de todos los caracteres
+            char_offsets: (n + 1) inicio de los caracteres de cada fila
+            owners: (n) fila principal de cada fila, -1 si no está vigente
+        """
+        corners = coordinates.reshape(-1, 4, 2).astype(np.float64)
+        xs, ys = corners[:, :, 0], corners[:, :, 1]
+        num_rows = len(corners)
+
+        # Área de Gauss: suma de productos cruzados de esquinas consecutivas
+        next_xs, next_ys = np.roll(xs, -1, axis=1), np.roll(ys, -1, axis=1)
+        area = 0.5 * np.abs((xs * next_ys - next_xs * ys).sum(axis=1))
+
+        # Inclinación media de los bordes superior (0 -> 1) e inferior (3 -> 2)
+        skew = np.degrees(np.arctan2(
+            (ys[:, 1] - ys[:, 0]) + (ys[:, 2] - ys[:, 3]),
+            (xs[:, 1] - xs[:, 0]) + (xs[:, 2] - xs[:, 3])
+        ))
+        width = np.hypot(xs[:, 1] - xs[:, 0], ys[:, 1] - ys[:, 0]) + np.hypot(xs[:, 2] - xs[:, 3], ys[:, 2] - ys[:, 3])
+        height = np.hypot(xs[:, 3] - xs[:, 0], ys[:, 3] - ys[:, 0]) + np.hypot(xs[:, 2] - xs[:, 1], ys[:, 2] - ys[:, 1])
+        aspect = np.divide(width, height, out=np.zeros(num_rows), where=height != 0)
+
+        bounding_box = np.concatenate((xs.min(axis=1, keepdims=True), ys.min(axis=1, keepdims=True),
+                                       xs.max(axis=1, keepdims=True), ys.max(axis=1, keepdims=True)), axis=1)
+
+        # Caracteres ordenados por fila y, dentro de cada fila, por left
+        counts = np.diff(char_offsets.astype(np.int64))
+        char_rows = np.repeat(np.arange(num_rows), counts)
+        boxes = char_boxes.reshape(-1, 4)
+        same_row = char_rows[1:] == char_rows[:-1]
+        if np.any(same_row & (boxes[1:, 0] < boxes[:-1, 0])):
+            # plates.dat no garantiza el orden de los caracteres: solo se ordena si hace falta
+            order = np.lexsort((boxes[:, 0], char_rows))
+            char_rows, boxes = char_rows[order], boxes[order]
+        left, top, box_width, box_height = boxes.T
+
+        # Pares de caracteres consecutivos de la misma fila
+        pair_rows = char_rows[:-1][same_row]
+        gaps = (left[1:] - (left[:-1] + box_width[:-1]))[same_row]
+        vertical = ((top[1:] < top[:-1] + box_height[:-1]) & (top[:-1] < top[1:] + box_height[1:]))[same_row]
+
+        overlapping = np.bincount(pair_rows[(gaps < 0) & vertical], minlength=num_rows)
+        pairs = np.bincount(pair_rows, minlength=num_rows)
+        gap_sum = np.bincount(pair_rows, weights=gaps, minlength=num_rows)
+        gap_squares = np.bincount(pair_rows, weights=gaps * gaps, minlength=num_rows)
+
+        has_pairs = pairs > 0
+        mean = np.divide(gap_sum, pairs, out=np.zeros(num_rows), where=has_pairs)
+        variance = np.divide(gap_squares, pairs, out=np.zeros(num_rows), where=has_pairs) - mean * mean
+        std = np.sqrt(np.maximum(variance, 0.0))
+
+        return cls(
+            area=area,
+            skew_angle=skew,
+            aspect_ratio=aspect,
+            bounding_box=bounding_box.astype(np.int64),
+            overlapping_chars=overlapping.astype(np.int32),
+            char_spacing_mean=mean,
+            char_spacing_std=std,
+            owners=owners.astype(np.int64),
+        )
+
+    @classmethod
+    def from_store(cls, store) -> 'PlateGeometryTable':
+        """Geometría de todas las filas de un PlatesColumnarStore"""
+        live = np.fromiter(store.live_rows(), dtype=np.int64, count=len(store))
+        owners = np.full(len(store.image_names), -1, dtype=np.int64)
+        owners[live] = live
+        for first, size in store.plate_groups.items():
+            if owners[first] == first:
+                owners[first + 1:first + size] = first
+
+        # np.array copia los buffers: el almacén puede seguir creciendo
+        return cls.compute(
+            np.array(store.coordinates, dtype=np.int64),
+            np.array(store.char_boxes, dtype=np.float64),
+            np.array(store.char_offsets, dtype=np.int64),
+            owners,
+        )
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    def get(self, row: int) -> PlateGeometry:
+        """Geometría de una fila como entidad del dominio"""
+        return PlateGeometry(
+            area=float(self.area[row]),
+            skew_angle=float(self.skew_angle[row]),
+            aspect_ratio=float(self.aspect_ratio[row]),
+            bounding_box=tuple(int(v) for v in self.bounding_box[row]),
+            overlapping_chars=int(self.overlapping_chars[row]),
+            char_spacing_mean=float(self.char_spacing_mean[row]),
+            char_spacing_std=float(self.char_spacing_std[row])
+        )
+
+    def select(self, criteria: GeometryFilter, after: Optional[int] = None, limit: int = 100) -> np.ndarray:
+        """
+        Filas principales (u offsets) de las imágenes con alguna matrícula que
+        cumple el filtro, en orden de fichero.
+
+        Args:
+            after: fila principal de la última imagen ya devuelta (paginación)
+        """
+        mask = self.owners > (-1 if after is None else after)
+        columns = {
+            'skew': np.abs(self.skew_angle),
+            'area': self.area,
+            'aspect_ratio': self.aspect_ratio,
+        }
+        for name, low, high in criteria.ranges():
+            if low is not None:
+                mask &= columns[name] >= low
+            if high is not None:
+                mask &= columns[name] <= high
+        if criteria.overlapping is not None:
+            mask &= (self.overlapping_chars > 0) == criteria.overlapping
+
+        owners = self.owners[mask]
+        if len(owners) > 1:
+            # Las filas de una imagen son consecutivas: basta con quitar repetidos contiguos
+            owners = owners[np.concatenate(([True], owners[1:] != owners[:-1]))]
+        return owners[:limit]
@@ -0,0 +1,163 @@
+"""
+Índice de búsqueda por número de matrícula
+Búsqueda exacta, por prefijo y aproximada (distancia de edición 1 o 2)
+tolerante a las confusiones típicas del OCR (0/O, 1/I, 8/B)
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from domain.entities.plate import PlateMatch
+
+# Caracteres que el OCR confunde: se normalizan al mismo símbolo canónico
+OCR_CONFUSIONS = str.maketrans({'O': '0', 'I': '1', 'B': '8'})
+
+MAX_DISTANCE = 2
+
+# Un solo valor o varios: la mayoría de matrículas aparece en una única imagen
+_Bucket = Union[str, List[str]]
+
+
+def canonical_plate(plate_number: str) -> str:
+    """Forma canónica: mayúsculas y símbolos confundibles unificados"""
+    return plate_number.strip().upper().translate(OCR_CONFUSIONS)
+
+
+def _bucket_add(buckets: Dict[str, _Bucket], key: str, value: str) -> None:
+    current = buckets.get(key)
+    if current is None:
+        buckets[key] = value
+    elif isinstance(current, list):
+        if value not in current:
+            current.append(value)
+    elif current != value:
+        buckets[key] = [current, value]
+
+
+def _bucket_values(bucket: Optional[_Bucket]) -> List[str]:
+    if bucket is None:
+        return []
+    return list(bucket) if isinstance(bucket, list) else [bucket]
+
+
+class PlateSearchIndex:
+    """
+    Índice en memoria matrícula -> imágenes.
+
+    Las claves se guardan en forma canónica, de modo que una sustitución
+    confundible (MD7I93J frente a MD7193J) cuesta 0. Las búsquedas aproximadas
+    generan los vecinos de edición de la consulta sobre el alfabeto de los
+    datos y los buscan en el diccionario: no requiere índices de borrados,
+    cuya memoria crecería con la longitud de cada matrícula.
+    """
+
+    def __init__(self):
+        self._images: Dict[str, _Bucket] = {}        # matrícula -> imágenes
+        self._by_canonical: Dict[str, _Bucket] = {}  # forma canónica -> matrículas
+        self._alphabet: Set[str] = set()
+        self._sorted_keys: Optional[List[str]] = None
+        self._sort_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str]]) -> 'PlateSearchIndex':
+        """Construye el índice a partir de pares (matrícula, imagen)"""
+        index = cls()
+        for plate_number, image_name in entries:
+            index.add(plate_number, image_name)
+        index._sorted_keys = sorted(index._by_canonical)
+        return index
+
+    def add(self, plate_number: str, image_name: str) -> None:
+        """Añade una imagen a la matrícula indicada"""
+        canonical = canonical_plate(plate_number)
+        if canonical == plate_number:
+            canonical = plate_number  # reutilizar la cadena (ya internada en el almacén)
+
+        if plate_number not in self._images:
+            _bucket_add(self._by_canonical, canonical, plate_number)
+            self._alphabet.update(canonical)
+            self._sorted_keys = None
+        _bucket_add(self._images, plate_number, image_name)
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def _matches(self, canonical: str, distance: int) -> List[PlateMatch]:
+        return [
+            PlateMatch(plate_number=plate, distance=distance, image_names=_bucket_values(self._images[plate]))
+            for plate in _bucket_values(self._by_canonical.get(canonical))
+        ]
+
+    def exact(self, query: str) -> List[PlateMatch]:
+        """Matrículas iguales a la consulta salvo confusiones del OCR"""
+        return self._matches(canonical_plate(query), 0)
+
+    def prefix(self, query: str, limit: int = 50) -> List[PlateMatch]:
+        """Matrículas que empiezan por la consulta, en orden alfabético"""
+        # Tras add() la lista ordenada se invalida y se rehace en la siguiente consulta
+        if self._sorted_keys is None:
+            with self._sort_lock:
+                if self._sorted_keys is None:
+                    self._sorted_keys = sorted(self._by_canonical)
+        keys = self._sorted_keys
+
+        prefix = canonical_plate(query)
+        results: List[PlateMatch] = []
+        position = bisect_left(keys, prefix)
+
+        while position < len(keys) and keys[position].startswith(prefix) and len(results) < limit:
+            results.extend(self._matches(keys[position], 0))
+            position += 1
+
+        return results[:limit]
+
+    def _edits(self, word: str) -> Set[str]:
+        """Cadenas a distancia de edición 1 (borrado, sustitución, inserción)"""
+        alphabet = self._alphabet
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        edits = {left + right[1:] for left, right in splits if right}
+        edits.update(left + char + right[1:] for left, right in splits if right for char in alphabet)
+        edits.update(left + char + right for left, right in splits for char in alphabet)
+        edits.discard(word)
+        return edits
+
+    def fuzzy(self, query: str, max_distance: int = 1, limit: int = 50) -> List[PlateMatch]:
+        """
+        Matrículas a distancia de edición <= max_distance (1 o 2) de la
+        consulta, ordenadas por distancia y después alfabéticamente
+        """
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            raise ValueError(f"La distancia máxima debe estar entre 0 y {MAX_DISTANCE}")
+
+        canonical = canonical_plate(query)
+        distances = {canonical: 0} if canonical in self._by_canonical else {}
+
+        if max_distance >= 1:
+            neighbours = self._edits(canonical)
+            for candidate in neighbours:
+                if candidate in self._by_canonical:
+                    distances.setdefault(candidate, 1)
+
+            if max_distance >= 2:
+                by_canonical = self._by_canonical
+                for neighbour in neighbours:
+                    for candidate in self._edits(neighbour):
+                        if candidate in by_canonical and candidate not in distances:
+                            distances[candidate] = 2
+
+        results: List[PlateMatch] = []
+        for key in sorted(distances, key=lambda k: (distances[k], k)):
+            results.extend(self._matches(key, distances[key]))
+            if len(results) >= limit:
+                break
+
+        return results[:limit]
+
+    def search(self, query: str, mode: str = "fuzzy", max_distance: int = 1, limit: int = 50) -> List[PlateMatch]:
+        """Punto de entrada común: mode es 'exact', 'prefix' o 'fuzzy'"""
+        if mode == "exact":
+            return self.exact(query)[:limit]
+        if mode == "prefix":
+            return self.prefix(query, limit)
+        if mode == "fuzzy":
+            return self.fuzzy(query, max_distance, limit)
+        raise ValueError(f"Modo de búsqueda inválido: {mode}")
@@ -0,0 +1,159 @@
+"""
+Estadísticas agregadas del conjunto de matrículas
+Se calculan una vez por carga y se actualizan con las filas añadidas en cada
+append, de modo que servirlas no depende del tamaño del conjunto
+"""
+import operator
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from domain.entities.plate import Character
+from infrastructure.adapters.outbound.file.capture_index import parse_capture
+
+
+class PlateStatistics:
+    """
+    Contadores del conjunto vigente: imágenes, matrículas (incluidas las
+    adicionales), matrículas inválidas, frecuencia de caracteres, histograma
+    de longitudes e imágenes por carril y por día de captura.
+
+    Todas las operaciones son sumas y restas de contadores: una imagen
+    reemplazada en un append resta su contribución y la nueva la suma.
+    """
+
+    def __init__(self):
+        self.images = 0
+        self.plates = 0
+        self.invalid_plates = 0
+        self.char_frequency: Counter = Counter()
+        self.length_histogram: Counter = Counter()
+        self.images_per_lane: Counter = Counter()
+        self.images_per_day: Counter = Counter()  # clave YYYYMMDD
+        self._snapshot: Optional[Dict] = None
+
+    @classmethod
+    def from_store(cls, store) -> 'PlateStatistics':
+        """
+        Estadísticas de un PlatesColumnarStore. Los contadores se calculan
+        sobre todas las filas con Counter/map (en C) y después se restan las
+        filas reemplazadas, que suelen ser pocas.
+        """
+        stats = cls()
+        num_rows = len(store.image_names)
+        offsets = store.char_offsets
+
+        stats.images = len(store)
+        stats.plates = num_rows
+        stats.invalid_plates = len(store.invalid_chars)
+        stats.char_frequency = Counter(store.chars)
+        stats.length_histogram = Counter(map(operator.sub, offsets[1:], offsets[:-1]))
+
+        # Filas reemplazadas por una línea posterior de la misma imagen
+        additional = sum(
+            size - 1 for row, size in store.plate_groups.items()
+            if store.row_of(store.image_names[row]) == row
+        )
+        if len(store) + additional != num_rows:
+            live = set()
+            for row in store.live_rows():
+                live.update(store.image_rows(row))
+            for row in range(num_rows):
+                if row not in live:
+                    stats._count_row(store, row, -1)
+
+        for row in store.live_rows():
+            stats._count_capture(store.image_names[row], 1)
+        return stats
+
+    def copy(self) -> 'PlateStatistics':
+        clone = PlateStatistics()
+        clone.images = self.images
+        clone.plates = self.plates
+        clone.invalid_plates = self.invalid_plates
+        clone.char_frequency = Counter(self.char_frequency)
+        clone.length_histogram = Counter(self.length_histogram)
+        clone.images_per_lane = Counter(self.images_per_lane)
+        clone.images_per_day = Counter(self.images_per_day)
+        return clone
+
+    def _count_row(self, store, row: int, sign: int) -> None:
+        """Suma (sign=1) o resta (sign=-1) una fila de matrícula, sin contar la imagen"""
+        chars = store.chars[store.char_offsets[row]:store.char_offsets[row + 1]]
+        self.plates += sign
+        self.invalid_plates += sign if row in store.invalid_chars else 0
+        self.length_histogram[len(chars)] += sign
+        for char in chars:
+            self.char_frequency[char] += sign
+
+    def _count_capture(self, image_name: str, sign: int) -> None:
+        capture = parse_capture(image_name)
+        if capture is not None:
+            lane, timestamp = capture
+            self.images_per_lane[lane] += sign
+            self.images_per_day[timestamp // 1_000_000] += sign
+
+    def _count_image(self, store, row: int, sign: int) -> None:
+        """Suma o resta una imagen vigente con todas sus matrículas"""
+        self.images += sign
+        self._count_capture(store.image_names[row], sign)
+        for plate_row in store.image_rows(row):
+            self._count_row(store, plate_row, sign)
+
+    def after_append(self, previous, store, first_new_row: int) -> 'PlateStatistics':
+        """
+        Estadísticas tras añadir a previous las filas desde first_new_row
+        (store = previous ampliado). Coste proporcional a las filas añadidas.
+        """
+        updated = self.copy()
+        names = store.image_names
+
+        replaced = set()
+        for row in range(first_new_row, len(names)):
+            old_row = previous.row_of(names[row])
+            if old_row is not None and old_row not in replaced:
+                replaced.add(old_row)
+                updated._count_image(previous, old_row, -1)
+
+        for row in store.rows(first_new_row - 1):
+            updated._count_image(store, row, 1)
+        return updated
+
+    def snapshot(self) -> Dict:
+        """Agregados serializables; se calculan una vez por objeto (los contadores no cambian después)"""
+        if self._snapshot is None:
+            self._snapshot = {
+                "images": self.images,
+                "plates": self.plates,
+                "invalid_plates": self.invalid_plates,
+                "invalid_rate": self.invalid_plates / self.plates if self.plates else 0.0,
+                "char_frequency": _positive(sorted(self.char_frequency.items())),
+                "length_histogram": _positive(sorted(self.length_histogram.items())),
+                "images_per_lane": _positive(sorted(self.images_per_lane.items())),
+                "images_per_day": {
+                    f"{day // 10000:04d}-{day // 100 % 100:02d}-{day % 100:02d}": count
+                    for day, count in sorted(self.images_per_day.items()) if count > 0
+                },
+            }
+        return self._snapshot
+
+
+def _positive(items: Iterable) -> Dict:
+    return {str(key): count for key, count in items if count > 0}
+
+
+def statistics_from_plates(image_plates: Iterable) -> PlateStatistics:
+    """
+    Estadísticas recorriendo entidades Plate (repositorios sin almacén
+    columnar); cada elemento es la matrícula principal de una imagen
+    """
+    stats = PlateStatistics()
+    for image in image_plates:
+        stats.images += 1
+        stats._count_capture(image.image_name, 1)
+        for plate in image.all_plates:
+            chars = [c.char for c in plate.characters]
+            stats.plates += 1
+            stats.invalid_plates += 0 if all(Character.is_valid_char(c) for c in chars) else 1
+            stats.length_histogram[len(chars)] += 1
+            stats.char_frequency.update(chars)
+    return stats
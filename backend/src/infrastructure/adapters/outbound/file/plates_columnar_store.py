@@ -0,0 +1,250 @@
+"""
+Almacén columnar en memoria para los datos de plates.dat
+Guarda coordenadas y cajas de caracteres en buffers contiguos (array)
+y solo materializa entidades Plate cuando se solicitan
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from domain.entities.plate import Plate, Character, PlateCoordinates
+
+
+class PlatesColumnarStore:
+    """
+    Almacén columnar de matrículas.
+
+    Cada línea de plates.dat ocupa una fila. Los datos numéricos viven en
+    arrays contiguos y los textos en listas con cadenas internadas, de modo
+    que la memoria crece con el tamaño de los datos y no con el número de
+    objetos Python.
+
+    La validez de los caracteres se evalúa al añadir cada fila: solo las
+    filas inválidas guardan sus caracteres incorrectos (suelen ser pocas) y
+    la matrícula ya se almacena ordenada de izquierda a derecha, así que las
+    consultas no vuelven a validar ni a ordenar.
+
+    Una imagen con varias matrículas ocupa filas consecutivas: el índice
+    apunta a la primera (la principal) y plate_groups guarda cuántas filas
+    tiene el grupo, solo para esas imágenes.
+    """
+
+    COORDS_PER_ROW = 8
+    VALUES_PER_CHAR = 4
+
+    def __init__(self):
+        self.image_names: List[str] = []
+        self.plate_numbers: List[str] = []
+        self.num_plates = array('H')
+        self.coordinates = array('i')         # 8 valores por fila
+        self.char_offsets = array('I', [0])   # inicio de los caracteres de cada fila
+        self.chars: List[str] = []
+        self.char_boxes = array('d')          # left, top, width, height por carácter
+        self.invalid_chars: Dict[int, Tuple[str, ...]] = {}  # solo filas inválidas
+        self.plate_groups: Dict[int, int] = {}               # primera fila -> nº de filas (solo multi-matrícula)
+        self._index: Dict[str, int] = {}
+        self._strings: Dict[str, str] = {}
+        self._char_validity: Dict[str, bool] = {}
+
+    def __getstate__(self):
+        # La tabla de internado no viaja entre procesos; extend() vuelve a internar
+        state = self.__dict__.copy()
+        state['_strings'] = {}
+        state['_char_validity'] = {}
+        return state
+
+    def _intern(self, value: str) -> str:
+        """Devuelve la instancia compartida de una cadena repetida"""
+        return self._strings.setdefault(value, value)
+
+    def _is_valid_char(self, char: str) -> bool:
+        """Validez del carácter, evaluada una sola vez por carácter distinto"""
+        valid = self._char_validity.get(char)
+        if valid is None:
+            valid = self._char_validity[char] = Character.is_valid_char(char)
+        return valid
+
+    def _prepare(
+        self,
+        image_name: str,
+        num_plates: int,
+        coordinates: Sequence[int],
+        chars: Sequence[str],
+        boxes: Sequence[float],
+        plate_number: str,
+    ) -> Tuple:
+        """
+        Valida una fila y convierte sus valores numéricos sin tocar el
+        almacén: si algo falla, las columnas siguen alineadas.
+        """
+        if len(coordinates) != self.COORDS_PER_ROW:
+            raise ValueError(f"Se esperan 8 coordenadas, se recibieron {len(coordinates)}")
+        if len(boxes) != len(chars) * self.VALUES_PER_CHAR:
+            raise ValueError(f"Cajas de caracteres incompletas en: {image_name}")
+
+        typed_plates = array('H', [num_plates])
+        typed_coords = array('i', coordinates)
+        typed_boxes = array('d', boxes)
+        return image_name, typed_plates, typed_coords, chars, typed_boxes, plate_number
+
+    def _write(self, image_name, typed_plates, typed_coords, chars, typed_boxes, plate_number) -> int:
+        """Añade una fila ya validada por _prepare (no puede fallar a medias)"""
+        row = len(self.image_names)
+        invalid = tuple(c for c in chars if not self._is_valid_char(c))
+
+        self.image_names.append(image_name)
+        self.plate_numbers.append(self._intern(plate_number))
+        self.num_plates.extend(typed_plates)
+        self.coordinates.extend(typed_coords)
+        self.chars.extend(self._intern(c) for c in chars)
+        self.char_boxes.extend(typed_boxes)
+        self.char_offsets.append(len(self.chars))
+        if invalid:
+            self.invalid_chars[row] = invalid
+        return row
+
+    def append(
+        self,
+        image_name: str,
+        num_plates: int,
+        coordinates: Sequence[int],
+        chars: Sequence[str],
+        boxes: Sequence[float],
+        plate_number: str,
+    ) -> int:
+        """
+        Añade una fila al almacén y retorna su posición.
+        Si la imagen ya existía, la nueva fila la reemplaza en el índice.
+        """
+        row = self._write(*self._prepare(image_name, num_plates, coordinates, chars, boxes, plate_number))
+        self._index[image_name] = row
+        return row
+
+    def append_image(self, plates: Sequence[Tuple]) -> int:
+        """
+        Añade todas las matrículas de una imagen (campos de append) en filas
+        consecutivas y retorna la fila de la principal. Se validan todas
+        antes de escribir ninguna: una matrícula inválida descarta la imagen
+        entera y deja el almacén como estaba.
+        """
+        prepared = [self._prepare(*fields) for fields in plates]
+
+        first = self._write(*prepared[0])
+        for row_values in prepared[1:]:
+            self._write(*row_values)
+        if len(prepared) > 1:
+            self.plate_groups[first] = len(prepared)
+        self._index[prepared[0][0]] = first
+        return first
+
+    def copy(self) -> 'PlatesColumnarStore':
+        """Copia independiente (los arrays se duplican con memcpy)"""
+        clone = PlatesColumnarStore.__new__(PlatesColumnarStore)
+        clone.image_names = list(self.image_names)
+        clone.plate_numbers = list(self.plate_numbers)
+        clone.num_plates = array('H', self.num_plates)
+        clone.coordinates = array('i', self.coordinates)
+        clone.char_offsets = array('I', self.char_offsets)
+        clone.chars = list(self.chars)
+        clone.char_boxes = array('d', self.char_boxes)
+        clone.invalid_chars = dict(self.invalid_chars)
+        clone.plate_groups = dict(self.plate_groups)
+        clone._index = dict(self._index)
+        clone._strings = dict(self._strings)
+        clone._char_validity = dict(self._char_validity)
+        return clone
+
+    def extend(self, other: 'PlatesColumnarStore') -> None:
+        """
+        Añade al final todas las filas de otro almacén (p. ej. un bloque
+        parseado en otro proceso), respetando el orden de reemplazo por imagen.
+        """
+        row_shift = len(self.image_names)
+        char_shift = len(self.chars)
+
+        self.image_names.extend(other.image_names)
+        self.plate_numbers.extend(self._intern(p) for p in other.plate_numbers)
+        self.num_plates.extend(other.num_plates)
+        self.coordinates.extend(other.coordinates)
+        self.chars.extend(self._intern(c) for c in other.chars)
+        self.char_boxes.extend(other.char_boxes)
+        self.char_offsets.extend(offset + char_shift for offset in other.char_offsets[1:])
+
+        for row, invalid in other.invalid_chars.items():
+            self.invalid_chars[row + row_shift] = invalid
+        for row, size in other.plate_groups.items():
+            self.plate_groups[row + row_shift] = size
+
+        for image_name, row in other._index.items():
+            self._index[image_name] = row + row_shift
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, image_name: str) -> bool:
+        return image_name in self._index
+
+    def row_of(self, image_name: str) -> Optional[int]:
+        """Posición de la fila vigente para la imagen, None si no existe"""
+        return self._index.get(image_name)
+
+    def rows(self, after: Optional[int] = None) -> Iterator[int]:
+        """
+        Itera las filas vigentes en orden de fichero, opcionalmente a partir
+        de la fila siguiente a `after` (paginación por cursor)
+        """
+        index = self._index
+        names = self.image_names
+        start = 0 if after is None else after + 1
+
+        for row in range(start, len(names)):
+            if index.get(names[row]) == row:
+                yield row
+
+    def live_rows(self) -> Iterable[int]:
+        """Filas vigentes (principales), sin orden garantizado; más barato que rows()"""
+        return self._index.values()
+
+    def image_rows(self, row: int) -> range:
+        """Filas de todas las matrículas de la imagen cuya fila principal es row"""
+        return range(row, row + self.plate_groups.get(row, 1))
+
+    def materialize(self, row: int) -> Plate:
+        """Construye la entidad Plate de una fila, con las demás matrículas de la imagen"""
+        plate = self._materialize_row(row)
+        size = self.plate_groups.get(row)
+        if size:
+            plate.additional_plates = [self._materialize_row(r) for r in range(row + 1, row + size)]
+        return plate
+
+    def _materialize_row(self, row: int) -> Plate:
+        coords = self.coordinates[row * self.COORDS_PER_ROW:(row + 1) * self.COORDS_PER_ROW]
+        start = self.char_offsets[row]
+        end = self.char_offsets[row + 1]
+        boxes = self.char_boxes
+
+        characters = []
+        for i in range(start, end):
+            base = i * self.VALUES_PER_CHAR
+            characters.append(Character(
+                char=self.chars[i],
+                left=boxes[base],
+                top=boxes[base + 1],
+                width=boxes[base + 2],
+                height=boxes[base + 3]
+            ))
+
+        return Plate(
+            image_name=self.image_names[row],
+            plate_number=self.plate_numbers[row],
+            characters=characters,
+            coordinates=PlateCoordinates.from_list(list(coords)),
+            num_plates_in_image=self.num_plates[row],
+            invalid_chars=list(self.invalid_chars.get(row, ())),
+            sorted_chars=self.plate_numbers[row]
+        )
+
+    def get(self, image_name: str) -> Optional[Plate]:
+        """Materializa la matrícula de una imagen, None si no existe"""
+        row = self._index.get(image_name)
+        if row is None:
+            return None
+        return self.materialize(row)
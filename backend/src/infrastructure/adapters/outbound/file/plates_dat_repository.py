@@ -2,106 +2,822 @@
 Repositorio de matrículas usando archivo plates.dat
 Adaptador que lee y parsea el formato específico del archivo
 """
+import asyncio
+import multiprocessing
 import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List, Dict
-from domain.entities.plate import Plate, Character, PlateCoordinates
+from typing import Callable, Dict, Iterator, Optional, List, Set, Tuple
+from domain.entities.plate import GeometryFilter, Plate, Character, PlateCoordinates, PlateMatch
 from domain.repositories.plate_repository import PlateRepository
+from infrastructure.adapters.outbound.file.plates_columnar_store import PlatesColumnarStore
+from infrastructure.adapters.outbound.file.compressed_source import detect_compression, open_text
+from infrastructure.adapters.outbound.file.plate_search_index import PlateSearchIndex
+from infrastructure.adapters.outbound.file.capture_index import CaptureIndex, parse_capture, timestamp_key
+from infrastructure.adapters.outbound.file.plate_geometry import PlateGeometryTable
+from infrastructure.adapters.outbound.file.plate_statistics import PlateStatistics
+from infrastructure.adapters.outbound.file.image_name_filter import MappedBloomFilter, open_name_filter
+
+
+PlateFields = Tuple[str, int, List[int], List[str], List[float], str]
+
+
+def _parse_plate_block(parts: List[str], idx: int, image_name: str, num_plates: int) -> Tuple[PlateFields, int]:
+    """
+    Parsea un bloque de matrícula (8 coordenadas, num_chars y caracteres)
+    que empieza en parts[idx]. Retorna los campos y el índice siguiente.
+    """
+    if idx + 9 > len(parts):
+        raise ValueError(f"Faltan datos de matrícula en: {image_name}")
+
+    # Coordenadas (8 valores: x1,y1, x2,y2, x3,y3, x4,y4)
+    coords = [int(parts[i]) for i in range(idx, idx + 8)]
+
+    num_chars = int(parts[idx + 8])
+    if num_chars <= 0:
+        raise ValueError("Debe haber al menos un carácter")
+
+    # Parsear caracteres (cada uno ocupa 5 valores)
+    chars = []
+    boxes = []
+    idx += 9
+
+    for _ in range(num_chars):
+        if idx + 4 >= len(parts):
+            raise ValueError(f"Faltan datos de caracteres en: {image_name}")
+
+        chars.append(parts[idx])
+        boxes.append(float(parts[idx + 1]))
+        boxes.append(float(parts[idx + 2]))
+        boxes.append(float(parts[idx + 3]))
+        boxes.append(float(parts[idx + 4]))
+        idx += 5
+
+    # Ordenar por posición horizontal
+    order = sorted(range(num_chars), key=lambda i: boxes[i * 4])
+    plate_number = ''.join(chars[i] for i in order)
+
+    return (image_name, num_plates, coords, chars, boxes, plate_number), idx
+
+
+def parse_plate_line(line: str) -> List[PlateFields]:
+    """
+    Parsea una línea del archivo plates.dat a los campos crudos de cada matrícula
+    Formato: <imagen> <num_matriculas> [<8_coords> <num_chars> <char> <left> <top> <width> <height> ...] x num_matriculas
+
+    Si la línea trae menos bloques que num_matriculas se devuelven los presentes.
+
+    Returns:
+        Lista de (imagen, num_matriculas, coords, caracteres, cajas, matrícula ordenada)
+        donde cajas contiene left, top, width, height consecutivos por carácter
+    """
+    parts = line.split()
+
+    if len(parts) < 11:
+        raise ValueError(f"Línea con formato inválido: {line[:50]}...")
+
+    image_name = parts[0]
+    num_plates = int(parts[1])
+
+    plates = []
+    idx = 2
+    while True:
+        fields, idx = _parse_plate_block(parts, idx, image_name, num_plates)
+        plates.append(fields)
+        if len(plates) >= num_plates or idx >= len(parts):
+            return plates
+
+
+def _append_line(store: PlatesColumnarStore, line: str) -> None:
+    """Parsea una línea y la añade al almacén, ignorando formatos inválidos"""
+    line = line.strip()
+    if not line:
+        return
+
+    try:
+        store.append_image(parse_plate_line(line))
+    except Exception:
+        # Ignorar líneas con formato inválido
+        pass
+
+
+def parse_plates_chunk(path: str, start: int, end: int) -> PlatesColumnarStore:
+    """
+    Parsea las líneas que empiezan en el rango de bytes [start, end).
+    Se ejecuta en procesos del pool, por eso es una función de módulo.
+    """
+    store = PlatesColumnarStore()
+
+    with open(path, 'rb') as file:
+        file.seek(start)
+        position = start
+        while position < end:
+            raw = file.readline()
+            if not raw:
+                break
+            position += len(raw)
+            _append_line(store, raw.decode('utf-8'))
+
+    return store
+
+
+def split_into_chunks(path: str, num_chunks: int) -> List[Tuple[int, int]]:
+    """Divide el fichero en rangos de bytes alineados a saltos de línea"""
+    size = os.path.getsize(path)
+    boundaries = [0]
+
+    with open(path, 'rb') as file:
+        for i in range(1, num_chunks):
+            file.seek(max(size * i // num_chunks, boundaries[-1]))
+            file.readline()
+            boundaries.append(min(file.tell(), size))
+
+    boundaries.append(size)
+    return [(a, b) for a, b in zip(boundaries, boundaries[1:]) if b > a]
 
 
 class PlatesDatRepository(PlateRepository):
-    """Repositorio que lee matrículas desde plates.dat"""
+    """
+    Repositorio que lee matrículas desde plates.dat
+
+    Políticas de carga (load_mode):
+        lazy: el almacén se carga en un hilo con la primera consulta
+        eager: el almacén se carga en un hilo al arrancar la aplicación
+        streaming: sin caché; cada consulta recorre el fichero (despliegues mínimos)
 
-    def __init__(self, plates_dat_path: str):
+    Con watch_interval, un hilo vigila plates.dat y sustituye el almacén de forma
+    atómica cuando cambia. Si el fichero solo ha crecido, se parsea únicamente
+    la cola nueva.
+
+    Acepta el fichero comprimido (gzip, bz2, xz y, si están instalados, zstd
+    o lz4); en ese caso se descomprime en streaming con el parser secuencial.
+    """
+
+    LOAD_MODES = ("lazy", "eager", "streaming")
+
+    # Por debajo de este tamaño el arranque del pool cuesta más que el parseo
+    PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+    # Bytes previos al final ya cargado que deben coincidir para tratar un cambio como append
+    TAIL_FINGERPRINT_BYTES = 4096
+
+    # Índices derivados del almacén que se construyen tras cada carga
+    DERIVED_INDEXES: Dict[str, Callable[[PlatesColumnarStore], object]] = {
+        "search": lambda store: PlateSearchIndex.build(
+            (store.plate_numbers[plate_row], store.image_names[row])
+            for row in store.rows() for plate_row in store.image_rows(row)
+        ),
+        "captures": lambda store: CaptureIndex.build(
+            (row, store.image_names[row]) for row in store.rows()
+        ),
+        "geometry": PlateGeometryTable.from_store,
+        "statistics": PlateStatistics.from_store,
+    }
+
+    def __init__(
+        self,
+        plates_dat_path: str,
+        load_mode: str = "lazy",
+        parse_workers: Optional[int] = None,
+        watch_interval: Optional[float] = None,
+        name_filter_path: Optional[str] = None,
+    ):
         self.plates_dat_path = Path(plates_dat_path)
         
         if not self.plates_dat_path.exists():
             raise FileNotFoundError(f"No se encontró el archivo: {plates_dat_path}")
+
+        if load_mode not in self.LOAD_MODES:
+            raise ValueError(f"Modo de carga inválido: {load_mode}. Opciones: {self.LOAD_MODES}")
         
-        self._plates_cache: Optional[Dict[str, Plate]] = None
+        self.load_mode = load_mode
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self._plates_cache: Optional[PlatesColumnarStore] = None
+        self._load_lock = threading.Lock()
+        self._load_future: Optional[Future] = None
+        self._future_lock = threading.Lock()
+
+        self.watch_interval = watch_interval
+        self.generation = 0
+        self._loaded_signature: Optional[Tuple[int, int, int]] = None
+        self._loaded_size = 0
+        # Modo streaming: firma de plates.dat con la que se fijó la versión actual
+        self._scanned_signature: Optional[Tuple[int, int, int]] = None
+        self._tail_fingerprint = b''
+        self._reload_listeners: List[Callable[[], None]] = []
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+
+        # Índices derivados del almacén: nombre -> (almacén del que se construyó, índice)
+        self._derived: Dict[str, Tuple[PlatesColumnarStore, object]] = {}
+        self._derived_lock = threading.Lock()
+
+        # Filtro de Bloom de nombres (modo streaming): evita recorrer el fichero para imágenes inexistentes
+        self.name_filter_path = name_filter_path
+        self._name_filter: Optional[MappedBloomFilter] = None
+        self._name_filter_signature: Optional[Tuple[int, int]] = None
+        self._name_filter_lock = threading.Lock()
 
-    def _load_plates_cache(self) -> Dict[str, Plate]:
-        """Carga todas las matrículas en memoria (cache)"""
+        # Modo streaming: última línea válida de cada imagen repetida, por versión del fichero
+        self._kept_lines: Optional[Tuple[Tuple[int, int], Dict[str, int]]] = None
+
+    def _file_signature(self) -> Tuple[int, int, int]:
+        """(inodo, mtime_ns, tamaño) del fichero actual"""
+        stat = self.plates_dat_path.stat()
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_fingerprint(self, end: int) -> bytes:
+        """Últimos bytes del fichero antes de la posición end"""
+        start = max(0, end - self.TAIL_FINGERPRINT_BYTES)
+        with open(self.plates_dat_path, 'rb') as file:
+            file.seek(start)
+            return file.read(end - start)
+
+    def _mark_loaded(self, signature: Tuple[int, int, int], size: int) -> None:
+        self._loaded_signature = signature
+        self._loaded_size = size
+        self._tail_fingerprint = self._read_fingerprint(size)
+
+    def _build_store(self) -> PlatesColumnarStore:
+        """Parsea el fichero completo en un almacén columnar nuevo"""
+        size = self.plates_dat_path.stat().st_size
+        compressed = detect_compression(self.plates_dat_path) is not None
+
+        # Los rangos de bytes solo tienen sentido sobre el fichero sin comprimir
+        if self.parse_workers > 1 and size >= self.PARALLEL_MIN_BYTES and not compressed:
+            return self._build_store_parallel()
+
+        store = PlatesColumnarStore()
+        with open_text(self.plates_dat_path) as file:
+            for line in file:
+                _append_line(store, line)
+        return store
+
+    def _build_store_parallel(self) -> PlatesColumnarStore:
+        """Parsea el fichero por bloques en un pool de procesos y los fusiona en orden"""
+        path = str(self.plates_dat_path)
+        chunks = split_into_chunks(path, self.parse_workers)
+
+        # spawn: la carga puede lanzarse desde un hilo y fork no es seguro ahí
+        context = multiprocessing.get_context("spawn")
+        store = PlatesColumnarStore()
+
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as pool:
+            futures = [pool.submit(parse_plates_chunk, path, start, end) for start, end in chunks]
+            for future in futures:
+                store.extend(future.result())
+
+        return store
+
+    def _load_plates_cache(self) -> PlatesColumnarStore:
+        """Carga todas las matrículas en memoria (almacén columnar)"""
         if self._plates_cache is not None:
             return self._plates_cache
 
-        plates = {}
+        # Un único parseo aunque varios hilos lo pidan a la vez
+        with self._load_lock:
+            if self._plates_cache is None:
+                signature = self._file_signature()
+                self._plates_cache = self._build_store()
+                self._mark_loaded(signature, signature[2])
         
-        with open(self.plates_dat_path, 'r', encoding='utf-8') as file:
+        return self._plates_cache
+
+    def _start_loading(self) -> Future:
+        """
+        Lanza la carga en un hilo de fondo (idempotente). Si falla, quienes
+        la esperaban reciben el error y la siguiente llamada la reintenta.
+        """
+        with self._future_lock:
+            if self._load_future is None:
+                future: Future = Future()
+
+                def run():
+                    try:
+                        self._load_plates_cache()
+                        future.set_result(None)
+                    except BaseException as e:
+                        with self._future_lock:
+                            if self._load_future is future:
+                                self._load_future = None
+                        future.set_exception(e)
+                        return
+
+                    # Los índices derivados se construyen tras la carga, sin retrasar la disponibilidad
+                    for name in self.DERIVED_INDEXES:
+                        try:
+                            self._get_derived_index(name)
+                        except Exception as e:
+                            print(f"Error building {name} index: {e}")
+
+                threading.Thread(target=run, name="plates-dat-loader", daemon=True).start()
+                self._load_future = future
+            return self._load_future
+
+    def _parse_appended_tail(self, size: int) -> Optional[Tuple[PlatesColumnarStore, int]]:
+        """
+        Si el fichero solo ha crecido desde la última carga, parsea las líneas
+        completas añadidas. Retorna (almacén de la cola, nuevo offset cargado)
+        o None si el cambio no es un append.
+        """
+        loaded = self._loaded_size
+        if size <= loaded or not self._tail_fingerprint.endswith(b'\n'):
+            return None
+        if detect_compression(self.plates_dat_path) is not None:
+            return None
+        if self._read_fingerprint(loaded) != self._tail_fingerprint:
+            return None
+
+        with open(self.plates_dat_path, 'rb') as file:
+            file.seek(loaded)
+            data = file.read(size - loaded)
+
+        # Una línea sin salto final puede estar a medio escribir: se deja para la próxima vez
+        complete = data[:data.rfind(b'\n') + 1]
+        tail = PlatesColumnarStore()
+        for raw in complete.splitlines():
+            _append_line(tail, raw.decode('utf-8'))
+
+        return tail, loaded + len(complete)
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """Registra una función que se llama tras cada recarga del almacén"""
+        self._reload_listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Comprueba si plates.dat cambió y, en ese caso, reconstruye el almacén
+        y lo sustituye de una vez. Las peticiones en curso siguen usando el
+        almacén anterior hasta terminar.
+
+        Returns:
+            True si se recargó
+        """
+        if self._plates_cache is None:
+            return False
+
+        with self._load_lock:
+            signature = self._file_signature()
+            if signature == self._loaded_signature:
+                return False
+
+            appended = None
+            if self._loaded_signature and signature[0] == self._loaded_signature[0]:
+                appended = self._parse_appended_tail(signature[2])
+
+            previous = self._plates_cache
+            statistics = None
+            if appended is not None:
+                tail, loaded_size = appended
+                store = previous.copy()
+                store.extend(tail)
+
+                # Las estadísticas se actualizan solo con las filas añadidas
+                cached = self._derived.get("statistics")
+                if cached is not None and cached[0] is previous:
+                    statistics = cached[1].after_append(previous, store, len(previous.image_names))
+            else:
+                store = self._build_store()
+                loaded_size = signature[2]
+
+            if statistics is not None:
+                with self._derived_lock:
+                    self._derived["statistics"] = (store, statistics)
+            self._plates_cache = store
+            self._mark_loaded(signature, loaded_size)
+            self.generation += 1
+
+        for listener in self._reload_listeners:
+            listener()
+
+        for name in list(self._derived):
+            self._get_derived_index(name)
+        return True
+
+    def _watch(self) -> None:
+        while not self._watch_stop.wait(self.watch_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                print(f"Error reloading plates.dat: {e}")
+
+    def warm_up(self) -> None:
+        """En modo eager inicia la carga en segundo plano y arranca la vigilancia del fichero"""
+        if self.load_mode == "eager":
+            self._start_loading()
+
+        if self.watch_interval and self.load_mode != "streaming" and self._watch_thread is None:
+            self._watch_thread = threading.Thread(target=self._watch, name="plates-dat-watcher", daemon=True)
+            self._watch_thread.start()
+
+    def close(self) -> None:
+        """Detiene la vigilancia de plates.dat y cierra el filtro de nombres"""
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+        with self._name_filter_lock:
+            if self._name_filter is not None:
+                self._name_filter.close()
+                self._name_filter = None
+                self._name_filter_signature = None
+
+    def is_ready(self) -> bool:
+        """El modo streaming no necesita carga previa"""
+        return self.load_mode == "streaming" or self._plates_cache is not None
+
+    async def wait_until_ready(self) -> None:
+        """Espera a la carga compartida sin bloquear el event loop"""
+        if self.is_ready():
+            return
+        await asyncio.wrap_future(self._start_loading())
+
+    def _scan(self, image_name: str) -> Optional[Plate]:
+        """Modo streaming: parsea la última línea válida de la imagen en el fichero"""
+        found = None
+        prefix = image_name + ' '
+        with open_text(self.plates_dat_path) as file:
             for line in file:
                 line = line.strip()
-                if not line:
+                if not line.startswith(prefix):
                     continue
-                
                 try:
-                    plate = self._parse_line(line)
-                    plates[plate.image_name] = plate
+                    found = self._parse_line(line)
                 except Exception:
-                    # Ignorar líneas con formato inválido
                     continue
-        
-        self._plates_cache = plates
-        return plates
+        return found
 
     def _parse_line(self, line: str) -> Plate:
         """
         Parsea una línea del archivo plates.dat
         Formato: <imagen> <num_matriculas> <8_coords> <num_chars> <char> <left> <top> <width> <height> ...
+        La primera matrícula es la principal; el resto van en additional_plates.
         """
-        parts = line.split()
-        
-        if len(parts) < 11:
-            raise ValueError(f"Línea con formato inválido: {line[:50]}...")
-        
-        image_name = parts[0]
-        num_plates = int(parts[1])
-        
-        # Coordenadas (8 valores: x1,y1, x2,y2, x3,y3, x4,y4)
-        coords_raw = [int(parts[i]) for i in range(2, 10)]
-        coordinates = PlateCoordinates.from_list(coords_raw)
-        
-        num_chars = int(parts[10])
-        
-        # Parsear caracteres (cada uno ocupa 5 valores)
-        characters = []
-        idx = 11
-        
-        for _ in range(num_chars):
-            if idx + 4 >= len(parts):
-                raise ValueError(f"Faltan datos de caracteres en: {image_name}")
-            
-            char = parts[idx]
-            left = float(parts[idx + 1])
-            top = float(parts[idx + 2])
-            width = float(parts[idx + 3])
-            height = float(parts[idx + 4])
-            
-            characters.append(Character(char=char, left=left, top=top, width=width, height=height))
-            idx += 5
-        
-        # Ordenar por posición horizontal
-        characters_sorted = sorted(characters, key=lambda c: c.left)
-        plate_number = ''.join(c.char for c in characters_sorted)
+        plates = [self._fields_to_plate(fields) for fields in parse_plate_line(line)]
+        plates[0].additional_plates = plates[1:]
+        return plates[0]
+
+    @staticmethod
+    def _fields_to_plate(fields: PlateFields) -> Plate:
+        image_name, num_plates, coords, chars, boxes, plate_number = fields
+
+        characters = [
+            Character(
+                char=char,
+                left=boxes[i * 4],
+                top=boxes[i * 4 + 1],
+                width=boxes[i * 4 + 2],
+                height=boxes[i * 4 + 3]
+            )
+            for i, char in enumerate(chars)
+        ]
         
         return Plate(
             image_name=image_name,
             plate_number=plate_number,
             characters=characters,
-            coordinates=coordinates,
-            num_plates_in_image=num_plates
+            coordinates=PlateCoordinates.from_list(coords),
+            num_plates_in_image=num_plates,
+            sorted_chars=plate_number
         )
 
+    def _scan_many(self, image_names: List[str]) -> Dict[str, Optional[Plate]]:
+        """Modo streaming: resuelve varias imágenes recorriendo el fichero una vez"""
+        found: Dict[str, Optional[Plate]] = dict.fromkeys(image_names)
+        with open_text(self.plates_dat_path) as file:
+            for line in file:
+                line = line.strip()
+                name = line.split(None, 1)[0] if line else None
+                if name not in found:
+                    continue
+                try:
+                    found[name] = self._parse_line(line)
+                except Exception:
+                    continue
+        return found
+
+    def _get_name_filter(self) -> Optional[MappedBloomFilter]:
+        """
+        Filtro de nombres del plates.dat actual, compartido entre workers a
+        través de su fichero. None si no se puede construir (p. ej. directorio
+        de solo lectura): las consultas siguen funcionando sin él.
+        """
+        stat = self.plates_dat_path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if self._name_filter is not None and self._name_filter_signature == signature:
+            return self._name_filter
+
+        with self._name_filter_lock:
+            if self._name_filter is None or self._name_filter_signature != signature:
+                try:
+                    name_filter = open_name_filter(str(self.plates_dat_path), self.name_filter_path)
+                except OSError as e:
+                    print(f"Error building image name filter: {e}")
+                    return None
+                previous, self._name_filter = self._name_filter, name_filter
+                self._name_filter_signature = signature
+                # Libera el mmap y el descriptor del filtro anterior
+                if previous is not None:
+                    previous.close()
+            return self._name_filter
+
+    def _may_exist(self, image_names: List[str]) -> List[str]:
+        """Modo streaming: descarta los nombres que el filtro sabe ausentes"""
+        name_filter = self._get_name_filter()
+        if name_filter is None:
+            return image_names
+        try:
+            return [name for name in image_names if name in name_filter]
+        except ValueError:
+            # Otro hilo lo cerró al cambiar plates.dat: se consulta el fichero sin filtro
+            return image_names
+
     def get_plate_by_image_name(self, image_name: str) -> Optional[Plate]:
         """Obtiene la matrícula para una imagen específica"""
-        plates = self._load_plates_cache()
-        return plates.get(image_name)
+        if self.load_mode == "streaming":
+            return self._scan(image_name) if self._may_exist([image_name]) else None
+
+        store = self._load_plates_cache()
+        row = store.row_of(image_name)
+        return None if row is None else self._materialize(store, row)
+
+    def get_plates_by_image_names(self, image_names: List[str]) -> Dict[str, Optional[Plate]]:
+        """Resuelve varias imágenes contra el mismo almacén (o en una sola pasada en streaming)"""
+        if self.load_mode == "streaming":
+            found = dict.fromkeys(image_names)
+            candidates = self._may_exist(list(found))
+            if candidates:
+                found.update(self._scan_many(candidates))
+            return found
+
+        store = self._load_plates_cache()
+        rows = {name: store.row_of(name) for name in image_names}
+        return {name: None if row is None else self._materialize(store, row) for name, row in rows.items()}
+
+    def _materialize(self, store: PlatesColumnarStore, row: int) -> Plate:
+        """Materializa la fila con su geometría si ya está calculada para este almacén"""
+        plate = store.materialize(row)
+        cached = self._derived.get("geometry")
+        if cached is not None and cached[0] is store:
+            table: PlateGeometryTable = cached[1]
+            for position, member in enumerate(plate.all_plates, row):
+                member.geometry = table.get(position)
+        return plate
 
     def get_all_plates(self) -> List[Plate]:
         """Retorna todas las matrículas cargadas"""
-        plates = self._load_plates_cache()
-        return list(plates.values())
+        if self.load_mode == "streaming":
+            store = self._build_store()
+        else:
+            store = self._load_plates_cache()
+        return [store.materialize(row) for row in store.rows()]
+
+    def iter_plates(self, after: Optional[str] = None) -> Iterator[Plate]:
+        """Recorre las matrículas en orden de fichero sin construir la lista completa"""
+        if self.load_mode == "streaming":
+            yield from self._scan_from(after)
+            return
+
+        # Se fija el almacén actual: una recarga no altera un recorrido en curso
+        store = self._load_plates_cache()
+        after_row = None
+        if after is not None:
+            after_row = store.row_of(after)
+            if after_row is None:
+                return
+
+        for row in store.rows(after_row):
+            yield store.materialize(row)
+
+    def iter_image_names(self) -> Iterator[str]:
+        """Nombres de imagen en orden de fichero, sin materializar matrículas"""
+        if self.load_mode == "streaming":
+            yield from (plate.image_name for plate in self._scan_from(None))
+            return
+
+        store = self._load_plates_cache()
+        names = store.image_names
+        for row in store.rows():
+            yield names[row]
+
+    def count_plates(self) -> int:
+        """Número de imágenes con matrícula"""
+        if self.load_mode == "streaming":
+            return len(self._build_store())
+        return len(self._load_plates_cache())
+
+    def get_version(self) -> int:
+        """
+        Se incrementa con cada recarga en caliente. En modo streaming no hay
+        recarga (cada consulta lee el fichero): se incrementa cuando cambia
+        la firma de plates.dat, para que las cachés de respuestas y vistas
+        no sirvan datos de la versión anterior.
+        """
+        if self.load_mode == "streaming":
+            signature = self._file_signature()
+            if signature != self._scanned_signature:
+                with self._load_lock:
+                    if signature != self._scanned_signature:
+                        self._scanned_signature = signature
+                        self.generation += 1
+        return self.generation
+
+    def _scan_from(self, after: Optional[str]) -> Iterator[Plate]:
+        """
+        Modo streaming: produce las líneas válidas posteriores a la imagen
+        `after`, omitiendo las que una línea posterior de la misma imagen
+        sustituye (como hace el almacén, que conserva la última)
+        """
+        kept = self._kept_lines_of_repeated()
+        started = after is None
+        with open_text(self.plates_dat_path) as file:
+            for number, line in enumerate(file):
+                line = line.strip()
+                if not line:
+                    continue
+                name = line.split(None, 1)[0]
+                if kept.get(name, number) != number:
+                    continue
+                if not started:
+                    started = name == after
+                    continue
+                try:
+                    yield self._parse_line(line)
+                except Exception:
+                    continue
+
+    def _kept_lines_of_repeated(self) -> Dict[str, int]:
+        """
+        Modo streaming: número de la última línea válida de cada imagen que
+        aparece más de una vez. Se calcula una vez por versión del fichero;
+        sin imágenes repetidas queda vacío y solo cuesta una pasada de nombres.
+        """
+        stat = self.plates_dat_path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._kept_lines
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        seen: Set[str] = set()
+        repeated: Set[str] = set()
+        with open_text(self.plates_dat_path) as file:
+            for line in file:
+                parts = line.split(None, 1)
+                if not parts:
+                    continue
+                if parts[0] in seen:
+                    repeated.add(parts[0])
+                seen.add(parts[0])
+        del seen
+
+        kept: Dict[str, int] = {}
+        if repeated:
+            # Solo se parsean las líneas de las imágenes repetidas
+            with open_text(self.plates_dat_path) as file:
+                for number, line in enumerate(file):
+                    line = line.strip()
+                    name = line.split(None, 1)[0] if line else None
+                    if name not in repeated:
+                        continue
+                    try:
+                        self._parse_line(line)
+                    except Exception:
+                        continue
+                    kept[name] = number
+
+        self._kept_lines = (signature, kept)
+        return kept
+
+    def _get_derived_index(self, name: str):
+        """Índice derivado del almacén vigente; se reconstruye si el almacén cambió"""
+        store = self._load_plates_cache()
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] is store:
+            return cached[1]
+
+        with self._derived_lock:
+            cached = self._derived.get(name)
+            if cached is None or cached[0] is not store:
+                cached = (store, self.DERIVED_INDEXES[name](store))
+                self._derived[name] = cached
+            return cached[1]
+
+    def search_plates(
+        self, query: str, mode: str = "fuzzy", max_distance: int = 1, limit: int = 50
+    ) -> List[PlateMatch]:
+        """Busca imágenes por número de matrícula (exacta, prefijo o aproximada)"""
+        if self.load_mode == "streaming":
+            # Sin caché: el índice se construye recorriendo el fichero en cada búsqueda
+            index = PlateSearchIndex.build(
+                (plate.plate_number, image.image_name)
+                for image in self._scan_from(None) for plate in image.all_plates
+            )
+        else:
+            index = self._get_derived_index("search")
+        return index.search(query, mode, max_distance, limit)
+
+    def find_captures(
+        self,
+        lane: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Plate]:
+        """Capturas de un carril y rango [start, end) en orden de captura"""
+        if self.load_mode == "streaming":
+            # Sin caché: recorrido del fichero filtrando por carril y rango
+            return list(islice(self._scan_captures(lane, start, end, after), limit))
+
+        store = self._load_plates_cache()
+        index: CaptureIndex = self._get_derived_index("captures")
+        cursor = None
+        if after is not None:
+            capture = parse_capture(after)
+            row = store.row_of(after)
+            if capture is None or row is None:
+                raise ValueError(f"Cursor desconocido: {after}")
+            cursor = (capture[1], row)
+
+        rows = index.query(
+            lane,
+            None if start is None else timestamp_key(start),
+            None if end is None else timestamp_key(end),
+            cursor,
+            limit,
+        )
+        return [store.materialize(row) for row in rows]
+
+    def _scan_captures(
+        self, lane: Optional[int], start: Optional[datetime], end: Optional[datetime], after: Optional[str]
+    ) -> Iterator[Plate]:
+        low = None if start is None else timestamp_key(start)
+        high = None if end is None else timestamp_key(end)
+        matches = []
+
+        for position, plate in enumerate(self._scan_from(None)):
+            capture = parse_capture(plate.image_name)
+            if capture is None or (lane is not None and capture[0] != lane):
+                continue
+            if (low is not None and capture[1] < low) or (high is not None and capture[1] >= high):
+                continue
+            matches.append((capture[1], position, plate))
+
+        matches.sort(key=lambda match: match[:2])
+        if after is not None:
+            positions = [i for i, match in enumerate(matches) if match[2].image_name == after]
+            if not positions:
+                raise ValueError(f"Cursor desconocido: {after}")
+            matches = matches[positions[0] + 1:]
+
+        return (plate for _, _, plate in matches)
+
+    def find_by_geometry(
+        self, criteria: GeometryFilter, after: Optional[str] = None, limit: int = 100
+    ) -> List[Plate]:
+        """Imágenes con alguna matrícula que cumple el filtro geométrico, en orden de fichero"""
+        if self.load_mode == "streaming":
+            # Sin caché: geometría calculada matrícula a matrícula durante el recorrido
+            found = (
+                image for image in self._scan_from(after)
+                if any(criteria.matches(plate.get_geometry()) for plate in image.all_plates)
+            )
+            return list(islice(found, limit))
+
+        store = self._load_plates_cache()
+        table: PlateGeometryTable = self._get_derived_index("geometry")
+        after_row = None
+        if after is not None:
+            after_row = store.row_of(after)
+            if after_row is None:
+                raise ValueError(f"Cursor desconocido: {after}")
+
+        return [self._materialize(store, int(row)) for row in table.select(criteria, after_row, limit)]
+
+    def get_statistics(self) -> Dict:
+        """Agregados del conjunto, calculados al cargar y actualizados en cada append"""
+        if self.load_mode == "streaming":
+            # Sin caché: se parsea el fichero en cada consulta
+            return PlateStatistics.from_store(self._build_store()).snapshot()
+
+        statistics: PlateStatistics = self._get_derived_index("statistics")
+        return statistics.snapshot()
 
     def plate_exists(self, image_name: str) -> bool:
         """Verifica si existe una matrícula para la imagen"""
-        plates = self._load_plates_cache()
-        return image_name in plates
+        if self.load_mode == "streaming":
+            return bool(self._may_exist([image_name])) and self._scan(image_name) is not None
+
+        store = self._load_plates_cache()
+        return image_name in store
+
+    def plates_exist(self, image_names: List[str]) -> Dict[str, bool]:
+        """Existencia de varias imágenes; en streaming solo se busca en el fichero lo que el filtro no descarta"""
+        if self.load_mode == "streaming":
+            return {name: plate is not None for name, plate in self.get_plates_by_image_names(image_names).items()}
+
+        store = self._load_plates_cache()
+        return {name: name in store for name in image_names}
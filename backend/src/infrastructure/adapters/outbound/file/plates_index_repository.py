@@ -0,0 +1,426 @@
+"""
+Repositorio de matrículas sobre un índice binario precompilado de plates.dat
+El índice se abre con mmap: todos los workers comparten las páginas a través
+de la caché del sistema operativo y cada consulta solo lee su registro
+"""
+import hashlib
+import mmap
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.plate import GeometryFilter, Plate, Character, PlateCoordinates, PlateMatch
+from domain.repositories.plate_repository import PlateRepository
+from infrastructure.adapters.outbound.file.plates_dat_repository import parse_plate_line
+from infrastructure.adapters.outbound.file.compressed_source import open_text
+from infrastructure.adapters.outbound.file.plate_search_index import PlateSearchIndex
+from infrastructure.adapters.outbound.file.capture_index import CaptureIndex, parse_capture, timestamp_key
+from infrastructure.adapters.outbound.file.plate_geometry import PlateGeometryTable
+from infrastructure.adapters.outbound.file.plate_statistics import PlateStatistics, statistics_from_plates
+from infrastructure.adapters.outbound.file.sidecar_file import (
+    HEADER_PREFIX, is_sidecar_stale, source_signature, write_atomically
+)
+
+INDEX_MAGIC = b'PLATEIDX'
+INDEX_VERSION = 2
+
+# magic, versión, tamaño origen, mtime_ns origen, nº registros, nº slots, digest origen
+HEADER = struct.Struct(HEADER_PREFIX + 'QQ32s')
+# hash del nombre, offset del registro (0 = slot vacío)
+SLOT = struct.Struct('<QQ')
+# len nombre, len matrícula, len caracteres, num_matriculas, num_chars,
+# registros del grupo de la imagen (1 salvo en la principal de una imagen multi-matrícula), 8 coordenadas
+RECORD = struct.Struct('<HHHHHH8i')
+BOX = struct.Struct('<4d')
+
+CHAR_SEPARATOR = '\n'
+
+
+def _name_hash(name: bytes) -> int:
+    """Hash estable entre procesos (hash() de Python usa semilla aleatoria)"""
+    return int.from_bytes(hashlib.blake2b(name, digest_size=8).digest(), 'little')
+
+
+def _encode_record(fields, group_size: int = 1) -> bytes:
+    image_name, num_plates, coords, chars, boxes, plate_number = fields
+    name = image_name.encode('utf-8')
+    plate = plate_number.encode('utf-8')
+    chars_blob = CHAR_SEPARATOR.join(chars).encode('utf-8')
+
+    return b''.join((
+        RECORD.pack(len(name), len(plate), len(chars_blob), num_plates, len(chars), group_size, *coords),
+        name,
+        plate,
+        chars_blob,
+        struct.pack(f'<{len(boxes)}d', *boxes),
+    ))
+
+
+def build_plates_index(plates_dat_path: str, index_path: str) -> int:
+    """
+    Compila plates.dat en un índice binario (tabla hash de direccionamiento
+    abierto con offsets a registros de formato fijo). Las matrículas de una
+    misma imagen se escriben en registros consecutivos; la tabla apunta al
+    de la principal.
+
+    El fichero se escribe en un temporal y se renombra al final, de modo que
+    los lectores nunca ven un índice a medio escribir.
+
+    Returns:
+        Número de registros indexados
+    """
+    source = Path(plates_dat_path)
+    size, mtime_ns, digest = source_signature(source)
+
+    offsets = {}
+    with tempfile.TemporaryFile() as records:
+        position = 0
+        with open_text(source) as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    plates = parse_plate_line(line)
+                    record = b''.join(
+                        _encode_record(fields, len(plates) if i == 0 else 1)
+                        for i, fields in enumerate(plates)
+                    )
+                except Exception:
+                    # Ignorar líneas con formato inválido
+                    continue
+
+                name = plates[0][0].encode('utf-8')
+                offsets[name] = position
+                records.write(record)
+                position += len(record)
+
+        num_slots = max(1, len(offsets) * 2)
+        records_start = HEADER.size + num_slots * SLOT.size
+
+        table = bytearray(num_slots * SLOT.size)
+        for name, relative in offsets.items():
+            name_hash = _name_hash(name)
+            slot = name_hash % num_slots
+            while SLOT.unpack_from(table, slot * SLOT.size)[1]:
+                slot = (slot + 1) % num_slots
+            SLOT.pack_into(table, slot * SLOT.size, name_hash, records_start + relative)
+
+        def write(out) -> None:
+            out.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, size, mtime_ns, len(offsets), num_slots, digest))
+            out.write(table)
+            records.seek(0)
+            for block in iter(lambda: records.read(1 << 20), b''):
+                out.write(block)
+
+        write_atomically(Path(index_path), write)
+
+    return len(offsets)
+
+
+def is_index_stale(plates_dat_path: str, index_path: str) -> bool:
+    """Indica si el índice no corresponde al plates.dat actual (ver is_sidecar_stale)"""
+    return is_sidecar_stale(Path(plates_dat_path), Path(index_path), HEADER, INDEX_MAGIC, INDEX_VERSION)
+
+
+class PlatesIndexRepository(PlateRepository):
+    """Repositorio que consulta matrículas sobre el índice binario mapeado en memoria"""
+
+    def __init__(self, plates_dat_path: str, index_path: Optional[str] = None):
+        self.plates_dat_path = Path(plates_dat_path)
+
+        if not self.plates_dat_path.exists():
+            raise FileNotFoundError(f"No se encontró el archivo: {plates_dat_path}")
+
+        self.index_path = Path(index_path) if index_path else self.plates_dat_path.with_name(
+            self.plates_dat_path.name + '.idx'
+        )
+
+        if is_index_stale(str(self.plates_dat_path), str(self.index_path)):
+            build_plates_index(str(self.plates_dat_path), str(self.index_path))
+
+        with open(self.index_path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, _, _, self._num_records, self._num_slots, _ = HEADER.unpack_from(self._mm, 0)
+
+        self._search_index: Optional[PlateSearchIndex] = None
+        self._capture_index: Optional[CaptureIndex] = None
+        self._geometry_table: Optional[PlateGeometryTable] = None
+        self._statistics: Optional[PlateStatistics] = None
+        self._derived_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Libera el mapeo del índice"""
+        self._mm.close()
+
+    def _find_offset(self, image_name: str) -> Optional[int]:
+        """Busca el offset del registro de una imagen en la tabla hash"""
+        name = image_name.encode('utf-8')
+        name_hash = _name_hash(name)
+        slot = name_hash % self._num_slots
+
+        while True:
+            stored_hash, offset = SLOT.unpack_from(self._mm, HEADER.size + slot * SLOT.size)
+            if not offset:
+                return None
+            if stored_hash == name_hash:
+                name_len = RECORD.unpack_from(self._mm, offset)[0]
+                start = offset + RECORD.size
+                if self._mm[start:start + name_len] == name:
+                    return offset
+            slot = (slot + 1) % self._num_slots
+
+    def _read_record(self, offset: int) -> Tuple[Plate, int]:
+        """
+        Decodifica el registro en offset (con las demás matrículas de su
+        imagen) y retorna (Plate, offset siguiente al grupo)
+        """
+        plate, position, group_size = self._read_single_record(offset)
+
+        if group_size > 1:
+            additional = []
+            for _ in range(group_size - 1):
+                other, position, _ = self._read_single_record(position)
+                additional.append(other)
+            plate.additional_plates = additional
+
+        return plate, position
+
+    def _read_single_record(self, offset: int) -> Tuple[Plate, int, int]:
+        mm = self._mm
+        name_len, plate_len, chars_len, num_plates, num_chars, group_size, *coords = RECORD.unpack_from(mm, offset)
+
+        position = offset + RECORD.size
+        image_name = mm[position:position + name_len].decode('utf-8')
+        position += name_len
+        plate_number = mm[position:position + plate_len].decode('utf-8')
+        position += plate_len
+        chars = mm[position:position + chars_len].decode('utf-8').split(CHAR_SEPARATOR)
+        position += chars_len
+
+        characters = []
+        for char in chars:
+            left, top, width, height = BOX.unpack_from(mm, position)
+            characters.append(Character(char=char, left=left, top=top, width=width, height=height))
+            position += BOX.size
+
+        plate = Plate(
+            image_name=image_name,
+            plate_number=plate_number,
+            characters=characters,
+            coordinates=PlateCoordinates.from_list(coords),
+            num_plates_in_image=num_plates,
+            sorted_chars=plate_number
+        )
+        return plate, position, group_size
+
+    def _iter_records(self, offset: Optional[int] = None) -> Iterator[Tuple[int, Plate]]:
+        if offset is None:
+            offset = HEADER.size + self._num_slots * SLOT.size
+        end = len(self._mm)
+        while offset < end:
+            plate, next_offset = self._read_record(offset)
+            yield offset, plate
+            offset = next_offset
+
+    def get_plate_by_image_name(self, image_name: str) -> Optional[Plate]:
+        """Obtiene la matrícula para una imagen específica"""
+        offset = self._find_offset(image_name)
+        if offset is None:
+            return None
+        return self._read_record(offset)[0]
+
+    def get_all_plates(self) -> List[Plate]:
+        """Retorna todas las matrículas del índice (sin duplicados reemplazados)"""
+        return [
+            plate for offset, plate in self._iter_records()
+            if self._find_offset(plate.image_name) == offset
+        ]
+
+    def iter_plates(self, after: Optional[str] = None) -> Iterator[Plate]:
+        """Recorre los registros en orden de fichero a partir del registro de `after`"""
+        start = None
+        if after is not None:
+            offset = self._find_offset(after)
+            if offset is None:
+                return
+            start = self._read_record(offset)[1]
+
+        for offset, plate in self._iter_records(start):
+            if self._find_offset(plate.image_name) == offset:
+                yield plate
+
+    def iter_image_names(self) -> Iterator[str]:
+        """Nombres de imagen en orden de fichero leyendo solo la cabecera de cada registro"""
+        return (image_name for _, image_name, _ in self._iter_plate_numbers())
+
+    def count_plates(self) -> int:
+        """Número de registros indexados"""
+        return self._num_records
+
+    def _iter_plate_numbers(self, include_additional: bool = False) -> Iterator[Tuple[str, str, int]]:
+        """
+        Tuplas (matrícula, imagen, offset de la principal) vigentes leyendo solo
+        nombre y matrícula de cada registro. Con include_additional se incluyen
+        también las demás matrículas de cada imagen.
+        """
+        mm = self._mm
+        offset = HEADER.size + self._num_slots * SLOT.size
+        end = len(mm)
+        group_offset = None
+        group_left = 0
+
+        while offset < end:
+            name_len, plate_len, chars_len, _, num_chars, group_size, *_ = RECORD.unpack_from(mm, offset)
+            start = offset + RECORD.size
+            if group_left:
+                group_left -= 1
+                if include_additional and group_offset is not None:
+                    yield mm[start + name_len:start + name_len + plate_len].decode('utf-8'), image_name, group_offset
+            else:
+                image_name = mm[start:start + name_len].decode('utf-8')
+                group_left = group_size - 1
+                group_offset = offset if self._find_offset(image_name) == offset else None
+                if group_offset is not None:
+                    yield mm[start + name_len:start + name_len + plate_len].decode('utf-8'), image_name, offset
+            offset = start + name_len + plate_len + chars_len + num_chars * BOX.size
+
+    def search_plates(
+        self, query: str, mode: str = "fuzzy", max_distance: int = 1, limit: int = 50
+    ) -> List[PlateMatch]:
+        """Busca imágenes por número de matrícula; el índice se construye en la primera búsqueda"""
+        if self._search_index is None:
+            with self._derived_lock:
+                if self._search_index is None:
+                    self._search_index = PlateSearchIndex.build(
+                        (plate_number, image_name)
+                        for plate_number, image_name, _ in self._iter_plate_numbers(include_additional=True)
+                    )
+        return self._search_index.search(query, mode, max_distance, limit)
+
+    def find_captures(
+        self,
+        lane: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Plate]:
+        """Capturas por carril y rango; el índice (por offset) se construye en la primera consulta"""
+        if self._capture_index is None:
+            with self._derived_lock:
+                if self._capture_index is None:
+                    self._capture_index = CaptureIndex.build(
+                        (offset, image_name) for _, image_name, offset in self._iter_plate_numbers()
+                    )
+
+        cursor = None
+        if after is not None:
+            capture = parse_capture(after)
+            offset = self._find_offset(after)
+            if capture is None or offset is None:
+                raise ValueError(f"Cursor desconocido: {after}")
+            cursor = (capture[1], offset)
+
+        offsets = self._capture_index.query(
+            lane,
+            None if start is None else timestamp_key(start),
+            None if end is None else timestamp_key(end),
+            cursor,
+            limit,
+        )
+        return [self._read_record(offset)[0] for offset in offsets]
+
+    def _build_geometry_table(self) -> PlateGeometryTable:
+        """
+        Geometría de todos los registros leyendo solo coordenadas y cajas.
+        El propietario de cada registro es el offset de la principal de su imagen.
+        """
+        mm = self._mm
+        offset = HEADER.size + self._num_slots * SLOT.size
+        end = len(mm)
+        coordinates = array('i')
+        boxes = bytearray()
+        char_offsets = array('q', [0])
+        owners = array('q')
+        owner = -1
+        group_left = 0
+
+        while offset < end:
+            name_len, plate_len, chars_len, _, num_chars, group_size, *coords = RECORD.unpack_from(mm, offset)
+            start = offset + RECORD.size
+            if group_left:
+                group_left -= 1
+            else:
+                image_name = mm[start:start + name_len].decode('utf-8')
+                group_left = group_size - 1
+                owner = offset if self._find_offset(image_name) == offset else -1
+
+            boxes_start = start + name_len + plate_len + chars_len
+            offset = boxes_start + num_chars * BOX.size
+            coordinates.extend(coords)
+            boxes += mm[boxes_start:offset]
+            char_offsets.append(char_offsets[-1] + num_chars)
+            owners.append(owner)
+
+        return PlateGeometryTable.compute(
+            np.array(coordinates, dtype=np.int64),
+            np.frombuffer(bytes(boxes), dtype='<f8'),
+            np.array(char_offsets, dtype=np.int64),
+            np.array(owners, dtype=np.int64),
+        )
+
+    def find_by_geometry(
+        self, criteria: GeometryFilter, after: Optional[str] = None, limit: int = 100
+    ) -> List[Plate]:
+        """Consulta por geometría; las medidas se calculan en bloque en la primera consulta"""
+        if self._geometry_table is None:
+            with self._derived_lock:
+                if self._geometry_table is None:
+                    self._geometry_table = self._build_geometry_table()
+
+        after_offset = None
+        if after is not None:
+            after_offset = self._find_offset(after)
+            if after_offset is None:
+                raise ValueError(f"Cursor desconocido: {after}")
+
+        offsets = self._geometry_table.select(criteria, after_offset, limit)
+        return [self._read_record(int(offset))[0] for offset in offsets]
+
+    def get_statistics(self) -> Dict:
+        """Agregados del índice; se calculan en la primera consulta (el índice no cambia)"""
+        if self._statistics is None:
+            with self._derived_lock:
+                if self._statistics is None:
+                    self._statistics = statistics_from_plates(self.iter_plates())
+        return self._statistics.snapshot()
+
+    def plate_exists(self, image_name: str) -> bool:
+        """Verifica si existe una matrícula para la imagen"""
+        return self._find_offset(image_name) is not None
+
+    def plates_exist(self, image_names: List[str]) -> Dict[str, bool]:
+        """Existencia de varias imágenes con una sonda de la tabla hash por nombre"""
+        return {name: self._find_offset(name) is not None for name in image_names}
+
+
+if __name__ == "__main__":
+    # Paso de build: python -m infrastructure.adapters.outbound.file.plates_index_repository <plates.dat> [indice]
+    source_path = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else source_path + '.idx'
+
+    if is_index_stale(source_path, output_path):
+        count = build_plates_index(source_path, output_path)
+        print(f"Índice generado: {output_path} ({count} registros)")
+    else:
+        print(f"Índice vigente: {output_path}")
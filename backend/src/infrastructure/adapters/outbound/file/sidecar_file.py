@@ -0,0 +1,103 @@
+"""
+Ficheros auxiliares derivados de plates.dat (índice binario, filtro de nombres)
+Se guardan junto al origen y los abren con mmap todos los workers. Su
+cabecera empieza por magic, versión, tamaño y mtime_ns del origen y
+termina con el digest de su contenido, lo que permite decidir si siguen
+vigentes sin reconstruirlos
+"""
+import hashlib
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Tuple
+
+# Prefijo común de las cabeceras: magic, versión, tamaño origen, mtime_ns origen
+HEADER_PREFIX = '<8sIQq'
+# Posición del mtime_ns del origen dentro de la cabecera
+SOURCE_MTIME_OFFSET = struct.calcsize('<8sIQ')
+MTIME = struct.Struct('<q')
+
+
+def file_digest(path: Path) -> bytes:
+    """Digest del contenido del fichero origen"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def source_signature(path: Path) -> Tuple[int, int, bytes]:
+    """(tamaño, mtime_ns, digest) del origen, tal como se guardan en la cabecera"""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns, file_digest(path)
+
+
+def _shared_file_mode() -> int:
+    """
+    Permisos de un fichero recién creado según la umask del proceso
+    (mkstemp crea con 0600 y los ficheros auxiliares los leen procesos de otros usuarios)
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_atomically(target: Path, write: Callable[[BinaryIO], None]) -> None:
+    """
+    Escribe el fichero en un temporal del mismo directorio y lo renombra al
+    final, de modo que los lectores nunca ven un fichero a medio escribir
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            write(out)
+        os.chmod(tmp_path, _shared_file_mode())
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def is_sidecar_stale(source: Path, target: Path, header: struct.Struct, magic: bytes, version: int) -> bool:
+    """
+    Indica si el fichero auxiliar no corresponde al origen actual.
+    Si el tamaño y el mtime coinciden se considera vigente; si solo cambia
+    el mtime se compara el digest del contenido y, si coincide, se apunta
+    el mtime nuevo en la cabecera para no volver a calcularlo.
+    """
+    if not target.exists():
+        return True
+
+    with open(target, 'rb') as file:
+        raw = file.read(header.size)
+
+    if len(raw) < header.size:
+        return True
+
+    fields = header.unpack(raw)
+    stored_magic, stored_version, size, mtime_ns, digest = *fields[:4], fields[-1]
+    if stored_magic != magic or stored_version != version:
+        return True
+
+    stat = source.stat()
+    if stat.st_size != size:
+        return True
+    if stat.st_mtime_ns == mtime_ns:
+        return False
+    if file_digest(source) != digest:
+        return True
+    _refresh_source_mtime(target, stat.st_mtime_ns)
+    return False
+
+
+def _refresh_source_mtime(target: Path, mtime_ns: int) -> None:
+    """Actualiza el mtime del origen en la cabecera (escritura de 8 bytes en su sitio)"""
+    try:
+        with open(target, 'r+b') as file:
+            file.seek(SOURCE_MTIME_OFFSET)
+            file.write(MTIME.pack(mtime_ns))
+    except OSError as e:
+        # Fichero de solo lectura para este usuario: se volverá a comparar el digest
+        print(f"Could not refresh {target.name} header mtime: {e}")
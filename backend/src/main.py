@@ -2,17 +2,33 @@
 FastAPI Server - Main Entry Point
 API con Supabase Auth + Chatbot + OCR 
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.adapters.inbound.api.routes.auth import router as auth_router
 from infrastructure.adapters.inbound.api.routes.chatbot import router as chatbot_router
-from infrastructure.adapters.inbound.api.routes.conversation import router as conversation_router
-from infrastructure.adapters.inbound.api.routes.ocr import router as ocr_router
+from infrastructure.adapters.inbound.api.routes.conversation import router as conversation_router, conversation_cache
+from infrastructure.adapters.inbound.api.routes.ocr import router as ocr_router, ocr_service
+from infrastructure.adapters.outbound.database.supabase_client import close_supabase_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # En modo eager, plates.dat se carga en un hilo mientras la API ya acepta peticiones
+    ocr_service.warm_up()
+    yield
+    ocr_service.close()
+    # Conexiones keep-alive de los clientes de Supabase compartidos
+    await close_supabase_clients()
+    if conversation_cache is not None:
+        await conversation_cache.close()
+
 
 app = FastAPI(
     title="Innova API",
     description="API con Supabase Auth + Chatbot + OCR",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -41,7 +57,7 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "service": "innova-api"}
+    return {"status": "healthy", "service": "innova-api", "ocr_ready": ocr_service.is_ready()}
 
 
 if __name__ == "__main__":
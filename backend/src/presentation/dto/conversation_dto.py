@@ -2,9 +2,9 @@
 Conversation DTOs
 DTOs para conversaciones y mensajes
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Literal
+from typing import List, Literal, Optional
 
 
 class ConversationCreate(BaseModel):
@@ -25,9 +25,27 @@ class MessageCreate(BaseModel):
     content: str
 
 
+class MessagesCreate(BaseModel):
+    messages: List[MessageCreate] = Field(..., min_length=1, max_length=100)
+
+
 class MessageResponse(BaseModel):
     id: str
     conversation_id: str
     role: Literal["user", "assistant"]
     content: str
     created_at: datetime
+
+
+class ConversationPage(BaseModel):
+    conversations: List[ConversationResponse]
+    page_size: int
+    next_before: Optional[str] = Field(None, description="Cursor de la página anterior")
+    next_after: Optional[str] = Field(None, description="Cursor de la página siguiente")
+
+
+class MessagePage(BaseModel):
+    messages: List[MessageResponse]
+    page_size: int
+    next_before: Optional[str] = Field(None, description="Cursor de los mensajes anteriores")
+    next_after: Optional[str] = Field(None, description="Cursor de los mensajes posteriores")
@@ -4,7 +4,7 @@ Define los formatos de request/response de la API.
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
 
 
 class CharacterDTO(BaseModel):
@@ -24,6 +24,17 @@ class PlateCoordinatesDTO(BaseModel):
     bottom_left: tuple[int, int]
 
 
+class PlateGeometryDTO(BaseModel):
+    """DTO para la geometría derivada de la matrícula"""
+    area: float = Field(..., description="Área del cuadrilátero en píxeles²")
+    skew_angle: float = Field(..., description="Inclinación en grados respecto a la horizontal")
+    aspect_ratio: float = Field(..., description="Ancho medio / alto medio del cuadrilátero")
+    bounding_box: tuple[int, int, int, int] = Field(..., description="Rectángulo envolvente: min_x, min_y, max_x, max_y")
+    overlapping_chars: int = Field(..., description="Pares de caracteres consecutivos que se solapan")
+    char_spacing_mean: float = Field(..., description="Separación media entre caracteres (normalizada)")
+    char_spacing_std: float = Field(..., description="Desviación típica de la separación entre caracteres")
+
+
 class OCRRequest(BaseModel):
     """Request para reconocimiento OCR"""
     image_name: str = Field(..., description="Nombre del archivo de imagen", example="MD7193_lane1_97_20221102_145250.jpg")
@@ -35,6 +46,16 @@ class OCRResponseSimple(BaseModel):
     image_name: str = Field(..., description="Nombre de la imagen")
 
 
+class PlateDetailDTO(BaseModel):
+    """DTO para una matrícula adicional de la misma imagen"""
+    plate_number: str = Field(..., description="Matrícula detectada ordenada")
+    num_characters: int = Field(..., description="Número de caracteres")
+    characters: List[CharacterDTO] = Field(..., description="Lista de caracteres con posiciones")
+    coordinates: PlateCoordinatesDTO = Field(..., description="Coordenadas de la matrícula")
+    geometry: PlateGeometryDTO = Field(..., description="Geometría de la matrícula y de sus caracteres")
+    is_valid: bool = Field(..., description="Indica si todos los caracteres son válidos")
+
+
 class OCRResponseDetailed(BaseModel):
     """Respuesta detallada con todos los metadatos"""
     plate_number: str = Field(..., description="Matrícula detectada ordenada")
@@ -43,7 +64,44 @@ class OCRResponseDetailed(BaseModel):
     num_plates_in_image: int = Field(..., description="Número de matrículas en la imagen")
     characters: List[CharacterDTO] = Field(..., description="Lista de caracteres con posiciones")
     coordinates: PlateCoordinatesDTO = Field(..., description="Coordenadas de la matrícula")
+    geometry: PlateGeometryDTO = Field(..., description="Geometría de la matrícula y de sus caracteres")
     is_valid: bool = Field(..., description="Indica si todos los caracteres son válidos")
+    additional_plates: List[PlateDetailDTO] = Field(
+        default_factory=list, description="Resto de matrículas de la imagen, si hay varias"
+    )
+
+
+class OCRBatchRequest(BaseModel):
+    """Request para reconocimiento OCR de varias imágenes"""
+    image_names: List[str] = Field(..., min_length=1, max_length=1000, description="Nombres de los archivos de imagen")
+    detailed: bool = Field(False, description="Devuelve el formato de /ocr/recognize/detailed por imagen")
+
+
+class OCRBatchItem(BaseModel):
+    """Resultado de una imagen dentro del lote"""
+    image_name: str = Field(..., description="Nombre de la imagen")
+    status: Literal["ok", "not_found", "invalid"] = Field(..., description="Resultado del reconocimiento")
+    result: Optional[Union[OCRResponseDetailed, OCRResponseSimple]] = Field(None, description="Matrícula reconocida")
+    error: Optional[str] = Field(None, description="Motivo del fallo para esta imagen")
+
+
+class OCRBatchResponse(BaseModel):
+    """Respuesta del reconocimiento por lotes"""
+    total: int = Field(..., description="Número de imágenes solicitadas")
+    recognized: int = Field(..., description="Número de imágenes reconocidas")
+    results: List[OCRBatchItem] = Field(..., description="Resultados en el orden de la petición")
+
+
+class OCRExistsRequest(BaseModel):
+    """Request para comprobar la existencia de varias imágenes"""
+    image_names: List[str] = Field(..., min_length=1, max_length=10000, description="Nombres de los archivos de imagen")
+
+
+class OCRExistsResponse(BaseModel):
+    """Respuesta de la comprobación de existencia por lotes"""
+    total: int = Field(..., description="Número de imágenes distintas solicitadas")
+    found: int = Field(..., description="Número de imágenes con datos OCR")
+    exists: Dict[str, bool] = Field(..., description="Imagen -> tiene datos OCR")
 
 
 class OCRErrorResponse(BaseModel):
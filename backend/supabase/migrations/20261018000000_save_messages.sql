@@ -0,0 +1,30 @@
+-- Guarda uno o varios mensajes de una conversación y actualiza
+-- conversations.updated_at en la misma transacción y en una sola llamada
+-- (POST /rest/v1/rpc/save_messages).
+--
+-- p_messages: [{"id": "<uuid>", "role": "user" | "assistant", "content": "..."}, ...]
+-- Los mensajes reciben created_at del servidor, separados un microsegundo
+-- para conservar el orden del array (mensaje del usuario y respuesta del bot).
+
+create or replace function public.save_messages(p_conversation_id uuid, p_messages jsonb)
+returns setof public.messages
+language plpgsql
+as $$
+begin
+    return query
+    insert into public.messages (id, conversation_id, role, content, created_at)
+    select
+        coalesce((message->>'id')::uuid, gen_random_uuid()),
+        p_conversation_id,
+        message->>'role',
+        message->>'content',
+        now() + (position - 1) * interval '1 microsecond'
+    from jsonb_array_elements(p_messages) with ordinality as m(message, position)
+    order by position
+    returning *;
+
+    update public.conversations
+    set updated_at = now() + (jsonb_array_length(p_messages) - 1) * interval '1 microsecond'
+    where id = p_conversation_id;
+end;
+$$;
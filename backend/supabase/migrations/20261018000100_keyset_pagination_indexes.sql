@@ -0,0 +1,9 @@
+-- Índices de la paginación por clave de GET /conversations y
+-- GET /conversations/{id}/messages: cada página es un recorrido del índice
+-- desde el cursor, sin ordenar ni saltar las filas anteriores.
+
+create index if not exists messages_conversation_created_at_id_idx
+    on public.messages (conversation_id, created_at, id);
+
+create index if not exists conversations_user_updated_at_id_idx
+    on public.conversations (user_id, updated_at desc, id desc);
@@ -0,0 +1,32 @@
+"""
+Configuración común de los tests
+Añade src/ (código de la API) y benchmarks/ (generador sintético de
+plates.dat y sustitutos locales de Supabase y Cloudinary) al path, y
+apunta PLATES_DAT_PATH a un plates.dat sintético temporal: el módulo de
+rutas OCR abre el fichero al importarse y assets/ no contiene datos.
+
+Uso (desde backend/):
+    python -m pytest tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+for directory in (BACKEND_DIR / "src", BACKEND_DIR / "benchmarks"):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+
+def pytest_configure(config):
+    from synthetic import write_plates_dat
+
+    config.plates_dat_dir = tempfile.mkdtemp(prefix="plates-dat-")
+    os.environ.setdefault("PLATES_DAT_PATH", str(write_plates_dat(Path(config.plates_dat_dir) / "plates.dat", 100)))
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.plates_dat_dir, ignore_errors=True)
@@ -0,0 +1,61 @@
+"""
+Tests del índice de capturas con nombres de imagen cuyo momento no es una
+fecha real: no se indexan y /ocr/captures y /ocr/stats siguen respondiendo
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from synthetic import write_plates_dat
+from application.services.ocr_service import OCRService
+from infrastructure.adapters.inbound.api.routes import ocr
+from infrastructure.adapters.inbound.api.response_cache import ResponseCache
+from infrastructure.adapters.outbound.file.capture_index import parse_capture
+from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+MALFORMED = "MD7193_lane1_3_20221399_999999.jpg"
+
+
+@pytest.mark.parametrize("image_name", [
+    MALFORMED,
+    "MD7193_lane1_3_20221301_120000.jpg",
+    "MD7193_lane1_3_20230229_120000.jpg",
+    "MD7193_lane1_3_20221102_246000.jpg",
+])
+def test_impossible_timestamps_are_not_captures(image_name):
+    assert parse_capture(image_name) is None
+
+
+def test_valid_timestamp_is_parsed():
+    assert parse_capture("MD7193_lane1_97_20240229_235959.jpg") == (1, 20240229235959)
+
+
+@pytest.fixture(params=["eager", "streaming", "index"])
+def client(request, tmp_path, monkeypatch):
+    path = write_plates_dat(tmp_path / "plates.dat", 30)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    lines[0] = MALFORMED + ' ' + lines[0].split(' ', 1)[1]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    if request.param == "index":
+        repository = PlatesIndexRepository(str(path), str(path) + '.idx')
+    else:
+        repository = PlatesDatRepository(str(path), load_mode=request.param)
+    monkeypatch.setattr(ocr, "ocr_service", OCRService(repository))
+    monkeypatch.setattr(ocr, "response_cache", ResponseCache(0))
+    app = FastAPI()
+    app.include_router(ocr.router)
+    with TestClient(app) as client:
+        yield client
+    repository.close()
+
+
+def test_malformed_timestamp_is_left_out_of_captures_and_stats(client):
+    response = client.get("/ocr/captures", params={"limit": 1000})
+    assert response.status_code == 200
+    names = [capture["image_name"] for capture in response.json()["captures"]]
+    assert len(names) == 29 and MALFORMED not in names
+
+    stats = client.get("/ocr/stats").json()
+    assert sum(stats["images_per_day"].values()) == 29
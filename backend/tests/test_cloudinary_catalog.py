@@ -0,0 +1,121 @@
+"""
+Tests de CloudinaryImageCatalog y de la paginación de la Admin API contra
+el sustituto local de cloudinary.api.resources
+"""
+import asyncio
+
+import pytest
+
+from fake_cloudinary import FakeCloudinaryResources
+from infrastructure.adapters.outbound.cloudinary.cloudinary_image_catalog import (
+    PAGE_SIZE, CloudinaryImageCatalog, list_folder_images
+)
+
+FOLDER = "innova-plates/innova-plates"
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_catalog(num_images: int, ttl: float = 60):
+    fake = FakeCloudinaryResources([f"{FOLDER}/{i:08d}" for i in range(num_images)], latency=0)
+    clock = ManualClock()
+    catalog = CloudinaryImageCatalog(lambda: list_folder_images(fake, FOLDER), ttl_seconds=ttl, clock=clock)
+    return fake, clock, catalog
+
+
+@pytest.mark.parametrize("num_images, pages", [(0, 1), (1, 1), (PAGE_SIZE, 1), (PAGE_SIZE + 1, 2), (1_234, 3)])
+def test_list_folder_images_follows_next_cursor(num_images, pages):
+    fake = FakeCloudinaryResources([f"{FOLDER}/{i:08d}" for i in range(num_images)], latency=0)
+    fake.add("otra-carpeta/00000001", "2024-01-01T00:00:00Z")
+    images = list_folder_images(fake, FOLDER)
+    assert images == {f"{i:08d}.jpg" for i in range(num_images)}
+    assert fake.calls == pages
+
+
+def test_serves_from_memory_within_ttl():
+    async def run():
+        fake, clock, catalog = make_catalog(1_200)
+        first = await catalog.get_available_images()
+        calls = fake.calls
+        for _ in range(20):
+            clock.now += 2
+            assert await catalog.get_available_images() == first
+        return len(first), calls, fake.calls
+
+    size, first_calls, total_calls = asyncio.run(run())
+    assert size == 1_200
+    assert first_calls == total_calls == 3
+
+
+def test_stale_value_is_served_while_refreshing_in_background():
+    async def run():
+        fake, clock, catalog = make_catalog(10)
+        await catalog.get_available_images()
+        fake.add(f"{FOLDER}/nueva", "2024-01-02T00:00:00Z")
+        clock.now += 61
+
+        stale = await catalog.get_available_images()
+        # Un solo refresco en curso aunque lleguen más peticiones
+        again = await catalog.get_available_images()
+        task = catalog._refresh_task
+        await task
+        fresh = await catalog.get_available_images()
+        return stale, again, fresh, catalog.refresh_count, catalog.version
+
+    stale, again, fresh, refresh_count, version = asyncio.run(run())
+    assert "nueva.jpg" not in stale and "nueva.jpg" not in again
+    assert "nueva.jpg" in fresh
+    assert refresh_count == 2
+    assert version == 2
+
+
+def test_invalidate_makes_next_request_wait_for_fresh_data():
+    async def run():
+        fake, _, catalog = make_catalog(10)
+        await catalog.get_available_images()
+        fake.remove(f"{FOLDER}/00000003")
+        catalog.invalidate()
+        return await catalog.get_available_images()
+
+    images = asyncio.run(run())
+    assert "00000003.jpg" not in images and len(images) == 9
+
+
+def test_failed_refresh_keeps_last_known_set():
+    async def run():
+        fake, clock, catalog = make_catalog(10)
+        images = await catalog.get_available_images()
+
+        def failing(**_):
+            raise RuntimeError("Admin API rate limited")
+
+        catalog._fetch_images = lambda: list_folder_images(failing, FOLDER)
+        clock.now += 61
+        stale = await catalog.get_available_images()
+        await catalog._refresh_task
+        return images, stale, await catalog.get_available_images(), catalog.last_error
+
+    images, stale, after, last_error = asyncio.run(run())
+    assert images == stale == after
+    assert "rate limited" in last_error
+
+
+def test_refresh_started_before_invalidate_is_discarded():
+    async def run():
+        fake, clock, catalog = make_catalog(10)
+        await catalog.get_available_images()
+        clock.now += 61
+        await catalog.get_available_images()
+        in_flight = catalog._refresh_task
+        catalog.invalidate()
+        await in_flight
+        return catalog._images
+
+    # El refresco lanzado antes de invalidar no repone un valor que puede estar desfasado
+    assert asyncio.run(run()) is None
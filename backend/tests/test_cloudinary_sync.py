@@ -0,0 +1,131 @@
+"""
+Tests de CloudinarySync (instantánea SQLite y refresco incremental) contra
+el sustituto local de cloudinary.api.resources, y que importar las rutas
+no abre la instantánea
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from fake_cloudinary import FakeCloudinaryResources
+from infrastructure.adapters.outbound.cloudinary.cloudinary_image_catalog import PAGE_SIZE
+from infrastructure.adapters.outbound.cloudinary.cloudinary_sync import CloudinarySync
+
+FOLDER = "innova-plates/innova-plates"
+NUM_IMAGES = 1_200
+
+
+@pytest.fixture
+def fake():
+    fake = FakeCloudinaryResources([f"{FOLDER}/{i:08d}" for i in range(NUM_IMAGES)], latency=0)
+    fake.add("otra-carpeta/ajena", "2024-01-01T00:00:00Z")
+    return fake
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return str(tmp_path / "snapshot.sqlite3")
+
+
+def expected_images(count: int = NUM_IMAGES):
+    return {f"{i:08d}.jpg" for i in range(count)}
+
+
+def test_first_sync_lists_the_whole_folder(fake, snapshot):
+    sync = CloudinarySync(fake, FOLDER, snapshot)
+    assert sync.sync() == expected_images()
+
+    metrics = sync.metrics()
+    assert metrics["last_sync_mode"] == "full"
+    assert metrics["last_sync_api_calls"] == fake.calls == -(-NUM_IMAGES // PAGE_SIZE)
+    assert metrics["last_sync_new_images"] == NUM_IMAGES
+    assert metrics["sync_lag_seconds"] >= 0 and metrics["last_sync_duration_seconds"] >= 0
+
+
+def test_incremental_sync_fetches_only_new_uploads(fake, snapshot):
+    sync = CloudinarySync(fake, FOLDER, snapshot)
+    sync.sync()
+    for i in range(3):
+        fake.add(f"{FOLDER}/nueva-{i}", f"2024-02-0{i + 1}T00:00:00Z")
+    fake.add("otra-carpeta/nueva", "2024-02-05T00:00:00Z")
+
+    images = sync.sync()
+    assert images == expected_images() | {f"nueva-{i}.jpg" for i in range(3)}
+    assert sync.last_sync_mode == "incremental"
+    assert sync.last_sync_api_calls == 1
+    assert sync.last_sync_new_images == 3
+
+    # Sin cambios: una llamada y nada nuevo
+    assert sync.sync() == images
+    assert (sync.last_sync_api_calls, sync.last_sync_new_images) == (1, 0)
+
+
+def test_restart_resumes_from_persisted_snapshot(fake, snapshot):
+    CloudinarySync(fake, FOLDER, snapshot).sync()
+    fake.add(f"{FOLDER}/tras-reinicio", "2024-03-01T00:00:00Z")
+
+    restarted = CloudinarySync(fake, FOLDER, snapshot)
+    assert restarted.sync() == expected_images() | {"tras-reinicio.jpg"}
+    assert restarted.last_sync_mode == "incremental"
+    assert restarted.last_sync_api_calls == 1
+
+
+def test_periodic_full_sync_detects_deletions(fake, snapshot):
+    sync = CloudinarySync(fake, FOLDER, snapshot)
+    sync.sync()
+    fake.remove(f"{FOLDER}/00000000")
+
+    # El refresco incremental no ve borrados
+    assert "00000000.jpg" in sync.sync()
+
+    sync.full_sync_interval = 0
+    images = sync.sync()
+    assert sync.last_sync_mode == "full"
+    assert images == expected_images() - {"00000000.jpg"}
+
+
+def test_api_failure_keeps_snapshot_intact(fake, snapshot):
+    sync = CloudinarySync(fake, FOLDER, snapshot)
+    images = sync.sync()
+    sync.full_sync_interval = 0
+
+    calls = []
+
+    def failing(**params):
+        calls.append(params)
+        if len(calls) > 1:
+            raise RuntimeError("Admin API unavailable")
+        return fake(**params)
+
+    sync._resources = failing
+    with pytest.raises(RuntimeError):
+        sync.sync()
+
+    # El listado completo fallido se deshace: la instantánea conserva el conjunto anterior
+    sync._resources = fake
+    sync.full_sync_interval = 86400.0
+    assert sync.sync() == images
+    assert sync.last_sync_mode == "incremental"
+
+
+def test_importing_the_routes_does_not_open_the_snapshot(tmp_path):
+    snapshot = tmp_path / "snapshot.sqlite3"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(Path(__file__).resolve().parent.parent / "src"),
+        "CLOUDINARY_CLOUD_NAME": "demo", "CLOUDINARY_API_KEY": "key", "CLOUDINARY_API_SECRET": "secret",
+        "CLOUDINARY_SNAPSHOT_PATH": str(snapshot),
+    }
+    script = (
+        "import os, sys\n"
+        "from infrastructure.adapters.inbound.api.routes import ocr\n"
+        "created_on_import = os.path.exists(sys.argv[1])\n"
+        "ocr.get_cloudinary_sync()\n"
+        "print(created_on_import, os.path.exists(sys.argv[1]))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script, str(snapshot)], env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split()[-2:] == ["False", "True"]
@@ -0,0 +1,87 @@
+"""
+Tests de imágenes repetidas en plates.dat: todos los modos conservan solo
+la última línea válida de cada imagen, en la posición de esa línea, y la
+caché de respuestas no sirve la línea sustituida
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from synthetic import write_plates_dat
+from application.services.ocr_service import OCRService
+from infrastructure.adapters.inbound.api.routes import ocr
+from infrastructure.adapters.inbound.api.response_cache import ResponseCache
+from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository, parse_plate_line
+from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+
+@pytest.fixture(scope="module")
+def plates_dat(tmp_path_factory):
+    path = write_plates_dat(tmp_path_factory.mktemp("duplicates") / "plates.dat", 40)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    replaced, donor, kept = (line.split(' ', 1) for line in (lines[3], lines[10], lines[5]))
+    # La imagen 3 vuelve a aparecer al final con otros datos; la 5, con una línea inválida
+    lines += [f"{replaced[0]} {donor[1]}", f"{kept[0]} 1 0 0"]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    names = [line.split(' ', 1)[0] for line in lines[:40]]
+    expected = names[:3] + names[4:] + [names[3]]
+    return path, expected, replaced[0], donor[1].split()
+
+
+@pytest.fixture(params=["eager", "streaming", "index"])
+def repository(request, plates_dat):
+    path = plates_dat[0]
+    if request.param == "index":
+        repository = PlatesIndexRepository(str(path), str(path) + '.idx')
+    else:
+        repository = PlatesDatRepository(str(path), load_mode=request.param)
+    yield repository
+    repository.close()
+
+
+def test_each_image_is_listed_once_at_its_last_line(repository, plates_dat):
+    _, expected, _, _ = plates_dat
+    assert list(repository.iter_image_names()) == expected
+    assert [plate.image_name for plate in repository.iter_plates()] == expected
+    assert repository.count_plates() == len(expected)
+
+
+def test_replaced_image_serves_its_last_line(repository, plates_dat):
+    _, _, replaced, donor_fields = plates_dat
+    donor_chars = donor_fields[10::5][:int(donor_fields[9])]
+    assert sorted(repository.get_plate_by_image_name(replaced).plate_number) == sorted(donor_chars)
+
+
+def test_cursor_resumes_after_the_kept_line(repository, plates_dat):
+    _, expected, _, _ = plates_dat
+    assert [plate.image_name for plate in repository.iter_plates(after=expected[2])] == expected[3:]
+
+
+def test_captures_list_each_image_once(repository, plates_dat):
+    _, expected, _, _ = plates_dat
+    names = [plate.image_name for plate in repository.find_captures(limit=1000)]
+    assert sorted(names) == sorted(expected)
+
+
+def test_cached_recognition_follows_plates_dat_in_streaming_mode(tmp_path, monkeypatch):
+    path = write_plates_dat(tmp_path / "plates.dat", 20)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    name, donor = lines[0].split(' ', 1)[0], lines[1].split(' ', 1)[1]
+    repository = PlatesDatRepository(str(path), load_mode="streaming")
+    monkeypatch.setattr(ocr, "ocr_service", OCRService(repository))
+    monkeypatch.setattr(ocr, "response_cache", ResponseCache(100))
+    app = FastAPI()
+    app.include_router(ocr.router)
+
+    with TestClient(app) as client:
+        before = client.post("/ocr/recognize", json={"image_name": name}).json()
+        assert client.post("/ocr/recognize", json={"image_name": name}).json() == before
+
+        # Sin vigilancia de plates.dat: la nueva línea de la imagen se ve en la siguiente petición
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(f"{name} {donor}\n")
+        after = client.post("/ocr/recognize", json={"image_name": name}).json()
+    repository.close()
+
+    assert after["plate_number"] == parse_plate_line(lines[1])[0][5] != before["plate_number"]
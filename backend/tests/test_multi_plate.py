@@ -0,0 +1,156 @@
+"""
+Tests del soporte de varias matrículas por imagen: parser, almacén
+columnar, modos de carga, índice binario, búsqueda y /ocr/recognize/detailed
+contra líneas sintéticas multi-matrícula
+"""
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from synthetic import write_plates_dat
+from application.services.ocr_service import OCRService
+from infrastructure.adapters.inbound.api.routes import ocr
+from infrastructure.adapters.inbound.api.response_cache import ResponseCache
+from infrastructure.adapters.outbound.file.plates_columnar_store import PlatesColumnarStore
+from infrastructure.adapters.outbound.file.plates_dat_repository import (
+    PlatesDatRepository, parse_plate_line, parse_plates_chunk
+)
+from infrastructure.adapters.outbound.file.plates_index_repository import PlatesIndexRepository
+
+
+def reference_plates(line: str):
+    """Parser de referencia mínimo: lista de matrículas (ordenadas por left) de la línea"""
+    parts = line.split()
+    num_plates, idx, plates = int(parts[1]), 2, []
+    for _ in range(num_plates):
+        num_chars = int(parts[idx + 8])
+        chars = [(float(parts[idx + 9 + 5 * k + 1]), parts[idx + 9 + 5 * k]) for k in range(num_chars)]
+        plates.append(''.join(char for _, char in sorted(chars, key=lambda c: c[0])))
+        idx += 9 + 5 * num_chars
+    return parts[0], plates
+
+
+@pytest.fixture(scope="module")
+def plates_dat(tmp_path_factory) -> Path:
+    return write_plates_dat(tmp_path_factory.mktemp("multi") / "plates.dat", 2_000, multi_plate_ratio=0.2)
+
+
+@pytest.fixture(scope="module")
+def expected(plates_dat):
+    return dict(reference_plates(line) for line in plates_dat.read_text(encoding='utf-8').splitlines())
+
+
+@pytest.fixture(scope="module")
+def multi(expected):
+    names = [name for name, plates in expected.items() if len(plates) > 1]
+    assert names, "el fichero no contiene imágenes multi-matrícula"
+    return names
+
+
+@pytest.fixture(params=["eager", "streaming", "index"])
+def repository(request, plates_dat):
+    if request.param == "index":
+        repository = PlatesIndexRepository(str(plates_dat), str(plates_dat) + '.idx')
+    else:
+        repository = PlatesDatRepository(str(plates_dat), load_mode=request.param)
+    yield repository
+    repository.close()
+
+
+def test_truncated_line_keeps_present_blocks(plates_dat, expected):
+    first_line = plates_dat.read_text(encoding='utf-8').splitlines()[0].split()
+    truncated = ' '.join([first_line[0], '3'] + first_line[2:])
+    assert len(parse_plate_line(truncated)) == len(expected[first_line[0]])
+
+
+def test_lookup_returns_every_plate(repository, expected, multi):
+    for name in multi[:200] + list(expected)[:200]:
+        plate = repository.get_plate_by_image_name(name)
+        assert [p.plate_number for p in plate.all_plates] == expected[name], name
+
+
+def test_batch_lookup_returns_every_plate(repository, expected, multi):
+    batch = repository.get_plates_by_image_names(multi[:50])
+    for name in multi[:50]:
+        assert [p.plate_number for p in batch[name].all_plates] == expected[name], name
+
+
+def test_count_includes_each_image_once(repository, expected):
+    if isinstance(repository, PlatesDatRepository) and repository.load_mode == "streaming":
+        pytest.skip("el modo streaming no cuenta matrículas")
+    assert repository.count_plates() == len(expected)
+
+
+def test_search_finds_secondary_plates(repository, expected, multi):
+    secondary = expected[multi[0]][1]
+    matches = repository.search_plates(secondary, mode="exact")
+    assert any(multi[0] in match.image_names for match in matches)
+
+
+def test_detailed_endpoint_lists_additional_plates(plates_dat, expected, multi, monkeypatch):
+    repository = PlatesDatRepository(str(plates_dat), load_mode="eager")
+    monkeypatch.setattr(ocr, "ocr_service", OCRService(repository))
+    monkeypatch.setattr(ocr, "response_cache", ResponseCache(0))
+    app = FastAPI()
+    app.include_router(ocr.router)
+    with TestClient(app) as client:
+        body = client.post("/ocr/recognize/detailed", json={"image_name": multi[0]}).json()
+    repository.close()
+    assert [body["plate_number"]] + [p["plate_number"] for p in body["additional_plates"]] == expected[multi[0]]
+
+
+@pytest.mark.parametrize("path", ["/ocr/recognize", "/ocr/recognize/detailed"])
+def test_recognize_unknown_image_returns_404(plates_dat, monkeypatch, path):
+    repository = PlatesDatRepository(str(plates_dat), load_mode="eager")
+    monkeypatch.setattr(ocr, "ocr_service", OCRService(repository))
+    monkeypatch.setattr(ocr, "response_cache", ResponseCache(0))
+    app = FastAPI()
+    app.include_router(ocr.router)
+    with TestClient(app) as client:
+        response = client.post(path, json={"image_name": "missing.jpg"})
+    repository.close()
+    assert response.status_code == 404
+    assert response.json()["detail"] == "OCR data not found for: missing.jpg"
+
+
+def test_invalid_secondary_plate_leaves_store_unchanged(plates_dat, multi):
+    line = next(l for l in plates_dat.read_text(encoding='utf-8').splitlines() if l.startswith(multi[0] + ' '))
+    plates = parse_plate_line(line)
+    store = PlatesColumnarStore()
+    store.append_image(plates)
+    before = (list(store.image_names), list(store.chars), store.char_offsets.tolist(),
+              dict(store.plate_groups), store.row_of(multi[0]))
+
+    # Segunda matrícula con una coordenada de menos: la imagen se descarta entera
+    broken = list(plates)
+    name, num_plates, coords, chars, boxes, plate_number = broken[1]
+    broken[1] = (name, num_plates, coords[:7], chars, boxes, plate_number)
+    with pytest.raises(ValueError):
+        store.append_image(broken)
+
+    after = (list(store.image_names), list(store.chars), store.char_offsets.tolist(),
+             dict(store.plate_groups), store.row_of(multi[0]))
+    assert after == before
+    assert [p.plate_number for p in store.materialize(store.row_of(multi[0])).all_plates] == \
+        [fields[5] for fields in plates]
+
+
+def test_chunk_parse_skips_image_whose_secondary_plate_overflows(tmp_path, plates_dat, multi):
+    lines = plates_dat.read_text(encoding='utf-8').splitlines()[:200]
+    target = next(l for l in lines if l.split()[0] in set(multi))
+    name = target.split()[0]
+    # El parser acepta la coordenada, pero no cabe en la columna int32 del almacén
+    parts = target.split()
+    second_block = 2 + 9 + 5 * int(parts[10])
+    parts[second_block] = str(2 ** 40)
+    source = tmp_path / "overflow.dat"
+    source.write_text('\n'.join(' '.join(parts) if l == target else l for l in lines) + '\n', encoding='utf-8')
+
+    store = parse_plates_chunk(str(source), 0, source.stat().st_size)
+    assert name not in store
+    assert len(store) == len(lines) - 1
+    assert len(store.image_names) == len(store.plate_numbers) == len(store.num_plates)
+    assert len(store.coordinates) == 8 * len(store.image_names)
+    assert store.char_offsets[-1] == len(store.chars) == len(store.char_boxes) // 4
@@ -0,0 +1,53 @@
+"""
+Tests de la paginación por cursor de /ocr/plates cuando algunas imágenes
+de la vista ya no están en el repositorio (recarga de plates.dat)
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from synthetic import write_plates_dat
+from application.services.ocr_service import AvailablePlatesView, OCRService
+from infrastructure.adapters.inbound.api.routes import ocr
+from infrastructure.adapters.inbound.api.response_cache import ResponseCache
+from infrastructure.adapters.outbound.file.plates_dat_repository import PlatesDatRepository
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    repository = PlatesDatRepository(str(write_plates_dat(tmp_path / "plates.dat", 50)), load_mode="eager")
+    names = list(repository.iter_image_names())
+    # Una de cada tres imágenes de la vista ya no existe en el repositorio
+    view_names = []
+    for i, name in enumerate(names):
+        view_names.append(name)
+        if i % 3 == 0:
+            view_names.append(f"vanished_{i}.jpg")
+
+    async def get_available_view():
+        return AvailablePlatesView(view_names)
+
+    monkeypatch.setattr(ocr, "ocr_service", OCRService(repository))
+    monkeypatch.setattr(ocr, "response_cache", ResponseCache(0))
+    monkeypatch.setattr(ocr, "get_available_view", get_available_view)
+    app = FastAPI()
+    app.include_router(ocr.router)
+    with TestClient(app) as client:
+        yield client, names, view_names
+    repository.close()
+
+
+def test_pages_shortened_by_vanished_images_keep_the_cursor(client):
+    client, names, view_names = client
+    received, after, pages = [], None, 0
+    while True:
+        params = {"page_size": 7} if after is None else {"page_size": 7, "after": after}
+        body = client.get("/ocr/plates", params=params).json()
+        received.extend(plate["image_name"] for plate in body["plates"])
+        pages += 1
+        after = body["next_after"]
+        if after is None:
+            break
+
+    assert received == names
+    assert pages == -(-len(view_names) // 7)
@@ -0,0 +1,124 @@
+"""
+Tests de save_message / save_messages contra el sustituto local de
+PostgREST: una sola llamada RPC con la función save_messages desplegada y
+vuelta a insert + update cuando no lo está
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from fake_supabase import FakeSupabase
+from application.services.conversation_service import ConversationService
+from infrastructure.adapters.inbound.api.routes import conversation
+from infrastructure.adapters.outbound.database.supabase_client import SupabaseClients, SupabaseSettings
+
+CONVERSATION_ID = "c-test"
+
+
+@pytest.fixture(scope="module")
+def fake():
+    fake = FakeSupabase()
+    fake.url = fake.start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture(autouse=True)
+def reset(fake):
+    fake.tables = {
+        "conversations": [{"id": CONVERSATION_ID, "user_id": "u1", "title": "test",
+                           "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}],
+        "messages": [],
+    }
+    fake.install_save_messages()
+    fake.reset_counters()
+
+
+def run_with_client(fake: FakeSupabase, scenario):
+    """Ejecuta scenario(client) contra la API de conversaciones enlazada al sustituto"""
+    async def main():
+        clients = SupabaseClients(SupabaseSettings(supabase_url=fake.url, supabase_key="service-role-key"))
+        app = FastAPI()
+        app.include_router(conversation.router)
+        app.dependency_overrides = {conversation.get_conversation_service: lambda: ConversationService(clients.data)}
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await clients.close()
+
+    return asyncio.run(main())
+
+
+def conversation_row(fake: FakeSupabase):
+    return next(c for c in fake.tables["conversations"] if c["id"] == CONVERSATION_ID)
+
+
+def test_save_message_is_one_rpc_call(fake):
+    async def scenario(client):
+        return await client.post(f"/conversations/{CONVERSATION_ID}/messages", json={"role": "user", "content": "hola"})
+
+    response = run_with_client(fake, scenario)
+    assert response.status_code == 200
+    assert response.json()["content"] == "hola"
+    assert fake.requests == 1
+    assert conversation_row(fake)["updated_at"] == fake.tables["messages"][-1]["created_at"]
+
+
+def test_batch_keeps_order_and_bumps_updated_at(fake):
+    turn = {"messages": [{"role": "user", "content": "hola"}, {"role": "assistant", "content": "¿en qué puedo ayudar?"}]}
+
+    async def scenario(client):
+        saved = (await client.post(f"/conversations/{CONVERSATION_ID}/messages/batch", json=turn)).json()
+        listed = (await client.get(f"/conversations/{CONVERSATION_ID}/messages")).json()
+        return saved, listed
+
+    saved, listed = run_with_client(fake, scenario)
+    assert [m["role"] for m in saved] == ["user", "assistant"]
+    assert [m["id"] for m in listed] == [m["id"] for m in saved]
+    assert saved[0]["created_at"] < saved[1]["created_at"]
+    assert conversation_row(fake)["updated_at"] == saved[-1]["created_at"]
+
+
+def test_falls_back_to_insert_and_update_without_the_function(fake):
+    fake.functions.pop("save_messages")
+
+    async def scenario(client):
+        return (await client.post(f"/conversations/{CONVERSATION_ID}/messages/batch", json={"messages": [
+            {"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}
+        ]})).json()
+
+    saved = run_with_client(fake, scenario)
+    assert [m["content"] for m in saved] == ["a", "b"]
+    assert fake.requests == 3  # rpc 404 + insert + update
+    assert [m["content"] for m in fake.tables["messages"]] == ["a", "b"]
+    assert conversation_row(fake)["updated_at"] == saved[-1]["created_at"]
+
+
+def test_other_rpc_errors_are_not_retried_as_two_requests(fake):
+    def failing(params):
+        raise RuntimeError("database unavailable")
+
+    fake.functions["save_messages"] = failing
+
+    async def scenario(client):
+        return await client.post(f"/conversations/{CONVERSATION_ID}/messages", json={"role": "user", "content": "x"})
+
+    response = run_with_client(fake, scenario)
+    assert response.status_code == 500
+    # Solo la llamada RPC: la vuelta a insert + update es solo para PGRST202
+    assert fake.requests == 1
+    assert fake.tables["messages"] == []
+
+
+@pytest.mark.parametrize("count", [0, 101])
+def test_batch_size_is_validated(fake, count):
+    body = {"messages": [{"role": "user", "content": str(i)} for i in range(count)]}
+
+    async def scenario(client):
+        return await client.post(f"/conversations/{CONVERSATION_ID}/messages/batch", json=body)
+
+    assert run_with_client(fake, scenario).status_code == 422
+    assert fake.requests == 0
@@ -0,0 +1,58 @@
+"""
+Tests de los ficheros auxiliares de plates.dat (índice binario y filtro de
+nombres): permisos según la umask y criterio de vigencia compartido
+"""
+import os
+import stat
+
+import pytest
+
+from synthetic import write_plates_dat
+from infrastructure.adapters.outbound.file import image_name_filter, plates_index_repository
+from infrastructure.adapters.outbound.file.sidecar_file import MTIME, SOURCE_MTIME_OFFSET
+
+SIDECARS = {
+    "index": (plates_index_repository.build_plates_index, plates_index_repository.is_index_stale),
+    "filter": (image_name_filter.build_name_filter, image_name_filter.is_filter_stale),
+}
+
+
+@pytest.fixture(params=sorted(SIDECARS))
+def sidecar(request, tmp_path):
+    build, is_stale = SIDECARS[request.param]
+    source = write_plates_dat(tmp_path / "plates.dat", 200)
+    target = tmp_path / f"plates.dat.{request.param}"
+    previous = os.umask(0o022)
+    try:
+        build(str(source), str(target))
+    finally:
+        os.umask(previous)
+    return source, target, lambda: is_stale(str(source), str(target))
+
+
+def header_mtime(target) -> int:
+    with open(target, 'rb') as file:
+        file.seek(SOURCE_MTIME_OFFSET)
+        return MTIME.unpack(file.read(MTIME.size))[0]
+
+
+def test_published_with_umask_permissions(sidecar):
+    _, target, _ = sidecar
+    assert stat.S_IMODE(target.stat().st_mode) == 0o644
+    assert not list(target.parent.glob("*.tmp"))
+
+
+def test_touch_keeps_sidecar_and_refreshes_header_mtime(sidecar):
+    source, target, is_stale = sidecar
+    mtime_ns = source.stat().st_mtime_ns + 1_000_000_000
+    os.utime(source, ns=(mtime_ns, mtime_ns))
+
+    assert not is_stale()
+    assert header_mtime(target) == mtime_ns
+
+
+def test_content_change_makes_sidecar_stale(sidecar):
+    source, _, is_stale = sidecar
+    with open(source, 'a', encoding='utf-8') as file:
+        file.write(source.read_text(encoding='utf-8').splitlines()[0] + '\n')
+    assert is_stale()
@@ -0,0 +1,39 @@
+"""
+Tests de las dependencias FastAPI de Supabase sin configuración: las
+rutas responden 500 con el motivo en lugar de un error sin detalle
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from infrastructure.adapters.inbound.api.routes import auth, conversation
+from infrastructure.adapters.outbound.database import supabase_client
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Sin variables de entorno ni .env en el directorio de trabajo
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_KEY", raising=False)
+    monkeypatch.setattr(supabase_client, "_clients", None)
+    supabase_client.get_supabase_settings.cache_clear()
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(conversation.router)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        yield client
+    supabase_client.get_supabase_settings.cache_clear()
+
+
+@pytest.mark.parametrize("method, path, kwargs", [
+    ("get", "/conversations", {"params": {"user_id": "u1"}}),
+    ("get", "/conversations/c1/messages", {}),
+    ("post", "/auth/login", {"json": {"email": "user@example.com", "password": "secret"}}),
+    ("get", "/auth/me", {"headers": {"Authorization": "Bearer token"}}),
+])
+def test_missing_supabase_settings_return_500_with_detail(client, method, path, kwargs):
+    response = getattr(client, method)(path, **kwargs)
+
+    assert response.status_code == 500
+    assert "supabase_url" in response.json()["detail"]